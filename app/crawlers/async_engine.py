@@ -0,0 +1,91 @@
+"""
+Async fetch engine - Tải trang bất đồng bộ trên một event loop
+"""
+import asyncio
+import logging
+import httpx
+from urllib.parse import urlparse
+from app.utils.config import ASYNC_MAX_CONCURRENCY, TIMEOUT
+from app.utils.concurrency import concurrency_controller
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+class AsyncFetchEngine:
+    """
+    Engine tải trang bất đồng bộ dùng chung cho các crawler
+
+    Một engine giữ một httpx.AsyncClient và một semaphore giới hạn số request
+    đang chạy, cho phép hàng trăm request cùng chờ mạng trên một event loop.
+    Ngoài giới hạn chung, mỗi host còn bị giới hạn bởi adaptive concurrency.
+    Engine phải được dùng bên trong `async with`.
+    """
+
+    def __init__(self, max_concurrency=ASYNC_MAX_CONCURRENCY, timeout=TIMEOUT):
+        """
+        Khởi tạo engine
+
+        Args:
+            max_concurrency (int): Số request tối đa được chạy đồng thời
+            timeout (int): Thời gian chờ tối đa cho mỗi request (giây)
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.client = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency
+        )
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=limits,
+            follow_redirects=True
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        logger.info(f"Khởi động async fetch engine với tối đa {self.max_concurrency} request đồng thời")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.client.aclose()
+        self.client = None
+        self._semaphore = None
+
+    async def fetch(self, url, headers=None, timeout=None, target=None):
+        """
+        Tải nội dung trang web từ URL
+
+        Args:
+            url (str): URL của trang web cần tải
+            headers (dict, optional): Header bổ sung cho request
+            timeout (int, optional): Thời gian chờ riêng cho request này
+            target (str, optional): Tên đích của adaptive concurrency, mặc định là host của URL
+
+        Returns:
+            httpx.Response: Response với mọi mã trạng thái, việc xử lý lỗi HTTP
+                            và thử lại do crawler quyết định
+
+        Raises:
+            httpx.HTTPError: Nếu có lỗi mạng (kết nối, timeout...)
+        """
+        if self.client is None:
+            raise RuntimeError("AsyncFetchEngine chưa được khởi động, hãy dùng 'async with'")
+
+        target = target or (urlparse(url).hostname or url).lower()
+
+        # Chờ chỗ của host trước để host chậm không giữ chỗ chung của engine
+        async with concurrency_controller.slot(target) as slot, self._semaphore:
+            try:
+                response = await self.client.get(
+                    url,
+                    headers=headers,
+                    timeout=timeout or self.timeout
+                )
+            except httpx.TransportError as e:
+                slot.overloaded = True
+                logger.warning(f"Lỗi khi tải trang {url}: {e}")
+                raise
+            slot.record_status(response.status_code)
+            return response
@@ -1,18 +1,55 @@
 """
 Base crawler class for all job website crawlers
 """
+import asyncio
+import logging
+import time
+import httpx
 import requests
 from abc import ABC, abstractmethod
-from bs4 import BeautifulSoup
-import time
-import random
-from app.utils.config import USER_AGENT, TIMEOUT
+from collections import namedtuple
+from app.utils.config import (
+    USER_AGENT, TIMEOUT, JOB_DETAIL_REQUIRED_FIELDS, HTTP_MAX_RETRIES, RETRY_INLINE_MAX_DELAY
+)
+from app.utils.openai_helper import extract_job_info_with_openai, extract_job_info_with_openai_async
+from app.utils.extraction_batcher import get_extraction_batcher
+from app.crawlers.rate_limiter import host_rate_limiter
+from app.crawlers.http_session import http_session_pool
+from app.crawlers.retry_policy import (
+    HostUnavailableError, circuit_breakers, classify_status, classify_exception,
+    parse_retry_after, backoff_delay
+)
+from app.utils.concurrency import concurrency_controller
+from app.crawlers.html_parser import parse_html
+from app.crawlers.html_cleaner import html_to_text
+from app.crawlers.structured_data import missing_fields
+from app.crawlers.extraction_spec import compile_spec
+from app.crawlers.parse_pool import extract_local, get_parse_pool
+from app.data.page_cache import get_page_cache
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+# Lỗi mạng được tính là host quá tải khi điều chỉnh số request đồng thời
+HTTP_OVERLOAD_ERRORS = (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+
+class CrawlCancelled(Exception):
+    """
+    Lượt crawl bị người dùng hủy giữa chừng
+    """
+
+# Trang đã tải: nội dung HTML, cờ cho biết trang không đổi so với bản đã lưu,
+# bytes nguyên bản của response và bảng mã (None khi trang lấy từ cache)
+FetchedPage = namedtuple('FetchedPage', ['html', 'unchanged', 'body', 'encoding'], defaults=(None, None))
 
 class BaseCrawler(ABC):
     """
     Lớp cơ sở cho tất cả các crawler
     """
     
+    # Cấu hình selector trích xuất chi tiết việc làm (xem app/crawlers/extraction_spec.py)
+    extraction_spec = None
+    
     def __init__(self, name):
         """
         Khởi tạo crawler với tên và cấu hình cơ bản
@@ -29,37 +66,622 @@ class BaseCrawler(ABC):
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
         self.timeout = TIMEOUT
+        self.page_cache = get_page_cache()
+        self.compiled_spec = compile_spec(self.extraction_spec)
+        
+        # Điểm dừng hợp tác do CrawlerManager gán: hàm chờ khi đang tạm dừng,
+        # trả về False nếu lượt crawl đã bị hủy (và phiên bản coroutine của nó)
+        self.checkpoint = None
+        self.checkpoint_async = None
+        
+        # Lượt trích xuất hàng loạt do CrawlerManager gán ở chế độ bulk: trang cần
+        # OpenAI được ghi vào file request thay vì gọi API ngay
+        self.bulk_extraction = None
+    
+    def wait_if_paused(self):
+        """
+        Điểm dừng hợp tác giữa các bước tốn tài nguyên (tải trang, gọi OpenAI)
+        
+        Raises:
+            CrawlCancelled: Nếu lượt crawl đã bị hủy
+        """
+        if self.checkpoint and not self.checkpoint():
+            raise CrawlCancelled()
+    
+    async def wait_if_paused_async(self):
+        """
+        Phiên bản bất đồng bộ của wait_if_paused, chờ mà không chặn event loop
+        
+        Raises:
+            CrawlCancelled: Nếu lượt crawl đã bị hủy
+        """
+        if self.checkpoint_async:
+            if not await self.checkpoint_async():
+                raise CrawlCancelled()
+        elif self.checkpoint:
+            await asyncio.to_thread(self.wait_if_paused)
+    
+    @property
+    def session(self):
+        """
+        Session HTTP của thread hiện tại
+        
+        Mỗi worker thread có session riêng, các session dùng chung connection
+        pool (xem app/crawlers/http_session.py).
+        
+        Returns:
+            requests.Session: Session chỉ dùng trong thread hiện tại
+        """
+        return http_session_pool.session(self.name, self.headers)
+    
+    def _rate_limit_key(self, url):
+        """
+        Khóa dùng để giới hạn tốc độ request, mặc định là base_url của crawler
+        
+        Args:
+            url (str): URL sắp được tải
+            
+        Returns:
+            str: URL đại diện cho host cần giới hạn
+        """
+        return getattr(self, 'base_url', None) or url
+    
+    def concurrency_key(self, url=None):
+        """
+        Tên đích dùng cho adaptive concurrency (host của crawler)
+        
+        Args:
+            url (str, optional): URL sắp được tải
+            
+        Returns:
+            str: Tên host
+        """
+        return host_rate_limiter.host_key(self._rate_limit_key(url or ''))
+    
+    def _cached_entry(self, url):
+        """
+        Tra cứu trang trong page cache
+        
+        Args:
+            url (str): URL của trang web
+            
+        Returns:
+            dict: Bản ghi cache (xem PageCache.lookup), None nếu không có
+        """
+        if not self.page_cache:
+            return None
+        return self.page_cache.lookup(url, site=self.name)
     
-    def get_page(self, url):
+    def _conditional_headers(self, entry):
+        """
+        Tạo header conditional GET từ bản ghi cache đã hết hạn
+        
+        Args:
+            entry (dict): Bản ghi cache, có thể None
+            
+        Returns:
+            dict: Header If-None-Match/If-Modified-Since (có thể rỗng)
+        """
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def _handle_response(self, url, entry, status_code, text, headers, body=None, encoding=None):
+        """
+        Xử lý response sau khi tải trang: dùng lại bản cache khi nhận 304,
+        ngược lại lưu nội dung mới cùng ETag/Last-Modified vào cache
+        
+        Args:
+            url (str): URL của trang web
+            entry (dict): Bản ghi cache trước khi tải, có thể None
+            status_code (int): Mã trạng thái HTTP
+            text (str): Nội dung response
+            headers (dict): Header của response
+            body (bytes, optional): Nội dung response dạng bytes
+            encoding (str, optional): Bảng mã của response
+            
+        Returns:
+            FetchedPage: Trang đã tải, None nếu nhận 304 mà không có bản cache
+        """
+        if status_code == 304:
+            if entry:
+                self.page_cache.revalidate(url)
+                return FetchedPage(entry['html'], True)
+            # 304 không có bản cache để dùng lại: không có nội dung, không lưu vào cache
+            print(f"Lỗi khi tải trang {url}: HTTP 304 nhưng không có bản cache")
+            return None
+        
+        if self.page_cache:
+            self.page_cache.put(
+                url, text, site=self.name,
+                etag=headers.get('ETag'),
+                last_modified=headers.get('Last-Modified')
+            )
+        return FetchedPage(text, False, body, encoding)
+    
+    def _retry_delay(self, url, host, attempt, kind, retry_after=None):
+        """
+        Tính thời gian chờ trước khi thử lại một request lỗi
+        
+        Args:
+            url (str): URL đang tải
+            host (str): Tên host
+            attempt (int): Số lần đã thử lại
+            kind (str): Loại lỗi (xem app/crawlers/retry_policy.py)
+            retry_after (float, optional): Giá trị Retry-After của server (giây)
+            
+        Returns:
+            float: Thời gian chờ (giây), None nếu đã hết số lần thử lại
+            
+        Raises:
+            HostUnavailableError: Nếu phải chờ quá RETRY_INLINE_MAX_DELAY, để
+                                  link được trả về hàng đợi thay vì giữ worker
+        """
+        if attempt >= HTTP_MAX_RETRIES:
+            return None
+        
+        delay = backoff_delay(attempt, retry_after)
+        if delay > RETRY_INLINE_MAX_DELAY:
+            raise HostUnavailableError(host, time.time() + delay, f"{kind}, chờ {delay:.0f}s")
+        
+        logger.info(f"Lỗi {kind} khi tải {url}, thử lại lần {attempt + 1} sau {delay:.1f}s")
+        return delay
+    
+    def fetch_page(self, url):
+        """
+        Tải trang web, dùng page cache và conditional GET khi có thể
+        
+        Lỗi kết nối, timeout, 5xx và 429 được thử lại với exponential backoff.
+        
+        Args:
+            url (str): URL của trang web cần tải
+            
+        Returns:
+            FetchedPage: Nội dung HTML và cờ `unchanged` cho biết trang không
+                         thay đổi so với lần trích xuất trước
+            None: Nếu có lỗi xảy ra
+            
+        Raises:
+            HostUnavailableError: Nếu circuit breaker của host đang mở
+        """
+        entry = self._cached_entry(url)
+        if entry and entry['fresh']:
+            return FetchedPage(entry['html'], True)
+        
+        host = self.concurrency_key(url)
+        breaker = circuit_breakers.breaker_for(host)
+        
+        conditional = self._conditional_headers(entry)
+        refetched = False
+        attempt = 0
+        while True:
+            probe = breaker.check()
+            response = None
+            try:
+                # Chờ tới lượt theo ngân sách request chung của host để tránh bị chặn
+                host_rate_limiter.acquire(self._rate_limit_key(url))
+                
+                # Số request đồng thời tới host được điều chỉnh theo độ trễ và lỗi
+                with concurrency_controller.slot(host, HTTP_OVERLOAD_ERRORS) as slot:
+                    response = self.session.get(url, headers=conditional, timeout=self.timeout)
+                    slot.record_status(response.status_code)
+                kind = classify_status(response.status_code)
+                error = f"HTTP {response.status_code}"
+            except requests.exceptions.RequestException as e:
+                kind = classify_exception(e)
+                error = e
+                if kind is None:
+                    # Lỗi không do host quá tải: trả lại lượt thăm dò cho request khác
+                    if probe:
+                        breaker.release_probe()
+                    print(f"Lỗi khi tải trang {url}: {e}")
+                    return None
+            except BaseException:
+                # Bị hủy (CrawlCancelled, CancelledError...) trước khi có kết quả
+                if probe:
+                    breaker.release_probe()
+                raise
+            
+            if kind is None:
+                if response.status_code == 304 and not entry and not refetched:
+                    # 304 mà không có bản cache (ví dụ vừa bị xóa): tải lại một lần không dùng conditional GET
+                    breaker.record_success()
+                    refetched = True
+                    conditional = {'Cache-Control': 'no-cache'}
+                    continue
+                break
+            
+            breaker.record_failure()
+            retry_after = parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+            delay = self._retry_delay(url, host, attempt, kind, retry_after)
+            if delay is None:
+                print(f"Lỗi khi tải trang {url}: {error}")
+                return None
+            time.sleep(delay)
+            attempt += 1
+        
+        breaker.record_success()
+        if response.status_code >= 400:
+            print(f"Lỗi khi tải trang {url}: HTTP {response.status_code}")
+            return None
+        
+        return self._handle_response(
+            url, entry, response.status_code, response.text, response.headers,
+            response.content, response.encoding
+        )
+    
+    async def fetch_page_async(self, url, engine):
+        """
+        Phiên bản bất đồng bộ của fetch_page
+        
+        Args:
+            url (str): URL của trang web cần tải
+            engine (AsyncFetchEngine): Engine tải trang bất đồng bộ đang chạy
+            
+        Returns:
+            FetchedPage: Nội dung HTML và cờ `unchanged`
+            None: Nếu có lỗi xảy ra
+            
+        Raises:
+            HostUnavailableError: Nếu circuit breaker của host đang mở
+        """
+        entry = self._cached_entry(url)
+        if entry and entry['fresh']:
+            return FetchedPage(entry['html'], True)
+        
+        host = self.concurrency_key(url)
+        breaker = circuit_breakers.breaker_for(host)
+        
+        # Để httpx tự khai báo các kiểu nén mà nó giải mã được
+        base_headers = {k: v for k, v in self.headers.items() if k != 'Accept-Encoding'}
+        headers = {**base_headers, **self._conditional_headers(entry)}
+        refetched = False
+        
+        attempt = 0
+        while True:
+            probe = breaker.check()
+            response = None
+            try:
+                # Chờ tới lượt theo ngân sách chung của host, chỉ chặn coroutine hiện tại
+                await host_rate_limiter.acquire_async(self._rate_limit_key(url))
+                
+                response = await engine.fetch(url, headers=headers, timeout=self.timeout, target=host)
+                kind = classify_status(response.status_code)
+                error = f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                kind = classify_exception(e)
+                error = e
+                if kind is None:
+                    # Lỗi không do host quá tải: trả lại lượt thăm dò cho request khác
+                    if probe:
+                        breaker.release_probe()
+                    print(f"Lỗi khi tải trang {url}: {e}")
+                    return None
+            except BaseException:
+                # Bị hủy (CrawlCancelled, CancelledError...) trước khi có kết quả
+                if probe:
+                    breaker.release_probe()
+                raise
+            
+            if kind is None:
+                if response.status_code == 304 and not entry and not refetched:
+                    # 304 mà không có bản cache (ví dụ vừa bị xóa): tải lại một lần không dùng conditional GET
+                    breaker.record_success()
+                    refetched = True
+                    headers = {**base_headers, 'Cache-Control': 'no-cache'}
+                    continue
+                break
+            
+            breaker.record_failure()
+            retry_after = parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+            delay = self._retry_delay(url, host, attempt, kind, retry_after)
+            if delay is None:
+                print(f"Lỗi khi tải trang {url}: {error}")
+                return None
+            await asyncio.sleep(delay)
+            attempt += 1
+        
+        breaker.record_success()
+        if response.status_code >= 400:
+            print(f"Lỗi khi tải trang {url}: HTTP {response.status_code}")
+            return None
+        
+        return self._handle_response(
+            url, entry, response.status_code, response.text, response.headers,
+            response.content, response.charset_encoding or response.encoding
+        )
+    
+    def fetch_html(self, url):
+        """
+        Tải nội dung HTML của trang web
+        
+        Args:
+            url (str): URL của trang web cần tải
+            
+        Returns:
+            str: Nội dung HTML của trang
+            None: Nếu có lỗi xảy ra
+        """
+        page = self.fetch_page(url)
+        return page.html if page else None
+    
+    async def fetch_html_async(self, url, engine):
+        """
+        Phiên bản bất đồng bộ của fetch_html
+        
+        Args:
+            url (str): URL của trang web cần tải
+            engine (AsyncFetchEngine): Engine tải trang bất đồng bộ đang chạy
+            
+        Returns:
+            str: Nội dung HTML của trang
+            None: Nếu có lỗi xảy ra
+        """
+        page = await self.fetch_page_async(url, engine)
+        return page.html if page else None
+    
+    def _log_clean_stats(self, url, stats):
+        """
+        Ghi log kích thước nội dung trước và sau khi rút gọn cho OpenAI
+        """
+        logger.info(
+            f"Rút gọn nội dung {url}: {stats['original_chars']} -> {stats['cleaned_chars']} ký tự "
+            f"({stats['ratio']:.1%})"
+        )
+    
+    def prepare_llm_content(self, html, url):
+        """
+        Rút gọn HTML thành văn bản gọn trước khi gửi cho OpenAI
+        
+        Args:
+            html (str): Nội dung HTML của trang việc làm
+            url (str): URL của trang việc làm
+            
+        Returns:
+            str: Văn bản chứa nội dung chính của trang
+        """
+        text, stats = html_to_text(html)
+        self._log_clean_stats(url, stats)
+        return text
+    
+    def extract_local_details(self, html, url, body=None, encoding=None):
+        """
+        Phần trích xuất cục bộ (tốn CPU) của extract_details_from_html
+        
+        Chạy trong parse pool (process con) nếu được bật, ngược lại chạy ngay
+        trong thread hiện tại.
+        
+        Args:
+            html (str): Nội dung HTML của trang việc làm
+            url (str): URL của trang việc làm
+            body (bytes, optional): Bytes nguyên bản của response, tránh phải mã hóa lại html
+            encoding (str, optional): Bảng mã của body
+            
+        Returns:
+            dict: Kết quả của app.crawlers.parse_pool.extract_local
+        """
+        parse_pool = get_parse_pool()
+        if parse_pool is None:
+            return extract_local(html, self.compiled_spec)
+        
+        if body is None:
+            body, encoding = html.encode('utf-8'), 'utf-8'
+        return parse_pool.extract(self.name, self.extraction_spec, body, encoding)
+    
+    def extract_details_from_html(self, html, url, body=None, encoding=None):
+        """
+        Trích xuất thông tin chi tiết từ HTML của trang việc làm
+        
+        Ưu tiên dữ liệu có cấu trúc JSON-LD (JobPosting) của trang, sau đó tới
+        extraction_spec của crawler. OpenAI chỉ được gọi khi còn thiếu trường
+        bắt buộc, và chỉ cho các trường còn thiếu.
+        
+        Args:
+            html (str): Nội dung HTML của trang việc làm
+            url (str): URL của trang việc làm
+            body (bytes, optional): Bytes nguyên bản của response (dùng cho parse pool)
+            encoding (str, optional): Bảng mã của body
+            
+        Returns:
+            dict: Thông tin chi tiết về việc làm
+            
+        Raises:
+            CrawlCancelled: Nếu lượt crawl bị hủy trước khi gọi OpenAI
+        """
+        local = self.extract_local_details(html, url, body, encoding)
+        if local['content'] is None:
+            return self._complete_local_details(local, url)
+        
+        # Không gọi OpenAI (tốn tiền) khi đang tạm dừng hoặc đã hủy
+        self.wait_if_paused()
+        
+        self._log_clean_stats(url, local['clean_stats'])
+        if not local['details']:
+            return self.extract_with_openai(local['content'], url)
+        
+        # Chỉ yêu cầu OpenAI các trường còn thiếu rồi gộp vào kết quả
+        llm_details = self.extract_with_openai(local['content'], url, fields=local['missing'])
+        return self._merge_llm_details(local, llm_details)
+    
+    async def extract_details_from_html_async(self, html, url, body=None, encoding=None):
+        """
+        Phiên bản bất đồng bộ của extract_details_from_html
+        
+        Phần trích xuất cục bộ chạy trong thread riêng; lời gọi OpenAI dùng
+        AsyncOpenAI client nên chờ ngân sách RPM/TPM mà không giữ thread.
+        
+        Args:
+            html (str): Nội dung HTML của trang việc làm
+            url (str): URL của trang việc làm
+            body (bytes, optional): Bytes nguyên bản của response (dùng cho parse pool)
+            encoding (str, optional): Bảng mã của body
+            
+        Returns:
+            dict: Thông tin chi tiết về việc làm
+            
+        Raises:
+            CrawlCancelled: Nếu lượt crawl bị hủy trước khi gọi OpenAI
+        """
+        local = await asyncio.to_thread(self.extract_local_details, html, url, body, encoding)
+        if local['content'] is None:
+            return self._complete_local_details(local, url)
+        
+        # Không gọi OpenAI (tốn tiền) khi đang tạm dừng hoặc đã hủy
+        await self.wait_if_paused_async()
+        
+        self._log_clean_stats(url, local['clean_stats'])
+        if not local['details']:
+            return await self.extract_with_openai_async(local['content'], url)
+        
+        llm_details = await self.extract_with_openai_async(local['content'], url, fields=local['missing'])
+        return self._merge_llm_details(local, llm_details)
+    
+    @staticmethod
+    def _complete_local_details(local, url):
+        """
+        Kết quả khi trích xuất cục bộ đã đủ trường bắt buộc (không cần OpenAI)
+        """
+        logger.debug(f"Đã trích xuất đủ thông tin cục bộ từ {url}, bỏ qua OpenAI")
+        job_details = local['details']
+        for field in local['missing']:
+            job_details[field] = ""
+        return job_details
+    
+    @staticmethod
+    def _merge_llm_details(local, llm_details):
+        """
+        Gộp các trường còn thiếu do OpenAI trích xuất vào kết quả cục bộ
+        """
+        job_details = local['details']
+        for field in local['missing']:
+            job_details[field] = llm_details.get(field, "")
+        if 'error' in llm_details:
+            job_details['error'] = llm_details['error']
+        return job_details
+    
+    def extract_with_openai(self, content, url, fields=None):
+        """
+        Gọi OpenAI trích xuất thông tin việc làm, gom vào batch với các trang
+        của worker khác khi bật OPENAI_BATCH_EXTRACT
+        
+        Ở chế độ bulk, trang được đưa vào file request của Batch API và kết quả
+        trả về là dict rỗng (các trường được điền sau khi batch hoàn thành).
+        
+        Args:
+            content (str): Nội dung trang đã rút gọn
+            url (str): URL của trang việc làm
+            fields (list, optional): Chỉ trích xuất các trường này
+            
+        Returns:
+            dict: Thông tin chi tiết về việc làm
+        """
+        if self.bulk_extraction is not None:
+            job_info = self.bulk_extraction.add(content, url, fields)
+            return job_info if job_info is not None else {}
+        
+        batcher = get_extraction_batcher()
+        if batcher:
+            return batcher.extract(content, url, fields)
+        return extract_job_info_with_openai(content, url, fields=fields)
+    
+    async def extract_with_openai_async(self, content, url, fields=None):
+        """
+        Phiên bản bất đồng bộ của extract_with_openai
+        
+        Args:
+            content (str): Nội dung trang đã rút gọn
+            url (str): URL của trang việc làm
+            fields (list, optional): Chỉ trích xuất các trường này
+            
+        Returns:
+            dict: Thông tin chi tiết về việc làm
+        """
+        # Bulk và batcher ghi file hoặc chờ batch đồng bộ nên chạy trong thread riêng
+        if self.bulk_extraction is not None or get_extraction_batcher():
+            return await asyncio.to_thread(self.extract_with_openai, content, url, fields)
+        return await extract_job_info_with_openai_async(content, url, fields=fields)
+    
+    def get_stored_details(self, url):
+        """
+        Lấy kết quả trích xuất đã lưu của một trang không thay đổi
+        
+        Args:
+            url (str): URL của trang việc làm
+            
+        Returns:
+            dict: Thông tin chi tiết đã lưu, None nếu chưa có
+        """
+        if not self.page_cache:
+            return None
+        return self.page_cache.get_record(url)
+    
+    def store_details(self, url, job_details):
+        """
+        Lưu kết quả trích xuất để dùng lại khi trang không thay đổi
+        
+        Args:
+            url (str): URL của trang việc làm
+            job_details (dict): Thông tin chi tiết về việc làm
+        """
+        # Không lưu kết quả lỗi hoặc còn chờ batch để lần sau còn trích xuất lại
+        if self.bulk_extraction is not None and self.bulk_extraction.is_pending(url):
+            return
+        if self.page_cache and job_details and 'error' not in job_details:
+            self.page_cache.put_record(url, job_details)
+    
+    def get_page(self, url, parse_only=None):
         """
         Tải nội dung trang web từ URL
         
         Args:
             url (str): URL của trang web cần tải
+            parse_only (SoupStrainer, optional): Chỉ phân tích các thẻ cần thiết
             
         Returns:
             BeautifulSoup: Đối tượng BeautifulSoup chứa nội dung trang
             None: Nếu có lỗi xảy ra
         """
         try:
-            # Thêm độ trễ ngẫu nhiên để tránh bị chặn
-            time.sleep(random.uniform(1, 3))
-            
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            html = self.fetch_html(url)
+        except HostUnavailableError as e:
+            print(f"Lỗi khi tải trang {url}: {e}")
+            return None
+        if html is None:
+            return None
+        
+        # Phân tích cú pháp HTML với backend đã cấu hình
+        return parse_html(html, parse_only=parse_only)
+    
+    async def get_page_async(self, url, engine, parse_only=None):
+        """
+        Phiên bản bất đồng bộ của get_page
+        
+        Args:
+            url (str): URL của trang web cần tải
+            engine (AsyncFetchEngine): Engine tải trang bất đồng bộ đang chạy
+            parse_only (SoupStrainer, optional): Chỉ phân tích các thẻ cần thiết
             
-            # Phân tích cú pháp HTML với BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
-            return soup
-        except requests.exceptions.RequestException as e:
+        Returns:
+            BeautifulSoup: Đối tượng BeautifulSoup chứa nội dung trang
+            None: Nếu có lỗi xảy ra
+        """
+        try:
+            html = await self.fetch_html_async(url, engine)
+        except HostUnavailableError as e:
             print(f"Lỗi khi tải trang {url}: {e}")
             return None
+        if html is None:
+            return None
+        
+        return parse_html(html, parse_only=parse_only)
     
     @abstractmethod
-    def search_jobs(self, keywords, location=None, filters=None):
+    def search_jobs(self, keywords, location=None, filters=None, limit=None, on_links=None):
         """
         Tìm kiếm việc làm dựa trên từ khóa và bộ lọc
         
@@ -67,6 +689,9 @@ class BaseCrawler(ABC):
             keywords (list): Danh sách từ khóa tìm kiếm
             location (dict, optional): Thông tin vị trí địa lý
             filters (dict, optional): Các bộ lọc bổ sung
+            limit (int, optional): Số lượng URL tối đa cần tìm, cho phép dừng sớm
+            on_links (function, optional): Nhận danh sách URL mới ngay khi tìm được
+                (ví dụ mỗi trang kết quả) để bước sau xử lý mà không chờ tìm kiếm xong
             
         Returns:
             list: Danh sách các URL việc làm
@@ -86,6 +711,23 @@ class BaseCrawler(ABC):
         """
         pass
     
+    async def extract_job_details_async(self, url, engine):
+        """
+        Phiên bản bất đồng bộ của extract_job_details
+        
+        Mặc định chạy extract_job_details đồng bộ trong một thread để các crawler
+        chưa hỗ trợ async vẫn dùng được với engine bất đồng bộ. Các crawler con
+        nên ghi đè phương thức này và dùng get_page_async.
+        
+        Args:
+            url (str): URL của trang việc làm
+            engine (AsyncFetchEngine): Engine tải trang bất đồng bộ đang chạy
+            
+        Returns:
+            dict: Thông tin chi tiết về việc làm
+        """
+        return await asyncio.to_thread(self.extract_job_details, url)
+    
     def clean_text(self, text):
         """
         Làm sạch văn bản, loại bỏ khoảng trắng thừa
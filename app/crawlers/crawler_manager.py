@@ -1,18 +1,43 @@
 """
 Crawler Manager - Quản lý tất cả các crawler
 """
+import asyncio
+import queue
 import threading
 import pandas as pd
 import time
 import os
 import logging
-from concurrent.futures import ThreadPoolExecutor
-from app.utils.config import MAX_THREADS, JOB_LINKS_FILE, JOB_DETAILS_FILE
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from app.utils.config import (
+    MAX_THREADS, JOB_LINKS_FILE, JOB_DETAILS_FILE, ASYNC_FETCH, ASYNC_MAX_CONCURRENCY,
+    PIPELINE_QUEUE_SIZE, FRONTIER_POLL_INTERVAL, CONCURRENCY_MAX, LINKS_CSV_CHUNK_SIZE
+)
+from app.crawlers.async_engine import AsyncFetchEngine
+from app.crawlers.base_crawler import CrawlCancelled
+from app.crawlers.retry_policy import HostUnavailableError, circuit_breakers
+from app.crawlers.http_session import http_session_pool
+from app.crawlers.parse_pool import shutdown_parse_pool
+from app.data.page_cache import get_page_cache
+from app.data.llm_cache import get_llm_cache
+from app.data.crawl_journal import CrawlJournal
+from app.data.crawl_frontier import CrawlFrontier
+from app.utils.concurrency import concurrency_controller
+from app.utils.token_budget import openai_budget
+from app.utils.openai_helper import close_async_client
+from app.utils.bulk_extraction import BulkExtraction
+from app.utils.dedup import UrlDeduplicator
+from app.utils.url_utils import canonicalize_url, dedup_key
 from app.crawlers.vietnamworks_crawler import VietnamWorksCrawler
 
 # Thiết lập logger
 logger = logging.getLogger(__name__)
 
+# Đánh dấu kết thúc luồng kết quả của iter_job_links/iter_job_details
+_STREAM_END = object()
+
 class CrawlerManager:
     """
     Quản lý tất cả các crawler và điều phối quá trình crawl
@@ -30,9 +55,33 @@ class CrawlerManager:
         self.job_links = []
         self.job_details = []
         
+        # Tập URL đã thấy, dùng chung giữa các từ khóa và các trang web
+        self.url_dedup = UrlDeduplicator()
+        
+        # Nhật ký checkpoint của quá trình crawl chi tiết
+        self.journal = CrawlJournal()
+        
+        # Hàng đợi link crawl chi tiết trên đĩa và mã lượt crawl hiện tại trong đó
+        self.frontier = CrawlFrontier()
+        self._run_id = None
+        
+        # Hàng đợi link cho chế độ pipeline (None khi không dùng pipeline)
+        self._link_queue = None
+        
         # Cờ để kiểm soát quá trình crawl
         self.pause_flag = threading.Event()
         self.pause_flag.set()  # Mặc định là không tạm dừng
+        self.cancel_flag = threading.Event()
+        
+        # Bản sao của pause_flag cho từng event loop, để coroutine chờ khi tạm dừng
+        # mà không giữ thread; được cập nhật qua call_soon_threadsafe khi đổi trạng thái
+        self._async_pause_events = weakref.WeakKeyDictionary()
+        self._async_pause_lock = threading.Lock()
+        
+        # Worker kiểm tra tạm dừng/hủy tại ranh giới giữa các bước của crawler
+        for crawler in self.crawlers.values():
+            crawler.checkpoint = self._checkpoint
+            crawler.checkpoint_async = self._checkpoint_async
         
         # Biến để theo dõi tiến trình
         self.total_links = 0
@@ -40,6 +89,15 @@ class CrawlerManager:
         self.total_details = 0
         self.processed_details = 0
         
+        # Kết quả từ các worker được gửi qua hàng đợi cho một thread collector
+        # duy nhất; collector sở hữu job_links/job_details, bộ đếm và callback
+        self._results = None
+        self._collector = None
+        self._emit = None
+        
+        # Lượt trích xuất hàng loạt đang chạy (chế độ bulk)
+        self._bulk = None
+        
         # Callback functions
         self.on_link_crawled = None
         self.on_detail_crawled = None
@@ -78,6 +136,7 @@ class CrawlerManager:
         Tạm dừng quá trình crawl
         """
         self.pause_flag.clear()
+        self._sync_async_pause()
         logger.info("Đã tạm dừng quá trình crawl")
     
     def resume_crawling(self):
@@ -85,11 +144,294 @@ class CrawlerManager:
         Tiếp tục quá trình crawl
         """
         self.pause_flag.set()
+        self._sync_async_pause()
         logger.info("Đã tiếp tục quá trình crawl")
     
+    def cancel_crawling(self):
+        """
+        Hủy quá trình crawl đang chạy
+        
+        Worker dừng ở điểm kiểm tra kế tiếp, link chưa xong được trả về
+        frontier và kết quả đã có vẫn được lưu.
+        """
+        self.cancel_flag.set()
+        # Đánh thức các worker đang chờ do tạm dừng để chúng thấy cờ hủy
+        self.pause_flag.set()
+        self._sync_async_pause()
+        logger.info("Đã yêu cầu hủy quá trình crawl")
+    
+    def _start_run(self):
+        """
+        Xóa cờ hủy của lượt crawl trước và tạo mã cho lượt mới
+        """
+        self.cancel_flag.clear()
+        self._run_id = uuid.uuid4().hex
+    
+    def _checkpoint(self):
+        """
+        Điểm dừng hợp tác: chờ khi đang tạm dừng
+        
+        Returns:
+            bool: False nếu lượt crawl đã bị hủy
+        """
+        self.pause_flag.wait()
+        return not self.cancel_flag.is_set()
+    
+    def _apply_pause_state(self, event):
+        """
+        Đặt asyncio.Event của một event loop theo pause_flag (chạy trên loop đó)
+        """
+        if self.pause_flag.is_set():
+            event.set()
+        else:
+            event.clear()
+    
+    def _sync_async_pause(self):
+        """
+        Cập nhật asyncio.Event của mọi event loop sau khi pause_flag thay đổi
+        """
+        with self._async_pause_lock:
+            for loop, event in list(self._async_pause_events.items()):
+                try:
+                    loop.call_soon_threadsafe(self._apply_pause_state, event)
+                except RuntimeError:
+                    # Event loop đã đóng
+                    self._async_pause_events.pop(loop, None)
+    
+    def _async_pause_event(self):
+        """
+        Lấy asyncio.Event của event loop hiện tại, được set khi không tạm dừng
+        
+        Returns:
+            asyncio.Event: Sự kiện dùng với `await event.wait()`
+        """
+        loop = asyncio.get_running_loop()
+        with self._async_pause_lock:
+            event = self._async_pause_events.get(loop)
+            if event is None:
+                event = asyncio.Event()
+                self._apply_pause_state(event)
+                self._async_pause_events[loop] = event
+            return event
+    
+    async def _checkpoint_async(self):
+        """
+        Phiên bản bất đồng bộ của _checkpoint, chờ trên asyncio.Event nên không
+        chặn event loop và không giữ thread nào trong lúc tạm dừng
+        
+        Returns:
+            bool: False nếu lượt crawl đã bị hủy
+        """
+        if not self.pause_flag.is_set():
+            await self._async_pause_event().wait()
+        return not self.cancel_flag.is_set()
+    
+    def _start_collector(self, emit=None):
+        """
+        Khởi động thread collector cho một lượt crawl
+        
+        Args:
+            emit (function, optional): Nhận từng bản ghi hoàn thành (chế độ
+                                       streaming). Khi có emit, bản ghi không
+                                       được giữ lại trong job_links/job_details
+        """
+        self._emit = emit
+        self._results = queue.Queue()
+        self._collector = threading.Thread(target=self._collect_results, name='result-collector', daemon=True)
+        self._collector.start()
+    
+    def _stop_collector(self):
+        """
+        Chờ collector xử lý hết kết quả còn trong hàng đợi rồi dừng
+        """
+        if self._collector is None:
+            return
+        self._results.put(None)
+        self._collector.join()
+        self._collector = None
+        self._emit = None
+    
+    def _collect_results(self):
+        """
+        Vòng lặp của thread collector: cập nhật danh sách kết quả, bộ đếm và gọi
+        callback theo thứ tự nhận được. Chỉ thread này ghi vào các trạng thái đó
+        nên không cần lock, và worker không bao giờ bị chặn bởi callback của GUI.
+        """
+        while True:
+            event = self._results.get()
+            if event is None:
+                break
+            
+            kind = event[0]
+            try:
+                if kind == 'links_found':
+                    self.total_links += event[1]
+                elif kind == 'link':
+                    self._collect_link(event[1])
+                elif kind == 'detail':
+                    self._collect_detail(event[1])
+            except Exception as e:
+                logger.error(f"Lỗi khi xử lý kết quả crawl: {e}")
+    
+    def _collect_link(self, link_info):
+        """
+        Ghi nhận một link tìm được (chạy trong thread collector)
+        
+        Args:
+            link_info (dict): Thông tin về link việc làm
+        """
+        if self._emit:
+            self._emit(link_info)
+        else:
+            self.job_links.append(link_info)
+        self.processed_links += 1
+        
+        # Chế độ pipeline: link cũng được tính vào tổng số chi tiết cần crawl
+        if self._link_queue is not None:
+            self.total_details += 1
+        
+        # Gọi callback nếu có
+        if self.on_link_crawled:
+            self.on_link_crawled(link_info['url'], link_info['source'])
+        
+        # Cập nhật tiến trình
+        if self.on_progress_updated:
+            progress = (self.processed_links / self.total_links) * 100 if self.total_links > 0 else 0
+            self.on_progress_updated('links', progress)
+    
+    def _collect_detail(self, job_detail):
+        """
+        Ghi nhận một kết quả crawl chi tiết (chạy trong thread collector)
+        
+        Args:
+            job_detail (dict): Thông tin chi tiết việc làm
+        """
+        if self._emit:
+            self._emit(job_detail)
+        else:
+            self.job_details.append(job_detail)
+        self.processed_details += 1
+        
+        # Gọi callback nếu có
+        if self.on_detail_crawled:
+            self.on_detail_crawled(job_detail)
+        
+        # Cập nhật tiến trình
+        if self.on_progress_updated:
+            progress = (self.processed_details / self.total_details) * 100 if self.total_details > 0 else 0
+            self.on_progress_updated('details', progress)
+    
+    def _stream(self, produce):
+        """
+        Chạy một lượt crawl trong thread nền và trả về từng bản ghi khi xong
+        
+        Nếu người dùng dừng đọc giữa chừng (break, đóng generator), lượt crawl
+        bị hủy như khi gọi cancel_crawling.
+        
+        Args:
+            produce (function): Hàm chạy lượt crawl, nhận hàm emit cho collector
+            
+        Yields:
+            dict: Bản ghi theo thứ tự hoàn thành
+        """
+        stream = queue.Queue()
+        errors = []
+        
+        def run():
+            try:
+                produce(stream.put)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                stream.put(_STREAM_END)
+        
+        thread = threading.Thread(target=run, name='crawl-stream', daemon=True)
+        thread.start()
+        try:
+            while True:
+                record = stream.get()
+                if record is _STREAM_END:
+                    break
+                yield record
+            if errors:
+                raise errors[0]
+        finally:
+            if thread.is_alive():
+                self.cancel_crawling()
+            thread.join()
+    
+    async def _stream_async(self, produce):
+        """
+        Phiên bản bất đồng bộ của _stream, chạy lượt crawl trên event loop hiện tại
+        
+        Args:
+            produce (function): Hàm nhận hàm emit và trả về coroutine chạy lượt crawl
+            
+        Yields:
+            dict: Bản ghi theo thứ tự hoàn thành
+        """
+        loop = asyncio.get_running_loop()
+        stream = asyncio.Queue()
+        
+        # Collector chạy trong thread riêng nên phải chuyển bản ghi về event loop
+        def emit(record):
+            loop.call_soon_threadsafe(stream.put_nowait, record)
+        
+        task = asyncio.ensure_future(produce(emit))
+        task.add_done_callback(lambda _: stream.put_nowait(_STREAM_END))
+        try:
+            while True:
+                record = await stream.get()
+                if record is _STREAM_END:
+                    break
+                yield record
+            await task
+        finally:
+            if not task.done():
+                self.cancel_crawling()
+                await asyncio.wait([task])
+    
+    def iter_job_links(self, keywords, location=None, filters=None, limit=None):
+        """
+        Crawl link việc làm và trả về từng link ngay khi tìm thấy
+        
+        Link không được giữ lại trong bộ nhớ hay lưu vào file CSV.
+        
+        Args:
+            keywords (list): Danh sách từ khóa tìm kiếm
+            location (dict, optional): Thông tin vị trí địa lý
+            filters (dict, optional): Các bộ lọc bổ sung
+            limit (int, optional): Giới hạn số lượng link
+            
+        Yields:
+            dict: Thông tin link {'url', 'source', 'status'}
+        """
+        yield from self._stream(
+            lambda emit: self._run_job_links(keywords, location, filters, limit, emit)
+        )
+    
+    async def iter_job_links_async(self, keywords, location=None, filters=None, limit=None):
+        """
+        Phiên bản bất đồng bộ của iter_job_links (dùng với `async for`)
+        
+        Args:
+            keywords (list): Danh sách từ khóa tìm kiếm
+            location (dict, optional): Thông tin vị trí địa lý
+            filters (dict, optional): Các bộ lọc bổ sung
+            limit (int, optional): Giới hạn số lượng link
+            
+        Yields:
+            dict: Thông tin link {'url', 'source', 'status'}
+        """
+        # Bước tìm link chạy bằng thread cho mỗi crawler
+        async for link_info in self._stream_async(
+            lambda emit: asyncio.to_thread(self._run_job_links, keywords, location, filters, limit, emit)
+        ):
+            yield link_info
+    
     def crawl_job_links(self, keywords, location=None, filters=None, limit=None):
         """
-        Crawl các link việc làm từ tất cả các trang web được hỗ trợ
+        Crawl các link việc làm từ các trang web
         
         Args:
             keywords (list): Danh sách từ khóa tìm kiếm
@@ -100,26 +442,7 @@ class CrawlerManager:
         Returns:
             list: Danh sách các URL việc làm
         """
-        self.job_links = []
-        self.total_links = 0
-        self.processed_links = 0
-        
-        logger.info(f"Bắt đầu crawl link việc làm với {len(keywords)} từ khóa: {', '.join(keywords)}")
-        logger.info(f"Chế độ tìm kiếm: {'OpenAI Deep Search' if self.deep_search_mode else 'Tìm kiếm truyền thống'}")
-        
-        # Tạo thread cho mỗi crawler
-        threads = []
-        for crawler_name, crawler in self.crawlers.items():
-            thread = threading.Thread(
-                target=self._crawl_links_from_site,
-                args=(crawler, keywords, location, filters, limit)
-            )
-            threads.append(thread)
-            thread.start()
-        
-        # Chờ tất cả các thread hoàn thành
-        for thread in threads:
-            thread.join()
+        self.job_links = list(self.iter_job_links(keywords, location, filters, limit))
         
         # Lưu danh sách link vào file CSV
         self._save_links_to_csv()
@@ -128,6 +451,44 @@ class CrawlerManager:
         
         return self.job_links
     
+    def _run_job_links(self, keywords, location, filters, limit, emit=None):
+        """
+        Chạy một lượt crawl link trên tất cả các trang web
+        
+        Args:
+            keywords (list): Danh sách từ khóa tìm kiếm
+            location (dict, optional): Thông tin vị trí địa lý
+            filters (dict, optional): Các bộ lọc bổ sung
+            limit (int, optional): Giới hạn số lượng link
+            emit (function, optional): Nhận từng link tìm được
+        """
+        self.job_links = []
+        self.total_links = 0
+        self.processed_links = 0
+        self.url_dedup = UrlDeduplicator()
+        self._start_run()
+        
+        logger.info(f"Bắt đầu crawl link việc làm với {len(keywords)} từ khóa: {', '.join(keywords)}")
+        logger.info(f"Chế độ tìm kiếm: {'OpenAI Deep Search' if self.deep_search_mode else 'Tìm kiếm truyền thống'}")
+        
+        self._start_collector(emit)
+        try:
+            # Tạo thread cho mỗi crawler
+            threads = []
+            for crawler_name, crawler in self.crawlers.items():
+                thread = threading.Thread(
+                    target=self._crawl_links_from_site,
+                    args=(crawler, keywords, location, filters, limit)
+                )
+                threads.append(thread)
+                thread.start()
+            
+            # Chờ tất cả các thread hoàn thành
+            for thread in threads:
+                thread.join()
+        finally:
+            self._stop_collector()
+    
     def _crawl_links_from_site(self, crawler, keywords, location, filters, limit):
         """
         Crawl các link việc làm từ một trang web cụ thể
@@ -139,46 +500,152 @@ class CrawlerManager:
             filters (dict, optional): Các bộ lọc bổ sung
             limit (int, optional): Giới hạn số lượng link
         """
-        try:
-            # Crawl các link việc làm
-            links = crawler.search_jobs(keywords, location, filters)
+        # URL đã chuyển cho publish (kể cả link trùng) và số link đã gửi cho collector
+        seen = set()
+        published = 0
+        duplicates = 0
+        
+        def publish(urls):
+            nonlocal published, duplicates
+            urls = [url for url in urls if url not in seen]
+            seen.update(urls)
+            
+            # Bỏ các link đã thấy ở từ khóa hoặc trang web khác; URL chuẩn hóa chỉ dùng
+            # làm khóa loại trùng, link được tải và lưu đúng như trang web trả về
+            links = [url for url in urls if self.url_dedup.add(url)]
+            duplicates += len(urls) - len(links)
             
             # Giới hạn số lượng link nếu cần
-            if limit and len(links) > limit:
-                links = links[:limit]
-                logger.info(f"Đã giới hạn kết quả từ {crawler.name} xuống {limit} link")
+            if limit:
+                links = links[:max(limit - published, 0)]
+            if not links:
+                return
+            published += len(links)
             
             # Cập nhật tổng số link
-            with threading.Lock():
-                self.total_links += len(links)
-                logger.debug(f"Tìm thấy {len(links)} link từ {crawler.name}")
+            self._results.put(('links_found', len(links)))
+            
+            link_infos = [{'url': link, 'source': crawler.name, 'status': 'Đang chờ'} for link in links]
+            
+            # Chế độ pipeline: link được ghi vào frontier để worker đánh dấu trạng thái
+            # và link bị host tạm chặn được thử lại sau khi tìm link xong
+            if self._link_queue is not None:
+                self.frontier.add(link_infos, self._run_id)
+            
+            # Gửi từng link cho collector
+            for link_info in link_infos:
+                # Kiểm tra cờ tạm dừng/hủy
+                if not self._checkpoint():
+                    raise CrawlCancelled()
+                
+                self._results.put(('link', link_info))
                 
-                # Thêm vào danh sách chung
-                for link in links:
-                    # Kiểm tra cờ tạm dừng
-                    self.pause_flag.wait()
-                    
-                    self.job_links.append({
-                        'url': link,
-                        'source': crawler.name,
-                        'status': 'Đang chờ'
-                    })
-                    
-                    self.processed_links += 1
-                    
-                    # Gọi callback nếu có
-                    if self.on_link_crawled:
-                        self.on_link_crawled(link, crawler.name)
-                    
-                    # Cập nhật tiến trình
-                    if self.on_progress_updated:
-                        progress = (self.processed_links / self.total_links) * 100 if self.total_links > 0 else 0
-                        self.on_progress_updated('links', progress)
+                # Chế độ pipeline: chuyển ngay cho worker crawl chi tiết,
+                # chặn lại khi hàng đợi đầy (worker xử lý không kịp)
+                if self._link_queue is not None:
+                    self._link_queue.put(link_info)
+        
+        try:
+            # Link của mỗi trang kết quả được gửi đi ngay khi tìm được; link crawler
+            # chỉ trả về lúc kết thúc (không gọi on_links) được gửi sau cùng
+            links = crawler.search_jobs(keywords, location, filters, limit, on_links=publish)
+            publish(links)
+            
+            if duplicates:
+                logger.info(f"Bỏ qua {duplicates} link trùng từ {crawler.name}")
+            logger.debug(f"Tìm thấy {published} link từ {crawler.name}")
+        
+        except CrawlCancelled:
+            logger.info(f"Đã hủy tìm link từ {crawler.name}")
         
         except Exception as e:
             logger.error(f"Lỗi khi crawl link từ {crawler.name}: {e}")
             print(f"Lỗi khi crawl link từ {crawler.name}: {e}")
     
+    def crawl_jobs_pipelined(self, keywords, location=None, filters=None, limit=None):
+        """
+        Crawl link và chi tiết việc làm theo kiểu pipeline
+        
+        Link tìm được được đẩy ngay vào một hàng đợi có giới hạn, các worker
+        crawl chi tiết lấy link từ hàng đợi để xử lý mà không chờ bước tìm link
+        kết thúc. Khi hàng đợi đầy, bước tìm link tạm chờ worker. Link cũng được
+        ghi vào frontier (theo mã lượt crawl riêng, không xóa checkpoint của lượt
+        crawl chi tiết khác); link bị host tạm chặn được crawl lại từ frontier
+        sau khi hàng đợi đã hết.
+        
+        Args:
+            keywords (list): Danh sách từ khóa tìm kiếm
+            location (dict, optional): Thông tin vị trí địa lý
+            filters (dict, optional): Các bộ lọc bổ sung
+            limit (int, optional): Giới hạn số lượng link
+            
+        Returns:
+            list: Danh sách thông tin chi tiết việc làm
+        """
+        self.job_links = []
+        self.job_details = []
+        self.total_links = 0
+        self.processed_links = 0
+        self.total_details = 0
+        self.processed_details = 0
+        self.url_dedup = UrlDeduplicator()
+        self._start_run()
+        self._link_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        
+        logger.info(f"Bắt đầu crawl pipeline với {len(keywords)} từ khóa: {', '.join(keywords)}")
+        
+        # Worker crawl chi tiết, dừng khi nhận None
+        def detail_worker():
+            while True:
+                link_info = self._link_queue.get()
+                if link_info is None:
+                    break
+                # Sau khi hủy vẫn lấy hết hàng đợi để bước tìm link không bị chặn
+                if not self.cancel_flag.is_set() and self.frontier.start(link_info['url']):
+                    self._crawl_job_detail(link_info)
+        
+        self._start_collector()
+        workers = [threading.Thread(target=detail_worker) for _ in range(MAX_THREADS)]
+        for worker in workers:
+            worker.start()
+        
+        try:
+            # Tạo thread tìm link cho mỗi crawler
+            threads = []
+            for crawler_name, crawler in self.crawlers.items():
+                thread = threading.Thread(
+                    target=self._crawl_links_from_site,
+                    args=(crawler, keywords, location, filters, limit)
+                )
+                threads.append(thread)
+                thread.start()
+            
+            for thread in threads:
+                thread.join()
+        finally:
+            # Báo cho các worker dừng sau khi xử lý hết link còn trong hàng đợi
+            for _ in workers:
+                self._link_queue.put(None)
+            for worker in workers:
+                worker.join()
+        
+        try:
+            # Các link đang chờ thử lại (host tạm thời không khả dụng)
+            if not self.cancel_flag.is_set():
+                self._process_frontier()
+        finally:
+            self._stop_collector()
+            self._link_queue = None
+            shutdown_parse_pool()
+        
+        self._save_links_to_csv()
+        self._save_details_to_csv()
+        self._log_fetch_stats()
+        
+        logger.info(f"Hoàn thành crawl pipeline, đã xử lý {self.processed_details}/{self.total_details} link")
+        
+        return self.job_details
+    
     def _save_links_to_csv(self):
         """
         Lưu danh sách link vào file CSV
@@ -192,61 +659,405 @@ class CrawlerManager:
             logger.error(f"Lỗi khi lưu file CSV: {e}")
             print(f"Lỗi khi lưu file CSV: {e}")
     
-    def crawl_job_details(self, links=None):
+    def _iter_link_chunks(self, links=None):
         """
-        Crawl chi tiết việc làm từ danh sách link
+        Sinh danh sách link cần crawl chi tiết theo từng phần (đã loại bỏ link trùng)
+        
+        File CSV được đọc theo từng khối LINKS_CSV_CHUNK_SIZE dòng nên danh sách
+        link lớn không phải nạp hết vào bộ nhớ.
         
         Args:
             links (list, optional): Danh sách link cần crawl. Nếu None, sẽ đọc từ file CSV
             
+        Yields:
+            list: Một phần danh sách link
+        """
+        dedup = UrlDeduplicator()
+        total = 0
+        try:
+            if links:
+                chunks = [links]
+            elif not os.path.exists(JOB_LINKS_FILE):
+                logger.warning(f"File {JOB_LINKS_FILE} không tồn tại")
+                print(f"File {JOB_LINKS_FILE} không tồn tại")
+                return
+            else:
+                chunks = (
+                    df.to_dict('records')
+                    for df in pd.read_csv(JOB_LINKS_FILE, chunksize=LINKS_CSV_CHUNK_SIZE)
+                )
+            
+            for chunk in chunks:
+                total += len(chunk)
+                # Bỏ link trùng trước khi đưa vào frontier
+                unique_links = [link for link in chunk if dedup.add(link['url'])]
+                if unique_links:
+                    yield unique_links
+        except Exception as e:
+            logger.error(f"Lỗi khi đọc file CSV: {e}")
+            print(f"Lỗi khi đọc file CSV: {e}")
+            return
+        
+        if not links:
+            logger.info(f"Đã đọc {total} link từ file {JOB_LINKS_FILE}")
+        if dedup.duplicates:
+            logger.info(f"Bỏ qua {dedup.duplicates} link trùng trước khi crawl chi tiết")
+    
+    def _prepare_detail_crawl(self, links, resume, emit=None):
+        """
+        Chuẩn bị một lượt crawl chi tiết: đưa link vào frontier theo từng phần
+        
+        Ở chế độ resume, kết quả đã có trong nhật ký checkpoint được nạp lại vào
+        job_details và link tương ứng được đánh dấu xong; các link còn lại của
+        danh sách (kể cả link đang dở hoặc lỗi ở lần trước) được crawl lại. Chỉ
+        link trong danh sách hiện tại được lấy ra. Nếu không resume, frontier và
+        nhật ký cũ bị xóa để bắt đầu lượt mới.
+        
+        Args:
+            links (list, optional): Danh sách link cần crawl. Nếu None, sẽ đọc từ file CSV
+            resume (bool): Tiếp tục từ nhật ký checkpoint của lượt trước
+            emit (function, optional): Nhận từng kết quả cho collector
+            
         Returns:
-            list: Danh sách thông tin chi tiết việc làm
+            bool: False nếu không có link nào
         """
         self.job_details = []
+        self.total_details = 0
         self.processed_details = 0
+        self._start_run()
+        self._start_collector(emit)
+        
+        # Nhật ký và frontier cùng dùng khóa loại trùng của URL
+        completed = self.journal.completed() if resume else {}
+        restored = 0
         
         # Nếu không có links, đọc từ file CSV
-        if not links:
-            try:
-                if os.path.exists(JOB_LINKS_FILE):
-                    df = pd.read_csv(JOB_LINKS_FILE)
-                    links = df.to_dict('records')
-                    logger.info(f"Đã đọc {len(links)} link từ file {JOB_LINKS_FILE}")
-                else:
-                    logger.warning(f"File {JOB_LINKS_FILE} không tồn tại")
-                    print(f"File {JOB_LINKS_FILE} không tồn tại")
-                    return []
-            except Exception as e:
-                logger.error(f"Lỗi khi đọc file CSV: {e}")
-                print(f"Lỗi khi đọc file CSV: {e}")
-                return []
-        
-        self.total_details = len(links)
-        logger.info(f"Bắt đầu crawl chi tiết cho {self.total_details} link việc làm")
-        
-        # Sử dụng ThreadPoolExecutor để crawl đa luồng
-        with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
-            # Submit các task
-            futures = [executor.submit(self._crawl_job_detail, link) for link in links]
-            
-            # Xử lý kết quả khi hoàn thành
-            for future in futures:
-                # Kiểm tra cờ tạm dừng
-                self.pause_flag.wait()
-                
-                try:
-                    future.result()
-                except Exception as e:
-                    logger.error(f"Lỗi khi crawl chi tiết: {e}")
-                    print(f"Lỗi khi crawl chi tiết: {e}")
+        for chunk in self._iter_link_chunks(links):
+            # Chỉ xóa checkpoint cũ khi đã chắc chắn có link cho lượt mới
+            if not resume and not self.total_details:
+                self.journal.reset()
+                self.frontier.clear()
+            
+            # Lượt resume có mã mới nên link của danh sách hiện tại được chuyển sang
+            # lượt này ở trạng thái pending (kể cả link đang dở hoặc lỗi ở lần trước);
+            # link của các lượt khác trong frontier không được lấy ra hay tính vào tiến trình
+            self.frontier.add(chunk, self._run_id)
+            self.total_details += len(chunk)
+            
+            for link in chunk:
+                job_detail = completed.get(dedup_key(canonicalize_url(link['url'])))
+                if job_detail:
+                    self._handle_job_detail(link, job_detail, record_journal=False)
+                    self.frontier.complete(link['url'])
+                    restored += 1
         
-        # Lưu chi tiết vào file CSV
-        self._save_details_to_csv()
+        if not self.total_details:
+            self._stop_collector()
+            return False
+        
+        if resume:
+            logger.info(
+                f"Tiếp tục từ checkpoint: {restored} link đã xong, còn {self.total_details - restored} link"
+            )
+        return True
+    
+    def _wait_for_retry(self):
+        """
+        Chờ tới khi có link đến hạn thử lại trong frontier
+        
+        Returns:
+            bool: False nếu frontier không còn link nào chờ
+        """
+        retry_at = self.frontier.next_retry_at(self._run_id)
+        if retry_at is None:
+            return False
+        time.sleep(min(max(retry_at - time.time(), 0), FRONTIER_POLL_INTERVAL))
+        return True
+    
+    def _detail_capacity(self):
+        """
+        Số link crawl chi tiết được chạy đồng thời
+        
+        Returns:
+            int: Tổng giới hạn adaptive concurrency hiện tại của các host
+        """
+        return sum(
+            concurrency_controller.limit_for(crawler.concurrency_key()).snapshot()['limit']
+            for crawler in self.crawlers.values()
+        )
+    
+    def iter_job_details(self, links=None, resume=False):
+        """
+        Crawl chi tiết việc làm và trả về từng kết quả ngay khi xong
+        
+        Kết quả không được giữ lại trong bộ nhớ hay lưu vào file CSV (nhật ký
+        checkpoint vẫn được ghi). Ở chế độ resume, các kết quả đã có trong nhật
+        ký được trả về trước.
+        
+        Args:
+            links (list, optional): Danh sách link cần crawl. Nếu None, sẽ đọc từ file CSV
+            resume (bool): Bỏ qua các link đã crawl xong theo nhật ký checkpoint
+            
+        Yields:
+            dict: Thông tin chi tiết việc làm
+        """
+        if ASYNC_FETCH:
+            produce = lambda emit: asyncio.run(self._run_job_details_async(links, resume, emit))
+        else:
+            produce = lambda emit: self._run_job_details(links, resume, emit)
+        yield from self._stream(produce)
+    
+    async def iter_job_details_async(self, links=None, resume=False):
+        """
+        Phiên bản bất đồng bộ của iter_job_details (dùng với `async for`),
+        crawl bằng async fetch engine trên event loop hiện tại
+        
+        Args:
+            links (list, optional): Danh sách link cần crawl. Nếu None, sẽ đọc từ file CSV
+            resume (bool): Bỏ qua các link đã crawl xong theo nhật ký checkpoint
+            
+        Yields:
+            dict: Thông tin chi tiết việc làm
+        """
+        async for job_detail in self._stream_async(
+            lambda emit: self._run_job_details_async(links, resume, emit)
+        ):
+            yield job_detail
+    
+    def crawl_job_details(self, links=None, resume=False):
+        """
+        Crawl chi tiết việc làm từ danh sách link
+        
+        Link được đưa vào frontier trên đĩa, các worker lấy link theo độ ưu tiên
+        và xoay vòng giữa các host. Toàn bộ kết quả được giữ trong job_details
+        (để trả về và lưu CSV); với danh sách link rất lớn, dùng iter_job_details
+        để xử lý từng kết quả mà không giữ lại trong bộ nhớ.
+        
+        Args:
+            links (list, optional): Danh sách link cần crawl. Nếu None, sẽ đọc từ file CSV
+            resume (bool): Bỏ qua các link đã crawl xong theo nhật ký checkpoint
+            
+        Returns:
+            list: Danh sách thông tin chi tiết việc làm
+        """
+        job_details = list(self.iter_job_details(links, resume))
+        return self._finish_job_details(job_details)
+    
+    async def crawl_job_details_async(self, links=None, resume=False):
+        """
+        Crawl chi tiết việc làm bằng async fetch engine
+        
+        Giống crawl_job_details, toàn bộ kết quả được giữ trong bộ nhớ; dùng
+        iter_job_details_async để nhận từng kết quả.
+        
+        Args:
+            links (list, optional): Danh sách link cần crawl. Nếu None, sẽ đọc từ file CSV
+            resume (bool): Bỏ qua các link đã crawl xong theo nhật ký checkpoint
+            
+        Returns:
+            list: Danh sách thông tin chi tiết việc làm
+        """
+        job_details = [job_detail async for job_detail in self.iter_job_details_async(links, resume)]
+        return self._finish_job_details(job_details)
+    
+    def crawl_job_details_bulk(self, links=None, resume=False, backend=None):
+        """
+        Crawl chi tiết việc làm ở chế độ bulk, dùng OpenAI Batch API cho phần trích xuất
+        
+        Trang được tải và trích xuất cục bộ như bình thường, nhưng phần cần OpenAI
+        được ghi thành file request JSONL. Sau khi tải xong, các file được gửi
+        thành batch (giá thấp hơn và không tính vào rate limit trực tiếp), chờ
+        hoàn thành rồi kết quả được gộp vào chi tiết việc làm. Link chỉ được ghi
+        vào nhật ký checkpoint khi đã có kết quả, nên link chưa có kết quả (batch
+        lỗi, bị hủy) sẽ được crawl lại khi resume.
+        
+        Args:
+            links (list, optional): Danh sách link cần crawl. Nếu None, sẽ đọc từ file CSV
+            resume (bool): Bỏ qua các link đã crawl xong theo nhật ký checkpoint
+            backend (optional): Backend Batch API, mặc định theo BULK_EXTRACT_BACKEND
+            
+        Returns:
+            list: Danh sách thông tin chi tiết việc làm
+        """
+        bulk = BulkExtraction(backend)
+        self._bulk = bulk
+        for crawler in self.crawlers.values():
+            crawler.bulk_extraction = bulk
+        try:
+            job_details = list(self.iter_job_details(links, resume))
+        finally:
+            for crawler in self.crawlers.values():
+                crawler.bulk_extraction = None
+        
+        try:
+            if bulk.requests and not self.cancel_flag.is_set():
+                logger.info(f"Gửi {len(bulk.requests)} trang cho Batch API, thư mục {bulk.job_dir}")
+                results = bulk.run(cancel_event=self.cancel_flag)
+                self._merge_bulk_results(job_details, bulk, results)
+        except Exception as e:
+            logger.error(f"Lỗi khi trích xuất bulk: {e}")
+            print(f"Lỗi khi trích xuất bulk: {e}")
+        finally:
+            self._bulk = None
+        
+        return self._finish_job_details(job_details)
+    
+    def _merge_bulk_results(self, job_details, bulk, results):
+        """
+        Gộp kết quả Batch API vào chi tiết việc làm và ghi nhận các link đã xong
         
-        logger.info(f"Hoàn thành crawl chi tiết, đã xử lý {self.processed_details}/{self.total_details} link")
+        Args:
+            job_details (list): Chi tiết việc làm của lượt crawl
+            bulk (BulkExtraction): Lượt trích xuất hàng loạt
+            results (dict): URL -> kết quả trích xuất
+        """
+        fields_by_url = {request['url']: request['fields'] for request in bulk.requests.values()}
+        merged = 0
+        for job_detail in job_details:
+            url = job_detail.get('url')
+            if url not in fields_by_url:
+                continue
+            job_info = results.get(url)
+            if job_info is None:
+                job_detail['error'] = "Chưa có kết quả trích xuất bulk"
+                continue
+            
+            for field in fields_by_url[url]:
+                job_detail[field] = job_info.get(field, "")
+            self.journal.record(url, CrawlJournal.DONE, job_detail, source=job_detail.get('source'))
+            self.frontier.complete(url)
+            crawler = self.crawlers.get(job_detail.get('source'))
+            if crawler:
+                crawler.store_details(url, job_detail)
+            merged += 1
         
+        logger.info(f"Đã gộp kết quả bulk cho {merged}/{len(fields_by_url)} trang")
+    
+    def _finish_job_details(self, job_details):
+        """
+        Giữ và lưu kết quả của một lượt crawl chi tiết
+        
+        Args:
+            job_details (list): Danh sách thông tin chi tiết việc làm
+            
+        Returns:
+            list: Danh sách thông tin chi tiết việc làm
+        """
+        self.job_details = job_details
+        
+        # Lưu chi tiết vào file CSV (kể cả khi bị hủy, các kết quả đã có vẫn được giữ)
+        if self.total_details > 0:
+            self._save_details_to_csv()
         return self.job_details
     
+    def _run_job_details(self, links, resume, emit=None):
+        """
+        Chạy một lượt crawl chi tiết bằng thread pool
+        
+        Link được đưa vào frontier trên đĩa, các worker lấy link theo độ ưu tiên
+        và xoay vòng giữa các host.
+        
+        Args:
+            links (list, optional): Danh sách link cần crawl. Nếu None, sẽ đọc từ file CSV
+            resume (bool): Bỏ qua các link đã crawl xong theo nhật ký checkpoint
+            emit (function, optional): Nhận từng kết quả
+        """
+        if not self._prepare_detail_crawl(links, resume, emit):
+            return
+        
+        logger.info(f"Bắt đầu crawl chi tiết, frontier: {self.frontier.stats(self._run_id)}")
+        
+        try:
+            self._process_frontier()
+        finally:
+            self._stop_collector()
+            shutdown_parse_pool()
+        
+        self._log_fetch_stats()
+        
+        if self.cancel_flag.is_set():
+            logger.info(f"Đã hủy crawl chi tiết, đã xử lý {self.processed_details}/{self.total_details} link")
+        else:
+            logger.info(f"Hoàn thành crawl chi tiết, đã xử lý {self.processed_details}/{self.total_details} link")
+    
+    def _process_frontier(self):
+        """
+        Crawl các link của lượt hiện tại trong frontier bằng thread pool cho tới
+        khi không còn link nào chờ (kể cả link chờ thử lại) hoặc bị hủy
+        """
+        # Sử dụng ThreadPoolExecutor để crawl đa luồng, số worker thực sự chạy
+        # theo giới hạn adaptive concurrency hiện tại của các host
+        with ThreadPoolExecutor(max_workers=CONCURRENCY_MAX * len(self.crawlers)) as executor:
+            running = set()
+            while True:
+                # Không lấy link mới khi đang tạm dừng hoặc đã hủy
+                if self._checkpoint():
+                    # Chỉ lấy đủ link cho số chỗ hiện có
+                    for link_info in self.frontier.claim(self._detail_capacity() - len(running), self._run_id):
+                        running.add(executor.submit(self._crawl_job_detail, link_info))
+            
+                if not running:
+                    if not self.cancel_flag.is_set() and self._wait_for_retry():
+                        continue
+                    break
+            
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Lỗi khi crawl chi tiết: {e}")
+                        print(f"Lỗi khi crawl chi tiết: {e}")
+    
+    async def _run_job_details_async(self, links, resume, emit=None):
+        """
+        Chạy một lượt crawl chi tiết bằng async fetch engine
+        
+        Link được lấy từ frontier và lên lịch trên một event loop, số request
+        đang chạy do engine giới hạn (ASYNC_MAX_CONCURRENCY) thay vì MAX_THREADS.
+        
+        Args:
+            links (list, optional): Danh sách link cần crawl. Nếu None, sẽ đọc từ file CSV
+            resume (bool): Bỏ qua các link đã crawl xong theo nhật ký checkpoint
+            emit (function, optional): Nhận từng kết quả
+        """
+        if not self._prepare_detail_crawl(links, resume, emit):
+            return
+        
+        logger.info(f"Bắt đầu crawl chi tiết bất đồng bộ, frontier: {self.frontier.stats(self._run_id)}")
+        
+        try:
+            async with AsyncFetchEngine(max_concurrency=ASYNC_MAX_CONCURRENCY) as engine:
+                running = set()
+                while True:
+                    # Không lấy link mới khi đang tạm dừng hoặc đã hủy
+                    if await self._checkpoint_async():
+                        for link_info in self.frontier.claim(ASYNC_MAX_CONCURRENCY - len(running), self._run_id):
+                            running.add(asyncio.ensure_future(self._crawl_job_detail_async(link_info, engine)))
+                
+                    if not running:
+                        if not self.cancel_flag.is_set() and await asyncio.to_thread(self._wait_for_retry):
+                            continue
+                        break
+                
+                    done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception():
+                            logger.error(f"Lỗi khi crawl chi tiết: {task.exception()}")
+                            print(f"Lỗi khi crawl chi tiết: {task.exception()}")
+        
+        finally:
+            self._stop_collector()
+            shutdown_parse_pool()
+            await close_async_client()
+        
+        self._log_fetch_stats()
+        
+        if self.cancel_flag.is_set():
+            logger.info(f"Đã hủy crawl chi tiết, đã xử lý {self.processed_details}/{self.total_details} link")
+        else:
+            logger.info(f"Hoàn thành crawl chi tiết, đã xử lý {self.processed_details}/{self.total_details} link")
+    
     def _crawl_job_detail(self, link_info):
         """
         Crawl chi tiết của một việc làm
@@ -263,45 +1074,142 @@ class CrawlerManager:
             if not crawler:
                 logger.warning(f"Không tìm thấy crawler cho {source}")
                 print(f"Không tìm thấy crawler cho {source}")
+                self.frontier.fail(url, error='no crawler')
+                return
+            
+            # Kiểm tra cờ tạm dừng/hủy trước khi tải trang
+            if not self._checkpoint():
+                self._release_job_detail(link_info)
                 return
             
             logger.debug(f"Đang crawl chi tiết từ {url}")
             
             # Crawl chi tiết
             job_detail = crawler.extract_job_details(url)
+            self._handle_job_detail(link_info, job_detail)
+        
+        except CrawlCancelled:
+            self._release_job_detail(link_info)
+        
+        except HostUnavailableError as e:
+            self._requeue_job_detail(link_info, e)
+        
+        except Exception as e:
+            logger.error(f"Lỗi khi crawl chi tiết từ {link_info['url']}: {e}")
+            print(f"Lỗi khi crawl chi tiết từ {link_info['url']}: {e}")
+            # Cập nhật trạng thái
+            link_info['status'] = 'Lỗi'
+            self.journal.record(link_info['url'], CrawlJournal.FAILED, source=link_info.get('source'))
+            self.frontier.fail(link_info['url'], error=str(e))
+    
+    async def _crawl_job_detail_async(self, link_info, engine):
+        """
+        Crawl chi tiết của một việc làm (bất đồng bộ)
+        
+        Args:
+            link_info (dict): Thông tin về link việc làm
+            engine (AsyncFetchEngine): Engine tải trang bất đồng bộ đang chạy
+        """
+        try:
+            url = link_info['url']
+            source = link_info['source']
             
-            if job_detail:
-                # Thêm thông tin nguồn và URL
-                job_detail['source'] = source
-                job_detail['url'] = url
-                
-                # Thêm vào danh sách chung
-                with threading.Lock():
-                    self.job_details.append(job_detail)
-                    self.processed_details += 1
-                    
-                    # Gọi callback nếu có
-                    if self.on_detail_crawled:
-                        self.on_detail_crawled(job_detail)
-                    
-                    # Cập nhật tiến trình
-                    if self.on_progress_updated:
-                        progress = (self.processed_details / self.total_details) * 100 if self.total_details > 0 else 0
-                        self.on_progress_updated('details', progress)
-                
-                # Cập nhật trạng thái
-                link_info['status'] = 'Đã crawl chi tiết'
-                logger.debug(f"Đã crawl xong chi tiết cho {url}")
-            else:
-                # Cập nhật trạng thái
-                link_info['status'] = 'Lỗi'
-                logger.warning(f"Không thể lấy chi tiết từ {url}")
+            # Lấy crawler tương ứng
+            crawler = self.crawlers.get(source)
+            if not crawler:
+                logger.warning(f"Không tìm thấy crawler cho {source}")
+                print(f"Không tìm thấy crawler cho {source}")
+                self.frontier.fail(url, error='no crawler')
+                return
+            
+            # Kiểm tra cờ tạm dừng/hủy trước khi tải trang, không chặn event loop
+            if not await self._checkpoint_async():
+                self._release_job_detail(link_info)
+                return
+            
+            logger.debug(f"Đang crawl chi tiết từ {url}")
+            
+            # Crawl chi tiết
+            job_detail = await crawler.extract_job_details_async(url, engine)
+            self._handle_job_detail(link_info, job_detail)
+        
+        except CrawlCancelled:
+            self._release_job_detail(link_info)
+        
+        except HostUnavailableError as e:
+            self._requeue_job_detail(link_info, e)
         
         except Exception as e:
             logger.error(f"Lỗi khi crawl chi tiết từ {link_info['url']}: {e}")
             print(f"Lỗi khi crawl chi tiết từ {link_info['url']}: {e}")
             # Cập nhật trạng thái
             link_info['status'] = 'Lỗi'
+            self.journal.record(link_info['url'], CrawlJournal.FAILED, source=link_info.get('source'))
+            self.frontier.fail(link_info['url'], error=str(e))
+    
+    def _release_job_detail(self, link_info):
+        """
+        Trả link chưa xử lý về frontier khi lượt crawl bị hủy
+        
+        Args:
+            link_info (dict): Thông tin về link việc làm
+        """
+        link_info['status'] = 'Đang chờ'
+        self.frontier.release(link_info['url'])
+        logger.debug(f"Đã hủy crawl chi tiết {link_info['url']}, trả về hàng đợi")
+    
+    def _requeue_job_detail(self, link_info, error):
+        """
+        Trả link về frontier khi host tạm thời không khả dụng
+        
+        Args:
+            link_info (dict): Thông tin về link việc làm
+            error (HostUnavailableError): Lỗi kèm thời điểm được thử lại
+        """
+        url = link_info['url']
+        state = self.frontier.fail(url, error=str(error), retry_at=error.retry_at)
+        if state == CrawlFrontier.RETRY_AFTER:
+            link_info['status'] = 'Chờ thử lại'
+            logger.info(f"Trả {url} về hàng đợi: {error}")
+        else:
+            # Hết số lần thử hoặc link không nằm trong frontier
+            logger.warning(f"Không thể lấy chi tiết từ {url}: {error}")
+            link_info['status'] = 'Lỗi'
+            self.journal.record(url, CrawlJournal.FAILED, source=link_info.get('source'))
+    
+    def _handle_job_detail(self, link_info, job_detail, record_journal=True):
+        """
+        Ghi nhận kết quả crawl chi tiết của một việc làm
+        
+        Args:
+            link_info (dict): Thông tin về link việc làm
+            job_detail (dict): Thông tin chi tiết, None nếu crawl thất bại
+            record_journal (bool): Ghi kết quả vào nhật ký checkpoint
+        """
+        url = link_info['url']
+        
+        if job_detail:
+            # Thêm thông tin nguồn và URL
+            job_detail['source'] = link_info['source']
+            job_detail['url'] = url
+            
+            # Gửi cho collector, worker không chờ callback
+            self._results.put(('detail', job_detail))
+            
+            # Cập nhật trạng thái
+            link_info['status'] = 'Đã crawl chi tiết'
+            logger.debug(f"Đã crawl xong chi tiết cho {url}")
+            # Link đang chờ kết quả Batch API chỉ được ghi nhận khi có kết quả
+            if record_journal and not (self._bulk and self._bulk.is_pending(url)):
+                self.journal.record(url, CrawlJournal.DONE, job_detail, source=link_info['source'])
+                self.frontier.complete(url)
+        else:
+            # Cập nhật trạng thái
+            link_info['status'] = 'Lỗi'
+            logger.warning(f"Không thể lấy chi tiết từ {url}")
+            if record_journal:
+                self.journal.record(url, CrawlJournal.FAILED, source=link_info['source'])
+                self.frontier.fail(url)
     
     def _save_details_to_csv(self):
         """
@@ -316,6 +1224,59 @@ class CrawlerManager:
             logger.error(f"Lỗi khi lưu file CSV: {e}")
             print(f"Lỗi khi lưu file CSV: {e}")
     
+    def _log_fetch_stats(self):
+        """
+        Ghi log thống kê tải trang sau mỗi lần crawl
+        """
+        page_cache = get_page_cache()
+        if page_cache:
+            stats = page_cache.stats()
+            logger.info(
+                f"Page cache: {stats['hits']} hit, {stats['misses']} miss "
+                f"({stats['hit_rate']:.0%}), {stats['entries']} trang, {stats['size_bytes']} bytes"
+            )
+        
+        llm_cache = get_llm_cache()
+        if llm_cache:
+            stats = llm_cache.stats()
+            logger.info(
+                f"LLM cache: {stats['hits']} hit, {stats['misses']} miss "
+                f"({stats['hit_rate']:.0%}), {stats['entries']} kết quả"
+            )
+        
+        if openai_budget.enabled:
+            budget = openai_budget.snapshot()
+            logger.info(
+                f"Ngân sách OpenAI: {budget['rpm']} RPM, {budget['tpm']} TPM, "
+                f"chờ ngân sách {budget['waits']} lần ({budget['wait_time']}s)"
+            )
+        
+        connections = http_session_pool.stats()
+        if connections['requests']:
+            logger.info(
+                f"Kết nối HTTP: {connections['requests']} request qua {connections['connections']} kết nối "
+                f"(dùng lại {connections['reuse_rate']:.0%}), pool {connections['pool_maxsize']} kết nối/host"
+            )
+        
+        for host, breaker in circuit_breakers.states().items():
+            if breaker['trips']:
+                logger.info(f"Circuit breaker {host}: {breaker['state']}, đã mở {breaker['trips']} lần")
+        
+        for target, limit in self.get_concurrency_limits().items():
+            logger.info(
+                f"Concurrency {target}: giới hạn {limit['limit']}, độ trễ {limit['latency_ms']} ms "
+                f"(nền {limit['baseline_ms']} ms), {limit['overloads']} lần quá tải"
+            )
+    
+    def get_concurrency_limits(self):
+        """
+        Lấy giới hạn số request đồng thời hiện tại của từng host và OpenAI
+        
+        Returns:
+            dict: Tên đích -> {'limit', 'in_flight', 'latency_ms', 'baseline_ms', 'successes', 'overloads'}
+        """
+        return concurrency_controller.limits()
+    
     def get_progress(self, task_type):
         """
         Lấy tiến trình hiện tại
@@ -0,0 +1,256 @@
+"""
+Extraction spec - Trích xuất chi tiết việc làm bằng cấu hình selector khai báo
+
+Mỗi crawler có thể khai báo `extraction_spec` dạng:
+
+    {
+        'job_title': {'css': ['h1.job-title', 'h1']},
+        'required_skills': {'css': '.skills li', 'all': True},
+        'contact_email': {'css': 'a[href^="mailto:"]', 'attr': 'href', 'regex': r'mailto:([^?]+)'},
+        'application_deadline': {'xpath': '//span[@class="deadline"]/text()', 'post': ['date']},
+    }
+
+Các khóa của một trường:
+    css (str | list): Một hoặc nhiều CSS selector, thử lần lượt tới khi có kết quả
+    xpath (str | list): XPath (cần lxml), thử sau các CSS selector
+    attr (str): Lấy giá trị thuộc tính thay vì văn bản
+    all (bool): Lấy tất cả phần tử khớp và nối bằng `join` (mặc định ', ')
+    regex (str): Chỉ giữ phần khớp (group 1 nếu có) của giá trị
+    post (list): Tên hậu xử lý trong POST_PROCESSORS hoặc hàm nhận/trả về chuỗi
+    pattern (str): Giá trị (sau hậu xử lý) phải khớp regex này mới được nhận
+    min_length, max_length (int): Giới hạn độ dài của giá trị (mỗi phần tử nếu `all`)
+    default (str): Giá trị dùng khi không tìm thấy
+
+Giá trị không qua kiểm tra bị bỏ như không tìm thấy: selector kế tiếp được
+thử, và nếu trường bắt buộc vẫn trống thì OpenAI được gọi cho trường đó.
+"""
+import logging
+import re
+from app.crawlers.html_parser import parse_html
+from app.crawlers.structured_data import BRIEF_DESCRIPTION_CHARS
+
+try:
+    from lxml import html as lxml_html, etree
+except ImportError:
+    lxml_html = None
+    etree = None
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+def _strip_label(value):
+    """
+    Bỏ nhãn phía trước dấu ':' (ví dụ 'Mức lương: 20 triệu' -> '20 triệu')
+    """
+    return value.split(':', 1)[1].strip() if ':' in value else value
+
+def _normalize_date(value):
+    """
+    Chuẩn hóa ngày dd/mm/yyyy hoặc dd-mm-yyyy thành yyyy-mm-dd
+    """
+    match = re.search(r'(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})', value)
+    if not match:
+        return value
+    day, month, year = match.groups()
+    return f"{year}-{int(month):02d}-{int(day):02d}"
+
+def _brief(value):
+    """
+    Rút gọn mô tả công việc
+    """
+    if len(value) <= BRIEF_DESCRIPTION_CHARS:
+        return value
+    return value[:BRIEF_DESCRIPTION_CHARS].rsplit(' ', 1)[0] + '...'
+
+POST_PROCESSORS = {
+    'strip_label': _strip_label,
+    'date': _normalize_date,
+    'brief': _brief,
+    'lower': str.lower,
+    'upper': str.upper,
+}
+
+def _as_list(value):
+    """
+    Đưa một giá trị cấu hình về dạng danh sách
+    """
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+class FieldRule:
+    """
+    Quy tắc đã biên dịch để trích xuất một trường
+    """
+
+    def __init__(self, name, rule):
+        """
+        Biên dịch quy tắc của một trường
+
+        Args:
+            name (str): Tên trường chi tiết việc làm
+            rule (dict): Cấu hình selector của trường
+        """
+        self.name = name
+        self.css = _as_list(rule.get('css'))
+        self.attr = rule.get('attr')
+        self.all = rule.get('all', False)
+        self.join = rule.get('join', ', ')
+        self.default = rule.get('default', '')
+        self.regex = re.compile(rule['regex'], re.IGNORECASE | re.DOTALL) if rule.get('regex') else None
+        self.pattern = re.compile(rule['pattern'], re.IGNORECASE) if rule.get('pattern') else None
+        self.min_length = rule.get('min_length', 0)
+        self.max_length = rule.get('max_length')
+
+        self.xpath = []
+        for expression in _as_list(rule.get('xpath')):
+            if etree is None:
+                logger.warning(f"Bỏ qua XPath của trường {name} vì chưa cài đặt lxml")
+                break
+            self.xpath.append(etree.XPath(expression))
+
+        self.post = []
+        for processor in _as_list(rule.get('post')):
+            if callable(processor):
+                self.post.append(processor)
+            elif processor in POST_PROCESSORS:
+                self.post.append(POST_PROCESSORS[processor])
+            else:
+                raise ValueError(f"Hậu xử lý không hợp lệ cho trường {name}: {processor}")
+
+    def _element_value(self, element):
+        """
+        Lấy giá trị (thuộc tính hoặc văn bản) của một phần tử BeautifulSoup
+        """
+        if self.attr:
+            value = element.get(self.attr, '')
+            return ' '.join(value) if isinstance(value, list) else value
+        return element.get_text(' ', strip=True)
+
+    def _xpath_value(self, result):
+        """
+        Lấy giá trị chuỗi từ một kết quả XPath của lxml
+        """
+        if isinstance(result, str):
+            return result
+        if self.attr:
+            return result.get(self.attr, '')
+        return result.text_content()
+
+    def _is_valid(self, value):
+        """
+        Kiểm tra giá trị theo pattern và giới hạn độ dài của trường
+        """
+        if len(value) < self.min_length:
+            return False
+        if self.max_length is not None and len(value) > self.max_length:
+            return False
+        return self.pattern is None or bool(self.pattern.search(value))
+
+    def _finish(self, values):
+        """
+        Làm sạch, áp dụng regex và hậu xử lý cho các giá trị tìm được
+        """
+        cleaned = []
+        for value in values:
+            value = ' '.join(str(value).split())
+            if value and self.regex:
+                match = self.regex.search(value)
+                value = (match.group(1) if match.groups() else match.group(0)).strip() if match else ''
+            for processor in self.post:
+                if value:
+                    value = processor(value)
+            if value and not self._is_valid(value):
+                logger.debug(f"Bỏ giá trị không hợp lệ của trường {self.name}: {value[:80]!r}")
+                continue
+            if value:
+                cleaned.append(value)
+
+        if not cleaned:
+            return ''
+        return self.join.join(dict.fromkeys(cleaned)) if self.all else cleaned[0]
+
+    def extract(self, soup, tree=None):
+        """
+        Trích xuất giá trị của trường
+
+        Args:
+            soup (BeautifulSoup): Cây HTML của trang
+            tree (lxml.html.HtmlElement, optional): Cây lxml, cần khi trường dùng XPath
+
+        Returns:
+            str: Giá trị của trường, `default` nếu không tìm thấy
+        """
+        for selector in self.css:
+            elements = soup.select(selector) if self.all else _as_list(soup.select_one(selector))
+            value = self._finish(self._element_value(element) for element in elements)
+            if value:
+                return value
+
+        if tree is not None:
+            for expression in self.xpath:
+                results = _as_list(expression(tree))
+                if not self.all:
+                    results = results[:1]
+                value = self._finish(self._xpath_value(result) for result in results)
+                if value:
+                    return value
+
+        return self.default
+
+class CompiledSpec:
+    """
+    Bộ quy tắc trích xuất đã biên dịch của một crawler
+    """
+
+    def __init__(self, spec):
+        """
+        Biên dịch cấu hình trích xuất
+
+        Args:
+            spec (dict): Cấu hình dạng {tên trường: quy tắc}
+        """
+        self.rules = [FieldRule(name, rule) for name, rule in spec.items()]
+
+    def extract(self, html, fields=None, soup=None):
+        """
+        Trích xuất các trường từ HTML của trang
+
+        Args:
+            html (str): Nội dung HTML của trang
+            fields (list, optional): Chỉ trích xuất các trường này
+            soup (BeautifulSoup, optional): Cây HTML đã phân tích sẵn (không bị thay đổi)
+
+        Returns:
+            dict: Các trường tìm được (trường rỗng bị bỏ qua)
+        """
+        rules = [rule for rule in self.rules if fields is None or rule.name in fields]
+        if not rules:
+            return {}
+
+        if soup is None:
+            soup = parse_html(html)
+        # Cây lxml chỉ được dựng khi một trong các trường cần lấy có XPath
+        needs_tree = any(rule.xpath for rule in rules)
+        tree = lxml_html.fromstring(html) if needs_tree and html.strip() else None
+
+        record = {}
+        for rule in rules:
+            value = rule.extract(soup, tree)
+            if value:
+                record[rule.name] = value
+        return record
+
+def compile_spec(spec):
+    """
+    Biên dịch cấu hình trích xuất của một crawler
+
+    Args:
+        spec (dict): Cấu hình dạng {tên trường: quy tắc}, có thể None
+
+    Returns:
+        CompiledSpec: Bộ quy tắc đã biên dịch, None nếu không có cấu hình
+    """
+    if not spec:
+        return None
+    return CompiledSpec(spec)
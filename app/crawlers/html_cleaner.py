@@ -0,0 +1,135 @@
+"""
+HTML cleaner - Rút gọn HTML thành văn bản gọn trước khi gửi cho LLM
+"""
+import re
+from bs4 import Comment
+from app.crawlers.html_parser import parse_html
+
+# Các thẻ không chứa nội dung tin tuyển dụng
+BOILERPLATE_TAGS = [
+    'script', 'style', 'noscript', 'svg', 'iframe', 'template', 'link', 'meta',
+    'form', 'button', 'input', 'select', 'textarea', 'nav', 'footer', 'aside'
+]
+
+# Class/id của các khối quảng cáo, popup, mạng xã hội...
+BOILERPLATE_PATTERN = re.compile(
+    r'cookie|advert|\bads?\b|banner|social|share|breadcrumb|modal|popup|newsletter|subscribe',
+    re.IGNORECASE
+)
+
+BLOCK_TAGS = [
+    'p', 'div', 'section', 'article', 'main', 'header', 'ul', 'ol', 'dl', 'dt', 'dd',
+    'table', 'tr', 'blockquote', 'pre'
+]
+HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+CONTENT_CONTAINERS = ['main', 'article', 'section', 'div']
+
+# Vùng nội dung chính phải chứa ít nhất tỷ lệ này văn bản của vùng cha
+MAIN_CONTENT_RATIO = 0.8
+
+def _text_length(tag):
+    """
+    Độ dài văn bản không nằm trong liên kết của một thẻ
+    """
+    total = len(tag.get_text(' ', strip=True))
+    links = sum(len(a.get_text(' ', strip=True)) for a in tag.find_all('a'))
+    return total - links
+
+def _find_main_content(soup):
+    """
+    Tìm vùng nội dung chính của trang
+
+    Bắt đầu từ <main>/<article> (hoặc <body>), đi xuống thẻ con khi thẻ con
+    vẫn chứa phần lớn văn bản, để bỏ các lớp bao ngoài cùng sidebar/menu.
+
+    Args:
+        soup (BeautifulSoup): Cây HTML đã loại bỏ boilerplate
+
+    Returns:
+        Tag: Thẻ chứa nội dung chính
+    """
+    node = soup.find('main') or soup.find(attrs={'role': 'main'}) or soup.body or soup
+    node_length = _text_length(node)
+
+    while True:
+        children = node.find_all(CONTENT_CONTAINERS, recursive=False)
+        if not children:
+            return node
+
+        best = max(children, key=_text_length)
+        best_length = _text_length(best)
+        if node_length == 0 or best_length < node_length * MAIN_CONTENT_RATIO:
+            return node
+        node, node_length = best, best_length
+
+def _render_text(node):
+    """
+    Chuyển một thẻ thành văn bản dạng markdown gọn
+    """
+    for br in node.find_all('br'):
+        br.replace_with('\n')
+    for heading in node.find_all(HEADING_TAGS):
+        level = int(heading.name[1])
+        heading.insert(0, '\n' + '#' * level + ' ')
+        heading.append('\n')
+    for item in node.find_all('li'):
+        item.insert(0, '\n- ')
+    for cell in node.find_all(['td', 'th']):
+        cell.append(' | ')
+    for block in node.find_all(BLOCK_TAGS):
+        block.append('\n')
+    for link in node.find_all('a', href=re.compile(r'^mailto:', re.IGNORECASE)):
+        link.append(f" ({link['href'][7:]})")
+
+    lines = []
+    for line in node.get_text().splitlines():
+        line = ' '.join(line.split())
+        if line and (not lines or lines[-1] != line):
+            lines.append(line)
+    return '\n'.join(lines)
+
+def html_to_text(html, soup=None):
+    """
+    Rút gọn HTML của trang việc làm thành văn bản gọn cho LLM
+
+    Loại bỏ script, style, menu, footer, quảng cáo..., giữ lại tiêu đề trang
+    và vùng nội dung chính dưới dạng văn bản markdown.
+
+    Args:
+        html (str): Nội dung HTML của trang
+        soup (BeautifulSoup, optional): Cây HTML đã phân tích sẵn; cây này bị
+            sửa trong lúc rút gọn nên không dùng lại được sau đó
+
+    Returns:
+        tuple: (văn bản đã rút gọn, dict thống kê kích thước trước/sau)
+    """
+    if soup is None:
+        soup = parse_html(html)
+
+    title = soup.title.get_text(' ', strip=True) if soup.title else ''
+    h1 = soup.find('h1')
+    heading = h1.get_text(' ', strip=True) if h1 else ''
+
+    for tag in soup.find_all(BOILERPLATE_TAGS):
+        tag.decompose()
+    for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+        comment.extract()
+    for tag in soup.find_all(True):
+        if tag.decomposed or tag.attrs is None:
+            continue
+        marker = ' '.join(tag.get('class', [])) + ' ' + (tag.get('id') or '')
+        if tag.name not in ('body', 'html', 'main') and BOILERPLATE_PATTERN.search(marker):
+            tag.decompose()
+
+    body = _render_text(_find_main_content(soup))
+
+    # Giữ tiêu đề trang và thẻ h1 vì chúng thường nằm ngoài vùng nội dung chính
+    header_lines = [line for line in (title, heading) if line and line not in body]
+    text = '\n'.join(header_lines + [body]).strip()
+
+    stats = {
+        'original_chars': len(html),
+        'cleaned_chars': len(text),
+        'ratio': len(text) / len(html) if html else 0
+    }
+    return text, stats
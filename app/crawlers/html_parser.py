@@ -0,0 +1,74 @@
+"""
+HTML parser backend - Chọn backend phân tích HTML và phân tích có chọn lọc
+"""
+import logging
+import re
+from bs4 import BeautifulSoup, SoupStrainer, FeatureNotFound
+from app.utils.config import HTML_PARSER
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+# Thứ tự dự phòng khi backend được cấu hình chưa được cài đặt
+FALLBACK_PARSERS = ['lxml', 'html.parser']
+
+_resolved_parser = None
+
+def resolve_parser():
+    """
+    Xác định backend phân tích HTML sẽ dùng
+
+    Ưu tiên backend trong HTML_PARSER ('lxml', 'html5lib', 'html.parser'),
+    nếu chưa được cài đặt thì dùng backend khả dụng tiếp theo.
+
+    Returns:
+        str: Tên backend cho BeautifulSoup
+    """
+    global _resolved_parser
+    if _resolved_parser:
+        return _resolved_parser
+
+    for parser in [HTML_PARSER] + FALLBACK_PARSERS:
+        try:
+            BeautifulSoup('', parser)
+        except FeatureNotFound:
+            logger.warning(f"Backend phân tích HTML '{parser}' chưa được cài đặt")
+            continue
+        _resolved_parser = parser
+        break
+
+    logger.info(f"Sử dụng backend phân tích HTML: {_resolved_parser}")
+    return _resolved_parser
+
+def parse_html(html, parse_only=None):
+    """
+    Phân tích HTML thành cây BeautifulSoup
+
+    Args:
+        html (str | bytes): Nội dung HTML
+        parse_only (SoupStrainer, optional): Chỉ dựng cây cho các thẻ khớp,
+            dùng cho các trang chỉ cần một phần nhỏ nội dung (ví dụ trang kết quả tìm kiếm)
+
+    Returns:
+        BeautifulSoup: Cây HTML đã phân tích
+    """
+    return BeautifulSoup(html, resolve_parser(), parse_only=parse_only)
+
+def strainer(name=None, **attrs):
+    """
+    Tạo SoupStrainer để chỉ phân tích các thẻ cần thiết
+
+    Khi lọc trong lúc phân tích, thuộc tính class chưa được tách thành danh sách
+    nên class_ dạng chuỗi được đổi thành regex khớp theo từng class.
+
+    Args:
+        name (str | list, optional): Tên thẻ cần giữ lại
+        **attrs: Điều kiện thuộc tính, ví dụ class_='job-title'
+
+    Returns:
+        SoupStrainer: Bộ lọc truyền cho parse_html
+    """
+    class_name = attrs.get('class_')
+    if isinstance(class_name, str):
+        attrs['class_'] = re.compile(rf'(^|\s){re.escape(class_name)}(\s|$)')
+    return SoupStrainer(name, **attrs)
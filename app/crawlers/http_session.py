@@ -0,0 +1,90 @@
+"""
+HTTP session - Session riêng cho từng thread dùng chung một connection pool
+"""
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from app.utils.config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+class HttpSessionPool:
+    """
+    Cấp requests.Session cho từng thread
+
+    requests.Session không an toàn khi nhiều thread dùng chung (cookie, header),
+    nên mỗi thread có session riêng. Tất cả session cùng mount một HTTPAdapter
+    có kích thước pool theo số request đồng thời cấu hình, nhờ đó kết nối
+    keep-alive (và phiên TLS) được dùng lại giữa các worker thay vì bị bỏ đi
+    khi pool mặc định (10 kết nối) đầy.
+    """
+
+    def __init__(self, pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE):
+        """
+        Khởi tạo pool
+
+        Args:
+            pool_connections (int): Số host được giữ connection pool cùng lúc
+            pool_maxsize (int): Số kết nối keep-alive tối đa cho mỗi host
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self._local = threading.local()
+
+    def session(self, owner, headers=None):
+        """
+        Lấy session của thread hiện tại cho một crawler
+
+        Args:
+            owner (str): Tên crawler, mỗi crawler có session (và header) riêng
+            headers (dict, optional): Header mặc định của session
+
+        Returns:
+            requests.Session: Session chỉ dùng trong thread hiện tại
+        """
+        sessions = getattr(self._local, 'sessions', None)
+        if sessions is None:
+            sessions = self._local.sessions = {}
+
+        session = sessions.get(owner)
+        if session is None:
+            session = requests.Session()
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+            if headers:
+                session.headers.update(headers)
+            sessions[owner] = session
+        return session
+
+    def stats(self):
+        """
+        Thống kê dùng lại kết nối của các host đang có pool
+
+        Returns:
+            dict: Số request, số kết nối đã mở (mỗi kết nối HTTPS là một lần
+                  bắt tay TLS), tỷ lệ request dùng lại kết nối và số host
+        """
+        pools = self.adapter.poolmanager.pools
+        requests_sent = 0
+        connections = 0
+        hosts = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            hosts += 1
+            requests_sent += pool.num_requests
+            connections += pool.num_connections
+        return {
+            'requests': requests_sent,
+            'connections': connections,
+            'reuse_rate': 1 - connections / requests_sent if requests_sent > 0 else 0,
+            'hosts': hosts,
+            'pool_maxsize': self.pool_maxsize
+        }
+
+# Pool dùng chung cho toàn bộ ứng dụng
+http_session_pool = HttpSessionPool()
@@ -0,0 +1,142 @@
+"""
+Parse pool - Chạy phần phân tích HTML và trích xuất cục bộ trong process pool
+"""
+import atexit
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from bs4 import UnicodeDammit
+from app.crawlers.html_cleaner import html_to_text
+from app.crawlers.html_parser import parse_html
+from app.crawlers.structured_data import extract_job_posting, missing_fields
+from app.crawlers.extraction_spec import compile_spec
+from app.utils.config import PARSE_PROCESSES, JOB_DETAIL_REQUIRED_FIELDS
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+def extract_local(html, compiled_spec=None):
+    """
+    Trích xuất thông tin việc làm mà không cần OpenAI
+
+    Lấy JSON-LD JobPosting trước, bổ sung bằng extraction spec cho các trường
+    còn thiếu. Nếu vẫn thiếu trường bắt buộc thì rút gọn trang thành văn bản
+    để gửi cho OpenAI. Trang chỉ được phân tích một lần, cây HTML dùng chung
+    cho cả ba bước (bước rút gọn văn bản sửa cây nên luôn chạy sau cùng).
+
+    Args:
+        html (str): Nội dung HTML của trang việc làm
+        compiled_spec (CompiledSpec, optional): Extraction spec của crawler
+
+    Returns:
+        dict: {'details': kết quả cục bộ, 'missing': các trường còn thiếu,
+               'content': văn bản cho OpenAI (None nếu không cần),
+               'clean_stats': thống kê rút gọn (None nếu không cần)}
+    """
+    soup = parse_html(html)
+    job_details = extract_job_posting(html, soup)
+    missing = missing_fields(job_details)
+
+    if missing and compiled_spec:
+        job_details.update(compiled_spec.extract(html, fields=missing, soup=soup))
+        missing = missing_fields(job_details)
+
+    content = clean_stats = None
+    if missing_fields(job_details, JOB_DETAIL_REQUIRED_FIELDS):
+        content, clean_stats = html_to_text(html, soup)
+
+    return {'details': job_details, 'missing': missing, 'content': content, 'clean_stats': clean_stats}
+
+# Extraction spec đã biên dịch trong mỗi process con, theo tên crawler
+_worker_specs = {}
+
+def _extract_in_worker(name, spec, body, encoding):
+    """
+    Hàm chạy trong process con: giải mã bytes của trang rồi trích xuất cục bộ
+    """
+    if name not in _worker_specs:
+        _worker_specs[name] = compile_spec(spec)
+    if encoding:
+        html = body.decode(encoding, errors='replace')
+    else:
+        html = UnicodeDammit(body, is_html=True).unicode_markup
+    return extract_local(html, _worker_specs[name])
+
+class ParsePool:
+    """
+    Process pool cho phần việc tốn CPU của bước crawl chi tiết
+
+    Worker thread vẫn lo tải trang (I/O) và gọi OpenAI, chỉ phần phân tích
+    HTML, rút gọn văn bản và trích xuất cục bộ được chuyển sang process con
+    nên không bị GIL giới hạn. Trang được gửi đi dưới dạng bytes nguyên bản
+    của response, kết quả trả về là dict nhỏ.
+    """
+
+    def __init__(self, processes=PARSE_PROCESSES):
+        """
+        Khởi tạo pool (process con chỉ được tạo khi có việc đầu tiên)
+
+        Args:
+            processes (int): Số process con
+        """
+        self.processes = processes
+        # 'spawn' để process con không kế thừa lock của các thread đang chạy
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context('spawn')
+        )
+
+    def extract(self, name, spec, body, encoding=None):
+        """
+        Trích xuất cục bộ trong process con (chặn thread gọi tới khi xong)
+
+        Args:
+            name (str): Tên crawler, dùng để lưu spec đã biên dịch trong process con
+            spec (dict): Extraction spec của crawler (dạng khai báo)
+            body (bytes): Nội dung trang
+            encoding (str, optional): Bảng mã của nội dung
+
+        Returns:
+            dict: Kết quả của extract_local
+        """
+        return self._executor.submit(_extract_in_worker, name, spec, body, encoding).result()
+
+    def shutdown(self):
+        """
+        Dừng các process con
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+def get_parse_pool():
+    """
+    Lấy parse pool dùng chung cho toàn bộ ứng dụng
+
+    Returns:
+        ParsePool: Pool dùng chung, None nếu PARSE_PROCESSES = 0 (phân tích ngay trong thread)
+    """
+    global _parse_pool
+    if PARSE_PROCESSES <= 0:
+        return None
+
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ParsePool()
+            logger.info(f"Khởi tạo parse pool với {PARSE_PROCESSES} process")
+        return _parse_pool
+
+def shutdown_parse_pool():
+    """
+    Dừng parse pool dùng chung (nếu đang chạy); lượt crawl sau sẽ tạo pool mới
+    """
+    global _parse_pool
+    with _parse_pool_lock:
+        parse_pool, _parse_pool = _parse_pool, None
+    if parse_pool is not None:
+        parse_pool.shutdown()
+        logger.info("Đã dừng parse pool")
+
+# Không để process con sống sót sau khi ứng dụng thoát
+atexit.register(shutdown_parse_pool)
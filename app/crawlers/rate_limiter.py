@@ -0,0 +1,171 @@
+"""
+Rate limiter - Giới hạn tốc độ request theo từng host bằng token bucket
+"""
+import asyncio
+import random
+import threading
+import time
+from urllib.parse import urlparse
+from app.utils.config import HOST_RATE_LIMIT, HOST_BURST, HOST_JITTER
+
+class TokenBucket:
+    """
+    Token bucket an toàn với đa luồng
+
+    Mỗi request lấy một token. Token được nạp lại với tốc độ `rate` mỗi giây
+    và tích lũy tối đa `burst` token. Khi hết token, request đặt trước token
+    kế tiếp (số token có thể âm) nên các request được phục vụ theo thứ tự đến.
+    `rate` <= 0 nghĩa là không giới hạn.
+    """
+
+    def __init__(self, rate, burst, jitter=0.0):
+        """
+        Khởi tạo token bucket
+
+        Args:
+            rate (float): Số request mỗi giây được phép (<= 0 = không giới hạn)
+            burst (int): Số request tối đa được phép dồn cùng lúc
+            jitter (float): Độ trễ ngẫu nhiên tối đa (giây) cộng thêm khi phải chờ
+        """
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.jitter = jitter
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """
+        Đặt trước một token
+
+        Returns:
+            float: Thời gian (giây) cần chờ trước khi được gửi request
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        # Chỉ thêm jitter khi thực sự hết ngân sách của host
+        if wait > 0 and self.jitter:
+            wait += random.uniform(0, self.jitter)
+        return wait
+
+    def acquire(self):
+        """
+        Chờ (chặn thread hiện tại) cho tới khi có token
+
+        Returns:
+            float: Thời gian đã chờ (giây)
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        """
+        Chờ (không chặn event loop) cho tới khi có token
+
+        Returns:
+            float: Thời gian đã chờ (giây)
+        """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+class HostRateLimiter:
+    """
+    Tập hợp token bucket dùng chung, mỗi host một bucket
+    """
+
+    def __init__(self, rate=HOST_RATE_LIMIT, burst=HOST_BURST, jitter=HOST_JITTER):
+        """
+        Khởi tạo rate limiter với cấu hình mặc định cho mọi host
+
+        Args:
+            rate (float): Số request mỗi giây mặc định cho một host
+            burst (int): Số request dồn tối đa mặc định cho một host
+            jitter (float): Độ trễ ngẫu nhiên tối đa khi phải chờ
+        """
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self._buckets = {}
+        self._overrides = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_key(url):
+        """
+        Lấy khóa host từ URL (hoặc base_url của crawler)
+
+        Args:
+            url (str): URL bất kỳ thuộc host
+
+        Returns:
+            str: Tên host viết thường
+        """
+        return (urlparse(url).hostname or url).lower()
+
+    def configure(self, url, rate=None, burst=None, jitter=None):
+        """
+        Thiết lập tốc độ riêng cho một host
+
+        Args:
+            url (str): URL hoặc base_url của host
+            rate (float, optional): Số request mỗi giây
+            burst (int, optional): Số request dồn tối đa
+            jitter (float, optional): Độ trễ ngẫu nhiên tối đa khi phải chờ
+        """
+        host = self.host_key(url)
+        with self._lock:
+            self._overrides[host] = {
+                'rate': self.rate if rate is None else rate,
+                'burst': self.burst if burst is None else burst,
+                'jitter': self.jitter if jitter is None else jitter
+            }
+            # Tạo lại bucket để áp dụng cấu hình mới
+            self._buckets.pop(host, None)
+
+    def bucket_for(self, url):
+        """
+        Lấy token bucket của host chứa URL
+
+        Args:
+            url (str): URL hoặc base_url của host
+
+        Returns:
+            TokenBucket: Bucket dùng chung của host
+        """
+        host = self.host_key(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                settings = self._overrides.get(host, {
+                    'rate': self.rate, 'burst': self.burst, 'jitter': self.jitter
+                })
+                bucket = TokenBucket(**settings)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url):
+        """
+        Chờ tới lượt gửi request tới host chứa URL (đồng bộ)
+        """
+        return self.bucket_for(url).acquire()
+
+    async def acquire_async(self, url):
+        """
+        Chờ tới lượt gửi request tới host chứa URL (bất đồng bộ)
+        """
+        return await self.bucket_for(url).acquire_async()
+
+# Rate limiter dùng chung cho toàn bộ ứng dụng
+host_rate_limiter = HostRateLimiter()
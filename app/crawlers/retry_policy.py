@@ -0,0 +1,250 @@
+"""
+Retry policy - Phân loại lỗi, backoff có jitter và circuit breaker theo host
+"""
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import httpx
+import requests
+from app.utils.config import (
+    RETRY_BASE_DELAY, RETRY_MAX_DELAY, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+)
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+# Các loại lỗi được thử lại
+RETRY_CONNECT = 'connect'
+RETRY_TIMEOUT = 'timeout'
+RETRY_SERVER = 'server'
+RETRY_THROTTLED = 'throttled'
+
+class HostUnavailableError(Exception):
+    """
+    Host tạm thời không dùng được (circuit breaker đang mở hoặc phải chờ quá lâu)
+
+    Link nên được đưa lại vào hàng đợi và thử lại sau `retry_at`.
+    """
+
+    def __init__(self, host, retry_at, reason=''):
+        self.host = host
+        self.retry_at = retry_at
+        super().__init__(f"Host {host} tạm thời không khả dụng{': ' + reason if reason else ''}")
+
+def classify_status(status_code):
+    """
+    Phân loại mã trạng thái HTTP
+
+    Args:
+        status_code (int): Mã trạng thái HTTP
+
+    Returns:
+        str: RETRY_THROTTLED (429), RETRY_SERVER (5xx), None nếu không cần thử lại
+    """
+    if status_code == 429:
+        return RETRY_THROTTLED
+    if 500 <= status_code < 600 and status_code != 501:
+        return RETRY_SERVER
+    return None
+
+def classify_exception(error):
+    """
+    Phân loại lỗi mạng của requests hoặc httpx
+
+    Args:
+        error (Exception): Lỗi khi gửi request
+
+    Returns:
+        str: RETRY_CONNECT, RETRY_TIMEOUT, None nếu không cần thử lại
+    """
+    # ConnectTimeout là cả lỗi kết nối lẫn timeout, xem như lỗi kết nối
+    if isinstance(error, (requests.exceptions.ConnectTimeout, httpx.ConnectTimeout)):
+        return RETRY_CONNECT
+    if isinstance(error, (requests.exceptions.Timeout, httpx.TimeoutException)):
+        return RETRY_TIMEOUT
+    if isinstance(error, (requests.exceptions.ConnectionError, httpx.TransportError)):
+        return RETRY_CONNECT
+    return None
+
+def parse_retry_after(value):
+    """
+    Đọc header Retry-After (số giây hoặc ngày giờ HTTP)
+
+    Args:
+        value (str): Giá trị header, có thể None
+
+    Returns:
+        float: Số giây cần chờ, None nếu không có hoặc không đọc được
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt, retry_after=None, base=RETRY_BASE_DELAY, cap=RETRY_MAX_DELAY):
+    """
+    Tính thời gian chờ trước lần thử lại
+
+    Dùng exponential backoff với "equal jitter": chờ trong khoảng [d/2, d] với
+    d = min(cap, base * 2^attempt) để các worker không thử lại cùng lúc. Nếu
+    server gửi Retry-After thì chờ đúng khoảng đó (cộng một chút jitter).
+
+    Args:
+        attempt (int): Số lần đã thử lại (bắt đầu từ 0)
+        retry_after (float, optional): Giá trị Retry-After của server (giây)
+        base (float): Thời gian chờ cơ sở (giây)
+        cap (float): Thời gian chờ tối đa khi không có Retry-After (giây)
+
+    Returns:
+        float: Thời gian chờ (giây)
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, base)
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+class CircuitBreaker:
+    """
+    Circuit breaker của một host
+
+    Sau `failure_threshold` lỗi liên tiếp, breaker mở trong `reset_timeout`
+    giây: mọi request tới host bị từ chối ngay bằng HostUnavailableError. Hết
+    thời gian đó, một request thăm dò được cho qua; thành công thì đóng lại,
+    thất bại thì mở tiếp.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, host, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_TIMEOUT):
+        """
+        Khởi tạo breaker
+
+        Args:
+            host (str): Tên host
+            failure_threshold (int): Số lỗi liên tiếp để mở breaker
+            reset_timeout (float): Thời gian mở trước khi cho request thăm dò (giây)
+        """
+        self.host = host
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.open_until = 0.0
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    def check(self):
+        """
+        Kiểm tra trước khi gửi request
+
+        Request thăm dò phải kết thúc bằng record_success, record_failure hoặc
+        (khi không có kết quả, ví dụ bị hủy) release_probe.
+
+        Returns:
+            bool: True nếu request này là request thăm dò
+
+        Raises:
+            HostUnavailableError: Nếu breaker đang mở hoặc đang chờ request thăm dò
+        """
+        with self._lock:
+            now = time.time()
+            if self.state == self.OPEN:
+                if now < self.open_until:
+                    raise HostUnavailableError(self.host, self.open_until, 'circuit breaker đang mở')
+                # Cho một request thăm dò đi qua
+                self.state = self.HALF_OPEN
+                return True
+            if self.state == self.HALF_OPEN:
+                raise HostUnavailableError(
+                    self.host, now + max(1.0, self.reset_timeout / 10), 'đang chờ request thăm dò'
+                )
+            return False
+
+    def release_probe(self):
+        """
+        Trả lại lượt thăm dò khi request thăm dò kết thúc mà không biết host có
+        hoạt động bình thường không (bị hủy, lỗi không phải do host)
+
+        Breaker mở lại nhưng cho request kế tiếp thăm dò ngay.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self.open_until = time.time()
+
+    def record_success(self):
+        """
+        Ghi nhận host phản hồi bình thường
+        """
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Đóng circuit breaker của {self.host}")
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        """
+        Ghi nhận một lỗi có thể thử lại (kết nối, timeout, 5xx, 429)
+        """
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.open_until = time.time() + self.reset_timeout
+                self.trips += 1
+                logger.warning(
+                    f"Mở circuit breaker của {self.host} trong {self.reset_timeout:.0f}s "
+                    f"sau {self.failures} lỗi liên tiếp"
+                )
+
+class HostCircuitBreakers:
+    """
+    Tập hợp circuit breaker dùng chung, mỗi host một breaker
+    """
+
+    def __init__(self):
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker_for(self, host):
+        """
+        Lấy breaker của host
+
+        Args:
+            host (str): Tên host
+
+        Returns:
+            CircuitBreaker: Breaker dùng chung của host
+        """
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(host)
+                self._breakers[host] = breaker
+            return breaker
+
+    def states(self):
+        """
+        Trạng thái hiện tại của các breaker
+
+        Returns:
+            dict: Host -> {'state', 'failures', 'trips'}
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {
+            host: {'state': breaker.state, 'failures': breaker.failures, 'trips': breaker.trips}
+            for host, breaker in breakers.items()
+        }
+
+# Circuit breaker dùng chung cho toàn bộ ứng dụng
+circuit_breakers = HostCircuitBreakers()
@@ -0,0 +1,234 @@
+"""
+Structured data extractor - Trích xuất JobPosting (schema.org) từ JSON-LD
+"""
+import json
+import logging
+from app.crawlers.html_parser import parse_html, strainer
+from app.utils.config import JOB_DETAIL_FIELDS
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+# Ánh xạ employmentType của schema.org sang JOB_TYPES
+EMPLOYMENT_TYPES = {
+    'FULL_TIME': 'Toàn thời gian',
+    'PART_TIME': 'Bán thời gian',
+    'CONTRACTOR': 'Hợp đồng',
+    'TEMPORARY': 'Mùa vụ/Tạm thời',
+    'SEASONAL': 'Mùa vụ/Tạm thời',
+    'INTERN': 'Thực tập',
+    'PER_DIEM': 'Mùa vụ/Tạm thời',
+    'VOLUNTEER': 'Freelance',
+    'OTHER': ''
+}
+
+# Độ dài tối đa của mô tả công việc ngắn gọn
+BRIEF_DESCRIPTION_CHARS = 500
+
+def _as_list(value):
+    """
+    Đưa một giá trị JSON-LD về dạng danh sách
+    """
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def _text(value):
+    """
+    Chuyển một giá trị JSON-LD (chuỗi, số, danh sách, đối tượng có name) thành chuỗi
+    """
+    if value is None:
+        return ''
+    if isinstance(value, dict):
+        return _text(value.get('name') or value.get('@value') or '')
+    if isinstance(value, list):
+        return ', '.join(filter(None, (_text(item) for item in value)))
+    return ' '.join(str(value).split())
+
+def _html_text(value):
+    """
+    Lấy văn bản thuần từ một trường có thể chứa HTML (ví dụ description)
+    """
+    text = _text(value)
+    if '<' in text:
+        text = parse_html(text).get_text(' ', strip=True)
+    return ' '.join(text.split())
+
+def _format_address(address):
+    """
+    Định dạng PostalAddress thành chuỗi địa chỉ
+    """
+    if isinstance(address, str):
+        return ' '.join(address.split())
+    if not isinstance(address, dict):
+        return ''
+    parts = [
+        address.get('streetAddress'), address.get('addressLocality'),
+        address.get('addressRegion'), address.get('addressCountry')
+    ]
+    return ', '.join(filter(None, (_text(part) for part in parts)))
+
+def _format_salary(salary):
+    """
+    Định dạng MonetaryAmount (baseSalary) thành chuỗi mức lương
+    """
+    if not isinstance(salary, dict):
+        return _text(salary)
+
+    currency = salary.get('currency', '')
+    value = salary.get('value')
+    unit = ''
+    if isinstance(value, dict):
+        unit = value.get('unitText', '')
+        low, high = value.get('minValue'), value.get('maxValue')
+        amount = value.get('value')
+        if low is not None and high is not None:
+            amount = f"{low} - {high}"
+        elif low is not None:
+            amount = f"Từ {low}"
+        elif high is not None:
+            amount = f"Tới {high}"
+    else:
+        amount = value
+
+    if amount is None:
+        return ''
+    return ' '.join(filter(None, [str(amount), currency, f"/{unit}" if unit else '']))
+
+def _format_experience(experience):
+    """
+    Định dạng experienceRequirements thành chuỗi
+    """
+    if isinstance(experience, dict):
+        months = experience.get('monthsOfExperience')
+        if months is not None:
+            return f"{months} tháng"
+    return _html_text(experience)
+
+def _format_education(education):
+    """
+    Định dạng educationRequirements thành chuỗi
+    """
+    if isinstance(education, dict):
+        return _text(education.get('credentialCategory') or education.get('name'))
+    return _html_text(education)
+
+def extract_json_ld(html, soup=None):
+    """
+    Lấy tất cả các đối tượng JSON-LD trong trang
+
+    Args:
+        html (str): Nội dung HTML của trang
+        soup (BeautifulSoup, optional): Cây HTML đã phân tích sẵn; nếu không có
+            thì chỉ phân tích các thẻ script JSON-LD
+
+    Returns:
+        list: Danh sách đối tượng JSON-LD (đã mở @graph)
+    """
+    if soup is None:
+        soup = parse_html(html, parse_only=strainer('script', type='application/ld+json'))
+
+    objects = []
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or '', strict=False)
+        except json.JSONDecodeError as e:
+            logger.debug(f"Bỏ qua khối JSON-LD không hợp lệ: {e}")
+            continue
+
+        for item in _as_list(data):
+            if isinstance(item, dict):
+                objects.append(item)
+                objects.extend(obj for obj in _as_list(item.get('@graph')) if isinstance(obj, dict))
+    return objects
+
+def find_job_posting(objects):
+    """
+    Tìm đối tượng JobPosting đầu tiên
+
+    Args:
+        objects (list): Danh sách đối tượng JSON-LD
+
+    Returns:
+        dict: Đối tượng JobPosting, None nếu không có
+    """
+    for obj in objects:
+        if 'JobPosting' in _as_list(obj.get('@type')):
+            return obj
+    return None
+
+def map_job_posting(posting):
+    """
+    Ánh xạ JobPosting sang các trường chi tiết việc làm của ứng dụng
+
+    Args:
+        posting (dict): Đối tượng JobPosting
+
+    Returns:
+        dict: Các trường chi tiết việc làm lấy được (trường không có bị bỏ qua)
+    """
+    organization = posting.get('hiringOrganization') or {}
+    locations = [
+        _format_address(location.get('address') if isinstance(location, dict) else location)
+        for location in _as_list(posting.get('jobLocation'))
+    ]
+
+    employment_types = [
+        EMPLOYMENT_TYPES.get(str(item).upper(), _text(item))
+        for item in _as_list(posting.get('employmentType'))
+    ]
+
+    work_mode = ''
+    if 'TELECOMMUTE' in _as_list(posting.get('jobLocationType')):
+        work_mode = 'Làm từ xa'
+
+    description = _html_text(posting.get('description'))
+    if len(description) > BRIEF_DESCRIPTION_CHARS:
+        description = description[:BRIEF_DESCRIPTION_CHARS].rsplit(' ', 1)[0] + '...'
+
+    record = {
+        'job_title': _text(posting.get('title')),
+        'company_name': _text(organization),
+        'company_address': _format_address(organization.get('address')) if isinstance(organization, dict) else '',
+        'job_location': '; '.join(filter(None, locations)),
+        'salary_range': _format_salary(posting.get('baseSalary') or posting.get('estimatedSalary')),
+        'job_type': ', '.join(filter(None, employment_types)),
+        'work_mode': work_mode,
+        'required_skills': _html_text(posting.get('skills')),
+        'experience_level': _format_experience(posting.get('experienceRequirements')),
+        'education_requirements': _format_education(posting.get('educationRequirements')),
+        'brief_job_description': description,
+        'job_benefits': _html_text(posting.get('jobBenefits')),
+        'application_deadline': _text(posting.get('validThrough'))[:10],
+    }
+    return {field: value for field, value in record.items() if value}
+
+def extract_job_posting(html, soup=None):
+    """
+    Trích xuất thông tin chi tiết việc làm từ JSON-LD JobPosting của trang
+
+    Args:
+        html (str): Nội dung HTML của trang
+        soup (BeautifulSoup, optional): Cây HTML đã phân tích sẵn
+
+    Returns:
+        dict: Các trường chi tiết việc làm lấy được, rỗng nếu trang không có JobPosting
+    """
+    posting = find_job_posting(extract_json_ld(html, soup))
+    if not posting:
+        return {}
+    return map_job_posting(posting)
+
+def missing_fields(record, fields=None):
+    """
+    Liệt kê các trường chi tiết việc làm còn thiếu
+
+    Args:
+        record (dict): Thông tin chi tiết đã có
+        fields (list, optional): Các trường cần kiểm tra, mặc định tất cả JOB_DETAIL_FIELDS
+
+    Returns:
+        list: Tên các trường còn trống
+    """
+    fields = fields if fields is not None else list(JOB_DETAIL_FIELDS)
+    return [field for field in fields if not record.get(field)]
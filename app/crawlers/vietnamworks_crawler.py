@@ -3,15 +3,112 @@ VietnamWorks crawler implementation
 """
 import re
 import json
-from urllib.parse import urlencode
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlencode, urlsplit, parse_qs
 from app.crawlers.base_crawler import BaseCrawler
-from app.utils.openai_helper import extract_job_info_with_openai, search_jobs_with_openai
+from app.crawlers.html_parser import strainer
+from app.utils.config import MAX_THREADS, SEARCH_MAX_PAGES
+from app.utils.openai_helper import search_jobs_with_openai
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+def _labelled(scope, *labels):
+    """
+    CSS selector cho giá trị đứng ngay sau một nhãn trong khối thông tin việc làm
+    (ví dụ <label>CẤP BẬC</label><p>Nhân viên</p>)
+    """
+    names = ', '.join(f'"{label}"' for label in labels)
+    return f'{scope} :is(label, dt, h4, strong):-soup-contains({names}) + :is(p, span, dd, div)'
 
 class VietnamWorksCrawler(BaseCrawler):
     """
     Crawler cho trang web VietnamWorks
     """
     
+    # Khung nội dung chính của trang chi tiết; selector chung chỉ tìm trong khung này
+    # để không lấy nhầm từ sidebar hay khối "việc làm tương tự"
+    DETAIL_SCOPE = ':is([name="jobDetail"], [class*="job-detail"], [class*="JobDetail"])'
+    
+    # Selector cho trang chi tiết việc làm, OpenAI chỉ dùng khi các trường bắt buộc
+    # không khớp hoặc giá trị không qua kiểm tra (pattern, độ dài)
+    extraction_spec = {
+        'job_title': {
+            'css': ['h1[name="title"]', f'{DETAIL_SCOPE} h1.job-title', f'{DETAIL_SCOPE} h1'],
+            'min_length': 3, 'max_length': 200
+        },
+        'company_name': {
+            'css': ['a[name="companyName"]', f'{DETAIL_SCOPE} .company-name'],
+            'min_length': 2, 'max_length': 200
+        },
+        'company_address': {
+            'css': ['[name="address"]', f'{DETAIL_SCOPE} [class*="company-address"]'],
+            'post': ['strip_label'], 'min_length': 5, 'max_length': 300
+        },
+        'job_location': {
+            'css': ['[name="workingLocation"]', f'{DETAIL_SCOPE} [class*="job-location"]'],
+            'post': ['strip_label'], 'min_length': 2, 'max_length': 200
+        },
+        'salary_range': {
+            'css': ['span[name="label"][class*="salary"]', f'{DETAIL_SCOPE} [class*="salary"]'],
+            'post': ['strip_label'], 'max_length': 80,
+            'pattern': r'\d|thương lượng|thoả thuận|thỏa thuận|cạnh tranh|negotiable|competitive'
+        },
+        'required_skills': {
+            'css': ['[name="skill"] a', f'{DETAIL_SCOPE} [class*="skill"] li'],
+            'all': True, 'max_length': 60
+        },
+        'brief_job_description': {
+            'css': ['[name="jobDescription"]', f'{DETAIL_SCOPE} [class*="job-description"]'],
+            'post': ['brief'], 'min_length': 50
+        },
+        'job_benefits': {'css': [f'{DETAIL_SCOPE} [class*="benefit"] li'], 'all': True, 'max_length': 300},
+        'application_deadline': {
+            'css': [f'{DETAIL_SCOPE} [class*="deadline"]', f'{DETAIL_SCOPE} [class*="expired"]'],
+            'regex': r'\d{1,2}[/.-]\d{1,2}[/.-]\d{4}',
+            'post': ['date'],
+            'pattern': r'^\d{4}-\d{2}-\d{2}$'
+        },
+        'contact_email': {
+            'css': ['a[href^="mailto:"]'], 'attr': 'href', 'regex': r'mailto:([^?]+)',
+            'pattern': r'^[\w.+-]+@[\w-]+(\.[\w-]+)+$'
+        },
+        # Các trường không bắt buộc lấy từ khối "Thông tin việc làm" (nhãn - giá trị);
+        # pattern giữ lại các giá trị hợp lý để không nhận nhầm nội dung khác
+        'job_type': {
+            'css': [_labelled(DETAIL_SCOPE, 'LOẠI HÌNH LÀM VIỆC', 'Loại hình làm việc', 'Loại hình')],
+            'max_length': 60,
+            'pattern': r'toàn thời gian|bán thời gian|hợp đồng|freelance|thời vụ|tạm thời|thực tập|full[- ]?time|part[- ]?time|contract|intern'
+        },
+        'work_mode': {
+            'css': [_labelled(DETAIL_SCOPE, 'HÌNH THỨC LÀM VIỆC', 'Hình thức làm việc', 'Nơi làm việc')],
+            'max_length': 60,
+            'pattern': r'văn phòng|từ xa|remote|hybrid|on-?site|linh hoạt'
+        },
+        'experience_level': {
+            'css': [
+                _labelled(DETAIL_SCOPE, 'CẤP BẬC', 'Cấp bậc'),
+                _labelled(DETAIL_SCOPE, 'SỐ NĂM KINH NGHIỆM TỐI THIỂU', 'Số năm kinh nghiệm', 'Kinh nghiệm')
+            ],
+            'min_length': 2, 'max_length': 80
+        },
+        'education_requirements': {
+            'css': [_labelled(DETAIL_SCOPE, 'TRÌNH ĐỘ HỌC VẤN', 'Trình độ học vấn', 'Học vấn', 'Bằng cấp')],
+            'min_length': 2, 'max_length': 120
+        },
+        'language_requirement': {
+            'css': [_labelled(DETAIL_SCOPE, 'NGÔN NGỮ TRÌNH BÀY HỒ SƠ', 'Ngôn ngữ trình bày hồ sơ', 'Ngoại ngữ')],
+            'max_length': 80,
+            'pattern': r'tiếng|việt|anh|nhật|hàn|trung|english|vietnamese|japanese|korean|chinese|bất kỳ|any'
+        },
+        'contact_person': {
+            'css': [_labelled(DETAIL_SCOPE, 'NGƯỜI LIÊN HỆ', 'Người liên hệ')],
+            'min_length': 2, 'max_length': 100,
+            'pattern': r'^[^\d@]+$'
+        },
+    }
+    
     def __init__(self):
         """
         Khởi tạo crawler cho VietnamWorks
@@ -19,8 +116,11 @@ class VietnamWorksCrawler(BaseCrawler):
         super().__init__("VietnamWorks")
         self.base_url = "https://www.vietnamworks.com"
         self.search_url = f"{self.base_url}/tim-kiem-viec-lam-nhanh"
+        
+        # Trang kết quả tìm kiếm chỉ cần các thẻ tiêu đề việc làm
+        self.search_result_strainer = strainer('h3', class_='job-title')
     
-    def search_jobs(self, keywords, location=None, filters=None):
+    def search_jobs(self, keywords, location=None, filters=None, limit=None, on_links=None):
         """
         Tìm kiếm việc làm trên VietnamWorks sử dụng OpenAI Deep Search
         
@@ -28,6 +128,8 @@ class VietnamWorksCrawler(BaseCrawler):
             keywords (list): Danh sách từ khóa tìm kiếm
             location (dict, optional): Thông tin vị trí địa lý
             filters (dict, optional): Các bộ lọc bổ sung
+            limit (int, optional): Số lượng URL tối đa cần tìm
+            on_links (function, optional): Nhận URL mới của từng trang kết quả ngay khi tải xong
             
         Returns:
             list: Danh sách các URL việc làm
@@ -40,64 +142,188 @@ class VietnamWorksCrawler(BaseCrawler):
         # Nếu tìm kiếm thông minh không thành công, sử dụng phương pháp tìm kiếm truyền thống
         if not smart_search_urls:
             print("Tìm kiếm thông minh không thành công, chuyển sang phương pháp truyền thống")
-            return self._search_jobs_traditional(keywords, location, filters)
+            return self._search_jobs_traditional(keywords, location, filters, limit, on_links)
         
         print(f"Đã tìm thấy {len(smart_search_urls)} việc làm phù hợp qua tìm kiếm thông minh")
+        smart_search_urls = smart_search_urls[:limit] if limit else smart_search_urls
+        if on_links:
+            on_links(smart_search_urls)
         return smart_search_urls
     
-    def _search_jobs_traditional(self, keywords, location=None, filters=None):
+    def _build_search_url(self, keyword, location=None, filters=None, page=1):
+        """
+        Tạo URL trang kết quả tìm kiếm
+        
+        Args:
+            keyword (str): Từ khóa tìm kiếm
+            location (dict, optional): Thông tin vị trí địa lý
+            filters (dict, optional): Các bộ lọc bổ sung
+            page (int): Số thứ tự trang kết quả
+            
+        Returns:
+            str: URL tìm kiếm
+        """
+        # Xây dựng tham số tìm kiếm
+        params = {
+            'q': keyword
+        }
+        
+        # Thêm vị trí nếu có
+        if location and 'company_province' in location:
+            params['province'] = location['company_province']
+        
+        # Thêm các bộ lọc nếu có
+        if filters:
+            if 'experience' in filters:
+                params['exp'] = filters['experience']
+            if 'job_type' in filters:
+                params['jobtype'] = filters['job_type']
+            if 'salary' in filters:
+                params['salary'] = filters['salary']
+        
+        if page > 1:
+            params['page'] = page
+        
+        return f"{self.search_url}?{urlencode(params)}"
+    
+    def _get_total_pages(self, soup):
+        """
+        Xác định số trang kết quả từ thanh phân trang
+        
+        Args:
+            soup (BeautifulSoup): Trang kết quả đầu tiên
+            
+        Returns:
+            int: Số trang kết quả (tối đa SEARCH_MAX_PAGES)
+        """
+        pages = [1]
+        for link in soup.select('a[href*="page="]'):
+            for value in parse_qs(urlsplit(link.get('href', '')).query).get('page', []):
+                if value.isdigit():
+                    pages.append(int(value))
+        return min(max(pages), SEARCH_MAX_PAGES)
+    
+    def _fetch_search_page(self, keyword, location, filters, page):
+        """
+        Tải một trang kết quả tìm kiếm
+        
+        Args:
+            keyword (str): Từ khóa tìm kiếm
+            location (dict, optional): Thông tin vị trí địa lý
+            filters (dict, optional): Các bộ lọc bổ sung
+            page (int): Số thứ tự trang kết quả
+            
+        Returns:
+            tuple: (danh sách URL việc làm, số trang kết quả - chỉ xác định ở trang đầu)
+        """
+        search_url = self._build_search_url(keyword, location, filters, page)
+        
+        # Trang đầu cần cả thanh phân trang, các trang sau chỉ cần tiêu đề việc làm
+        if page == 1:
+            soup = self.get_page(search_url)
+        else:
+            soup = self.get_page(search_url, parse_only=self.search_result_strainer)
+        if not soup:
+            return [], 0
+        
+        # Trích xuất các URL việc làm từ trang tìm kiếm
+        job_urls = []
+        for link in soup.select('h3.job-title > a'):
+            job_url = link.get('href')
+            if job_url:
+                # Đảm bảo URL đầy đủ
+                if not job_url.startswith('http'):
+                    job_url = f"{self.base_url}{job_url}"
+                job_urls.append(job_url)
+        
+        total_pages = self._get_total_pages(soup) if page == 1 else 0
+        return job_urls, total_pages
+    
+    def _search_jobs_traditional(self, keywords, location=None, filters=None, limit=None, on_links=None):
         """
         Phương pháp tìm kiếm truyền thống (backup) khi phương pháp tìm kiếm thông minh thất bại
         
+        Trang đầu của mọi từ khóa được tải đồng thời để biết số trang kết quả,
+        sau đó các trang còn lại được tải đồng thời xen kẽ giữa các từ khóa.
+        Tốc độ request vẫn do rate limiter của host quyết định. Dừng sớm khi
+        đã đủ `limit` URL. URL mới của mỗi trang được chuyển ngay cho `on_links`.
+        
         Args:
             keywords (list): Danh sách từ khóa tìm kiếm
             location (dict, optional): Thông tin vị trí địa lý
             filters (dict, optional): Các bộ lọc bổ sung
+            limit (int, optional): Số lượng URL tối đa cần tìm
+            on_links (function, optional): Nhận URL mới của từng trang kết quả
             
         Returns:
             list: Danh sách các URL việc làm
         """
-        job_urls = []
+        # dict giữ thứ tự tìm thấy và loại bỏ URL trùng
+        job_urls = {}
         
-        # Xử lý từng từ khóa
-        for keyword in keywords:
-            # Xây dựng tham số tìm kiếm
-            params = {
-                'q': keyword
+        def collect(urls):
+            new_urls = [url for url in dict.fromkeys(urls) if url not in job_urls]
+            if limit:
+                new_urls = new_urls[:max(limit - len(job_urls), 0)]
+            job_urls.update(dict.fromkeys(new_urls))
+            if on_links and new_urls:
+                on_links(new_urls)
+        
+        executor = ThreadPoolExecutor(max_workers=MAX_THREADS)
+        try:
+            # Tải trang đầu của tất cả từ khóa
+            first_pages = {
+                keyword: executor.submit(self._fetch_search_page, keyword, location, filters, 1)
+                for keyword in keywords
             }
+            total_pages = {}
+            for keyword, future in first_pages.items():
+                urls, pages = future.result()
+                collect(urls)
+                total_pages[keyword] = pages if urls else 0
             
-            # Thêm vị trí nếu có
-            if location and 'company_province' in location:
-                params['province'] = location['company_province']
-            
-            # Thêm các bộ lọc nếu có
-            if filters:
-                if 'experience' in filters:
-                    params['exp'] = filters['experience']
-                if 'job_type' in filters:
-                    params['jobtype'] = filters['job_type']
-                if 'salary' in filters:
-                    params['salary'] = filters['salary']
-            
-            # Tạo URL tìm kiếm
-            search_url = f"{self.search_url}?{urlencode(params)}"
-            
-            # Tải trang tìm kiếm
-            soup = self.get_page(search_url)
-            if not soup:
-                continue
+            # Các trang còn lại: trang 2 của mọi từ khóa, rồi trang 3...
+            max_pages = max(total_pages.values(), default=0)
+            tasks = iter([
+                (keyword, page)
+                for page in range(2, max_pages + 1)
+                for keyword in keywords
+                if page <= total_pages[keyword]
+            ])
+            exhausted = set()
+            pending = {}
             
-            # Trích xuất các URL việc làm từ trang tìm kiếm
-            job_links = soup.select('h3.job-title > a')
-            for link in job_links:
-                job_url = link.get('href')
-                if job_url:
-                    # Đảm bảo URL đầy đủ
-                    if not job_url.startswith('http'):
-                        job_url = f"{self.base_url}{job_url}"
-                    job_urls.append(job_url)
-        
-        return job_urls
+            while not (limit and len(job_urls) >= limit):
+                # Chờ khi đang tạm dừng, dừng lại nếu lượt crawl bị hủy
+                self.wait_if_paused()
+                
+                # Chỉ submit tối đa MAX_THREADS trang để có thể dừng sớm
+                while len(pending) < MAX_THREADS:
+                    task = next((t for t in tasks if t[0] not in exhausted), None)
+                    if task is None:
+                        break
+                    future = executor.submit(self._fetch_search_page, task[0], location, filters, task[1])
+                    pending[future] = task
+                
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    keyword, page = pending.pop(future)
+                    urls, _ = future.result()
+                    # Trang rỗng nghĩa là đã hết kết quả của từ khóa này
+                    if not urls:
+                        exhausted.add(keyword)
+                    collect(urls)
+        finally:
+            # Hủy các trang chưa chạy trên mọi đường thoát (đủ limit, bị hủy, lỗi);
+            # trang đang tải dừng ở điểm kiểm tra kế tiếp nếu lượt crawl bị hủy
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        job_urls = list(job_urls)
+        logger.info(f"Tìm kiếm truyền thống tìm thấy {len(job_urls)} URL cho {len(keywords)} từ khóa")
+        return job_urls[:limit] if limit else job_urls
     
     def extract_job_details(self, url):
         """
@@ -109,16 +335,55 @@ class VietnamWorksCrawler(BaseCrawler):
         Returns:
             dict: Thông tin chi tiết về việc làm
         """
-        soup = self.get_page(url)
-        if not soup:
+        page = self.fetch_page(url)
+        if not page:
+            return None
+        
+        # Trang không thay đổi: dùng lại kết quả cũ, bỏ qua lời gọi OpenAI
+        if page.unchanged:
+            stored = self.get_stored_details(url)
+            if stored:
+                logger.debug(f"Trang {url} không thay đổi, dùng lại kết quả đã trích xuất")
+                return stored
+        
+        # Trích xuất từ dữ liệu có cấu trúc, dùng OpenAI cho phần còn thiếu
+        job_details = self.extract_details_from_html(page.html, url, page.body, page.encoding)
+        
+        # Thêm thông tin nguồn
+        job_details['source'] = self.name
+        job_details['url'] = url
+        
+        self.store_details(url, job_details)
+        return job_details
+    
+    async def extract_job_details_async(self, url, engine):
+        """
+        Trích xuất thông tin chi tiết từ trang việc làm VietnamWorks (bất đồng bộ)
+        
+        Args:
+            url (str): URL của trang việc làm
+            engine (AsyncFetchEngine): Engine tải trang bất đồng bộ đang chạy
+            
+        Returns:
+            dict: Thông tin chi tiết về việc làm
+        """
+        page = await self.fetch_page_async(url, engine)
+        if not page:
             return None
         
-        # Sử dụng OpenAI để trích xuất thông tin
-        html_content = str(soup)
-        job_details = extract_job_info_with_openai(html_content, url)
+        # Trang không thay đổi: dùng lại kết quả cũ, bỏ qua lời gọi OpenAI
+        if page.unchanged:
+            stored = self.get_stored_details(url)
+            if stored:
+                logger.debug(f"Trang {url} không thay đổi, dùng lại kết quả đã trích xuất")
+                return stored
+        
+        # Phân tích chạy trong thread riêng, lời gọi OpenAI chờ ngân sách trên event loop
+        job_details = await self.extract_details_from_html_async(page.html, url, page.body, page.encoding)
         
         # Thêm thông tin nguồn
         job_details['source'] = self.name
         job_details['url'] = url
         
-        return job_details 
\ No newline at end of file
+        self.store_details(url, job_details)
+        return job_details
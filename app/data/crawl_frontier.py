@@ -0,0 +1,363 @@
+"""
+Crawl frontier - Hàng đợi link crawl chi tiết lưu trên đĩa, có độ ưu tiên
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from app.utils.config import FRONTIER_FILE, FRONTIER_SOURCE_WEIGHTS, FRONTIER_MAX_ATTEMPTS
+from app.utils.url_utils import canonicalize_url, dedup_key, site_host
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+class CrawlFrontier:
+    """
+    Hàng đợi link việc làm lưu trong SQLite
+
+    Mỗi link có một trạng thái (pending, in_flight, done, failed, retry_after).
+    Link được lấy ra theo độ ưu tiên (trọng số người dùng x trọng số nguồn),
+    sau đó theo độ mới (ngày đăng nếu có, nếu không thì thời điểm tìm thấy) và
+    thứ tự tìm thấy. Khi lấy nhiều link một lúc, host đang có ít link in_flight
+    nhất được phục vụ trước để không host nào chiếm hết worker.
+
+    Mỗi link thuộc về lượt crawl (run_id) đã thêm nó gần nhất; các thao tác nhận
+    run_id chỉ xét link của lượt đó, nên link còn lại của lượt khác trong file
+    không bị lấy ra hay tính vào tiến trình.
+    """
+
+    PENDING = 'pending'
+    IN_FLIGHT = 'in_flight'
+    DONE = 'done'
+    FAILED = 'failed'
+    RETRY_AFTER = 'retry_after'
+
+    def __init__(self, path=FRONTIER_FILE, source_weights=None, max_attempts=FRONTIER_MAX_ATTEMPTS):
+        """
+        Khởi tạo và mở file frontier
+
+        Args:
+            path (str): Đường dẫn file SQLite
+            source_weights (dict, optional): Trọng số ưu tiên theo nguồn, ví dụ {'VietnamWorks': 2}
+            max_attempts (int): Số lần lấy ra tối đa của một link trước khi bị đánh dấu failed
+        """
+        self.path = path
+        self.source_weights = source_weights if source_weights is not None else FRONTIER_SOURCE_WEIGHTS
+        self.max_attempts = max_attempts
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                source TEXT,
+                host TEXT,
+                state TEXT NOT NULL,
+                priority REAL NOT NULL,
+                freshness REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                retry_after REAL NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                error TEXT,
+                run_id TEXT
+            )
+        """)
+        # File frontier tạo trước khi có cột run_id
+        columns = [row[1] for row in self._conn.execute('PRAGMA table_info(frontier)')]
+        if 'run_id' not in columns:
+            self._conn.execute('ALTER TABLE frontier ADD COLUMN run_id TEXT')
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_frontier_ready ON frontier(state, host, priority, freshness)'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _parse_posted_at(value):
+        """
+        Chuyển ngày đăng của link về timestamp
+
+        Args:
+            value: Timestamp hoặc chuỗi ngày ISO (ví dụ '2024-05-01')
+
+        Returns:
+            float: Timestamp, None nếu không đọc được
+        """
+        if value is None or value == '':
+            return None
+        if isinstance(value, (int, float)):
+            return float(value) if value == value else None
+        try:
+            return datetime.fromisoformat(str(value)).timestamp()
+        except ValueError:
+            return None
+
+    def add(self, links, run_id=None):
+        """
+        Thêm link vào frontier cho một lượt crawl
+
+        Link đã có trong cùng lượt được giữ nguyên trạng thái; link còn lại từ
+        lượt khác được chuyển sang lượt này và đưa về pending.
+
+        Args:
+            links (list): Danh sách dict có 'url', 'source' và tùy chọn
+                          'weight' (trọng số người dùng), 'posted_at' (ngày đăng)
+            run_id (str, optional): Mã lượt crawl
+
+        Returns:
+            int: Số link mới được thêm hoặc chuyển sang lượt này
+        """
+        now = time.time()
+        rows = []
+        for link in links:
+            # URL gốc được giữ để tải trang, URL chuẩn hóa chỉ dùng làm khóa
+            url = link['url'].strip()
+            source = link.get('source')
+            weight = link.get('weight')
+            weight = 1.0 if weight is None or weight != weight else float(weight)
+            priority = weight * self.source_weights.get(source, 1.0)
+            freshness = self._parse_posted_at(link.get('posted_at')) or now
+            key = dedup_key(canonicalize_url(url))
+            rows.append((key, url, source, site_host(url), self.PENDING, priority, freshness, now, run_id))
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                'INSERT INTO frontier '
+                '(key, url, source, host, state, priority, freshness, updated_at, run_id) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET '
+                'url = excluded.url, source = excluded.source, host = excluded.host, '
+                'state = excluded.state, priority = excluded.priority, freshness = excluded.freshness, '
+                'attempts = 0, retry_after = 0, error = NULL, updated_at = excluded.updated_at, '
+                'run_id = excluded.run_id '
+                'WHERE frontier.run_id IS NOT excluded.run_id',
+                rows
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    @staticmethod
+    def _run_filter(run_id):
+        """
+        Điều kiện SQL giới hạn theo lượt crawl (rỗng nếu run_id là None)
+        """
+        return ('', ()) if run_id is None else (' AND run_id = ?', (run_id,))
+
+    def claim(self, limit=1, run_id=None):
+        """
+        Lấy các link đến lượt crawl và đánh dấu in_flight
+
+        Args:
+            limit (int): Số link tối đa cần lấy
+            run_id (str, optional): Chỉ lấy link của lượt crawl này
+
+        Returns:
+            list: Danh sách dict {'url', 'source', 'status', 'attempts'}
+        """
+        if limit <= 0:
+            return []
+        now = time.time()
+        run_clause, run_params = self._run_filter(run_id)
+
+        with self._lock:
+            in_flight = defaultdict(int, self._conn.execute(
+                'SELECT host, COUNT(*) FROM frontier WHERE state = ? GROUP BY host', (self.IN_FLIGHT,)
+            ).fetchall())
+
+            # Tối đa `limit` link đứng đầu của mỗi host
+            rows = self._conn.execute(f"""
+                SELECT key, url, source, host, attempts FROM (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY host ORDER BY priority DESC, freshness DESC, rowid ASC
+                    ) AS host_rank
+                    FROM frontier
+                    WHERE state IN (?, ?) AND retry_after <= ?{run_clause}
+                )
+                WHERE host_rank <= ?
+                ORDER BY host_rank, priority DESC, freshness DESC, rowid ASC
+            """, (self.PENDING, self.RETRY_AFTER, now, *run_params, limit)).fetchall()
+
+            heads = defaultdict(deque)
+            for row in rows:
+                heads[row[3]].append(row)
+
+            # Luôn phục vụ host đang có ít link in_flight nhất
+            claimed = []
+            while heads and len(claimed) < limit:
+                host = min(heads, key=lambda h: in_flight[h])
+                claimed.append(heads[host].popleft())
+                in_flight[host] += 1
+                if not heads[host]:
+                    del heads[host]
+
+            self._conn.executemany(
+                'UPDATE frontier SET state = ?, attempts = attempts + 1, updated_at = ? WHERE key = ?',
+                [(self.IN_FLIGHT, now, row[0]) for row in claimed]
+            )
+            self._conn.commit()
+
+        return [
+            {'url': url, 'source': source, 'status': 'Đang chờ', 'attempts': attempts + 1}
+            for _, url, source, _, attempts in claimed
+        ]
+
+    def _set_state(self, url, state, retry_after=0, error=None):
+        """
+        Cập nhật trạng thái của một link
+        """
+        with self._lock:
+            self._conn.execute(
+                'UPDATE frontier SET state = ?, retry_after = ?, error = ?, updated_at = ? WHERE key = ?',
+                (state, retry_after, error, time.time(), dedup_key(canonicalize_url(url)))
+            )
+            self._conn.commit()
+
+    def start(self, url):
+        """
+        Đánh dấu in_flight một link cụ thể đang chờ (dùng khi link được giao
+        thẳng cho worker thay vì qua claim)
+
+        Args:
+            url (str): URL việc làm
+
+        Returns:
+            bool: False nếu link không chờ crawl (không có, đang chạy hoặc đã xong)
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                'UPDATE frontier SET state = ?, attempts = attempts + 1, updated_at = ? '
+                'WHERE key = ? AND state IN (?, ?)',
+                (self.IN_FLIGHT, time.time(), dedup_key(canonicalize_url(url)), self.PENDING, self.RETRY_AFTER)
+            )
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    def complete(self, url):
+        """
+        Đánh dấu link đã crawl xong
+
+        Args:
+            url (str): URL việc làm
+        """
+        self._set_state(url, self.DONE)
+
+    def release(self, url):
+        """
+        Trả link đang in_flight về pending mà không tính là một lần thử
+
+        Args:
+            url (str): URL việc làm
+        """
+        with self._lock:
+            self._conn.execute(
+                'UPDATE frontier SET state = ?, attempts = MAX(attempts - 1, 0), updated_at = ? '
+                'WHERE key = ? AND state = ?',
+                (self.PENDING, time.time(), dedup_key(canonicalize_url(url)), self.IN_FLIGHT)
+            )
+            self._conn.commit()
+
+    def fail(self, url, error=None, retry_at=None):
+        """
+        Đánh dấu link crawl thất bại
+
+        Args:
+            url (str): URL việc làm
+            error (str, optional): Mô tả lỗi
+            retry_at (float, optional): Thời điểm được thử lại. Nếu None hoặc link
+                                        đã được lấy ra quá max_attempts lần, link
+                                        bị đánh dấu failed và không được lấy ra nữa
+
+        Returns:
+            str: Trạng thái mới của link, None nếu link không có trong frontier
+        """
+        key = dedup_key(canonicalize_url(url))
+        with self._lock:
+            row = self._conn.execute('SELECT attempts FROM frontier WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+
+            if retry_at is None or row[0] >= self.max_attempts:
+                state, retry_at = self.FAILED, 0
+            else:
+                state = self.RETRY_AFTER
+            self._conn.execute(
+                'UPDATE frontier SET state = ?, retry_after = ?, error = ?, updated_at = ? WHERE key = ?',
+                (state, retry_at, error, time.time(), key)
+            )
+            self._conn.commit()
+            return state
+
+    def recover(self, retry_failed=False, run_id=None):
+        """
+        Đưa các link đang in_flight (do lần chạy trước bị dừng đột ngột) về pending
+
+        Args:
+            retry_failed (bool): Đồng thời cho phép crawl lại các link failed
+            run_id (str, optional): Chỉ xét link của lượt crawl này
+
+        Returns:
+            int: Số link được đưa về pending
+        """
+        states = (self.IN_FLIGHT, self.FAILED) if retry_failed else (self.IN_FLIGHT,)
+        run_clause, run_params = self._run_filter(run_id)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE frontier SET state = ?, retry_after = 0, updated_at = ? "
+                f"WHERE state IN ({', '.join('?' * len(states))}){run_clause}",
+                (self.PENDING, time.time(), *states, *run_params)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def next_retry_at(self, run_id=None):
+        """
+        Lấy thời điểm sớm nhất có link chờ thử lại
+
+        Args:
+            run_id (str, optional): Chỉ xét link của lượt crawl này
+
+        Returns:
+            float: Timestamp, None nếu không còn link nào chờ
+        """
+        run_clause, run_params = self._run_filter(run_id)
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT MIN(retry_after) FROM frontier WHERE state IN (?, ?){run_clause}',
+                (self.PENDING, self.RETRY_AFTER, *run_params)
+            ).fetchone()
+        return row[0]
+
+    def clear(self):
+        """
+        Xóa toàn bộ frontier để bắt đầu một lượt crawl mới
+        """
+        with self._lock:
+            self._conn.execute('DELETE FROM frontier')
+            self._conn.commit()
+
+    def stats(self, run_id=None):
+        """
+        Đếm số link theo trạng thái
+
+        Args:
+            run_id (str, optional): Chỉ đếm link của lượt crawl này
+
+        Returns:
+            dict: Trạng thái -> số link
+        """
+        run_clause, run_params = self._run_filter(run_id)
+        with self._lock:
+            counts = dict(self._conn.execute(
+                f'SELECT state, COUNT(*) FROM frontier WHERE 1 = 1{run_clause} GROUP BY state',
+                run_params
+            ).fetchall())
+        return {
+            state: counts.get(state, 0)
+            for state in (self.PENDING, self.IN_FLIGHT, self.DONE, self.FAILED, self.RETRY_AFTER)
+        }
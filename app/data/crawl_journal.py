@@ -0,0 +1,141 @@
+"""
+Crawl journal - Nhật ký checkpoint chỉ ghi nối cho quá trình crawl chi tiết
+"""
+import json
+import logging
+import os
+import threading
+import time
+from app.utils.config import JOB_DETAILS_JOURNAL_FILE
+from app.utils.url_utils import canonicalize_url, dedup_key
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+class CrawlJournal:
+    """
+    Nhật ký JSON Lines ghi lại kết quả của từng link ngay khi crawl xong
+
+    Mỗi dòng gồm URL, trạng thái ('done' hoặc 'failed'), thời điểm và thông tin
+    chi tiết đã trích xuất. Mỗi dòng được flush và fsync ngay nên khi ứng dụng
+    bị tắt đột ngột chỉ mất tối đa dòng đang ghi dở.
+    """
+
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, path=JOB_DETAILS_JOURNAL_FILE):
+        """
+        Khởi tạo nhật ký
+
+        Args:
+            path (str): Đường dẫn file nhật ký
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _open(self):
+        """
+        Mở file nhật ký ở chế độ ghi nối (phải được gọi khi đang giữ lock)
+        """
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+            # Dòng cuối bị ghi dở (ứng dụng tắt đột ngột) không có ký tự xuống dòng;
+            # kết thúc dòng đó để dòng mới không bị dính vào và hỏng theo
+            if self._ends_mid_line():
+                self._file.write('\n')
+                self._file.flush()
+        return self._file
+
+    def _ends_mid_line(self):
+        """
+        File nhật ký có kết thúc giữa chừng một dòng không
+        """
+        with open(self.path, 'rb') as journal:
+            journal.seek(0, os.SEEK_END)
+            if journal.tell() == 0:
+                return False
+            journal.seek(-1, os.SEEK_END)
+            return journal.read(1) != b'\n'
+
+    def reset(self):
+        """
+        Xóa nhật ký cũ để bắt đầu một lượt crawl mới
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            open(self.path, 'w', encoding='utf-8').close()
+
+    def record(self, url, status, job_detail=None, source=None):
+        """
+        Ghi kết quả crawl của một link
+
+        Args:
+            url (str): URL của trang việc làm
+            status (str): CrawlJournal.DONE hoặc CrawlJournal.FAILED
+            job_detail (dict, optional): Thông tin chi tiết đã trích xuất
+            source (str, optional): Tên trang web nguồn
+        """
+        entry = {
+            'url': url,
+            'source': source,
+            'status': status,
+            'time': time.time(),
+            'record': job_detail
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+
+        with self._lock:
+            journal = self._open()
+            journal.write(line)
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def load(self):
+        """
+        Đọc lại nhật ký, giữ kết quả mới nhất của mỗi URL
+
+        Returns:
+            dict: Khóa loại trùng của URL (giống khóa của frontier) -> dòng nhật ký mới nhất
+        """
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+
+        with open(self.path, encoding='utf-8') as journal:
+            for line_number, line in enumerate(journal, 1):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Dòng cuối có thể bị ghi dở khi ứng dụng bị tắt đột ngột
+                    logger.warning(f"Bỏ qua dòng {line_number} hỏng trong {self.path}")
+                    continue
+                entries[dedup_key(canonicalize_url(entry['url']))] = entry
+        return entries
+
+    def completed(self):
+        """
+        Lấy các link đã crawl thành công
+
+        Returns:
+            dict: Khóa loại trùng của URL -> thông tin chi tiết đã trích xuất
+        """
+        return {
+            url: entry['record']
+            for url, entry in self.load().items()
+            if entry['status'] == self.DONE and entry.get('record')
+        }
+
+    def close(self):
+        """
+        Đóng file nhật ký
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,204 @@
+"""
+LLM cache - Bộ nhớ đệm kết quả trích xuất của OpenAI theo nội dung trang
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from app.utils.config import LLM_CACHE_ENABLED, LLM_CACHE_FILE
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+class LLMCache:
+    """
+    Bộ nhớ đệm kết quả OpenAI lưu trong SQLite
+
+    Khóa là SHA-256 của nội dung trang đã chuẩn hóa (bỏ khác biệt khoảng
+    trắng), phiên bản prompt và model, nên cùng một tin tuyển dụng đăng lại
+    hoặc xuất hiện dưới hai URL chỉ cần gọi OpenAI một lần. Mỗi bản ghi giữ
+    phiên bản prompt đã tạo ra nó: khi prompt thay đổi, các bản ghi cũ không
+    còn được tra tới và có thể xóa bằng invalidate.
+    """
+
+    def __init__(self, path=LLM_CACHE_FILE):
+        """
+        Khởi tạo và mở file cache
+
+        Args:
+            path (str): Đường dẫn file SQLite
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS extractions (
+                key TEXT PRIMARY KEY,
+                prompt_version TEXT NOT NULL,
+                model TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_extractions_prompt ON extractions(prompt_version)')
+        self._conn.commit()
+
+    @staticmethod
+    def prompt_version(*parts):
+        """
+        Tạo phiên bản prompt từ nội dung các phần của prompt
+
+        Args:
+            *parts (str): Mẫu prompt, system message, danh sách trường...
+
+        Returns:
+            str: SHA-256 (hex, 16 ký tự đầu) của các phần
+        """
+        return hashlib.sha256('\x00'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def make_key(content, prompt_version, model, variant=''):
+        """
+        Tạo khóa cache
+
+        Args:
+            content (str): Nội dung trang gửi cho OpenAI
+            prompt_version (str): Phiên bản prompt
+            model (str): Tên model
+            variant (str): Phần thay đổi theo từng lời gọi của prompt (ví dụ danh sách trường)
+
+        Returns:
+            str: SHA-256 (hex) của nội dung đã chuẩn hóa, phiên bản prompt, model và variant
+        """
+        normalized = re.sub(r'\s+', ' ', content).strip()
+        return hashlib.sha256(
+            '\x00'.join((normalized, prompt_version, model, variant)).encode('utf-8')
+        ).hexdigest()
+
+    def get(self, content, prompt_version, model, variant=''):
+        """
+        Lấy kết quả đã lưu
+
+        Args:
+            content (str): Nội dung trang gửi cho OpenAI
+            prompt_version (str): Phiên bản prompt
+            model (str): Tên model
+            variant (str): Phần thay đổi theo từng lời gọi của prompt
+
+        Returns:
+            dict: Kết quả trích xuất, None nếu chưa có
+        """
+        key = self.make_key(content, prompt_version, model, variant)
+        with self._lock:
+            row = self._conn.execute('SELECT result FROM extractions WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE extractions SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, content, prompt_version, model, result, variant=''):
+        """
+        Lưu kết quả trích xuất
+
+        Args:
+            content (str): Nội dung trang gửi cho OpenAI
+            prompt_version (str): Phiên bản prompt
+            model (str): Tên model
+            result (dict): Kết quả trích xuất
+            variant (str): Phần thay đổi theo từng lời gọi của prompt
+        """
+        self.put_key(self.make_key(content, prompt_version, model, variant), prompt_version, model, result)
+
+    def put_key(self, key, prompt_version, model, result):
+        """
+        Lưu kết quả trích xuất theo khóa đã tính trước bằng make_key
+
+        Dùng khi nội dung trang không còn được giữ lúc có kết quả (ví dụ Batch API).
+
+        Args:
+            key (str): Khóa cache
+            prompt_version (str): Phiên bản prompt
+            model (str): Tên model
+            result (dict): Kết quả trích xuất
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO extractions '
+                '(key, prompt_version, model, result, created_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, prompt_version, model, json.dumps(result, ensure_ascii=False), now, now)
+            )
+            self._conn.commit()
+
+    def invalidate(self, keep_versions=None):
+        """
+        Xóa các kết quả được tạo bởi prompt cũ
+
+        Args:
+            keep_versions (list, optional): Các phiên bản prompt được giữ lại.
+                                            Nếu None, xóa toàn bộ cache
+
+        Returns:
+            int: Số bản ghi bị xóa
+        """
+        with self._lock:
+            if keep_versions:
+                cursor = self._conn.execute(
+                    f"DELETE FROM extractions WHERE prompt_version NOT IN ({', '.join('?' * len(keep_versions))})",
+                    tuple(keep_versions)
+                )
+            else:
+                cursor = self._conn.execute('DELETE FROM extractions')
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self):
+        """
+        Lấy thống kê sử dụng cache
+
+        Returns:
+            dict: Số lần hit/miss, tỷ lệ hit và số bản ghi
+        """
+        with self._lock:
+            count = self._conn.execute('SELECT COUNT(*) FROM extractions').fetchone()[0]
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total > 0 else 0,
+                'entries': count
+            }
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+def get_llm_cache():
+    """
+    Lấy LLM cache dùng chung cho toàn bộ ứng dụng
+
+    Returns:
+        LLMCache: Cache dùng chung, None nếu cache bị tắt
+    """
+    global _llm_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache()
+            logger.info(f"Đã mở LLM cache tại {LLM_CACHE_FILE}")
+        return _llm_cache
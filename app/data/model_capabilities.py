@@ -0,0 +1,158 @@
+"""
+Model capabilities - Ghi nhớ tính năng mà từng model OpenAI hỗ trợ
+"""
+import json
+import logging
+import os
+import threading
+import time
+from app.utils.config import MODEL_CAPABILITIES_FILE
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+# Các tính năng được ghi nhận (chỉ những tính năng ứng dụng dùng để định tuyến request)
+JSON_MODE = 'json_mode'
+CAPABILITIES = (JSON_MODE,)
+
+# Tính năng đã biết theo đúng tên model (không so tiền tố, để model mới như gpt-4.1
+# không bị nhận nhầm là snapshot cũ); model khác được thăm dò và ghi nhận khi dùng lần đầu.
+# Các snapshot cũ (gpt-4, gpt-3.5-turbo-16k...) trả về 400 khi có response_format.
+KNOWN_MODEL_CAPABILITIES = {
+    'gpt-3.5-turbo-0301': {JSON_MODE: False},
+    'gpt-3.5-turbo-0613': {JSON_MODE: False},
+    'gpt-3.5-turbo-16k': {JSON_MODE: False},
+    'gpt-3.5-turbo-16k-0613': {JSON_MODE: False},
+    'gpt-4': {JSON_MODE: False},
+    'gpt-4-0314': {JSON_MODE: False},
+    'gpt-4-0613': {JSON_MODE: False},
+    'gpt-4-32k': {JSON_MODE: False},
+    'gpt-4-32k-0314': {JSON_MODE: False},
+    'gpt-4-32k-0613': {JSON_MODE: False},
+}
+
+class ModelCapabilities:
+    """
+    Sổ ghi tính năng của từng model, lưu trong file JSON
+
+    Kết quả học được từ probe (lời gọi rất nhỏ khi model được dùng lần đầu) hoặc
+    từ lời gọi thật (model trả về 400 vì không hỗ trợ response_format) được ưu
+    tiên hơn bảng KNOWN_MODEL_CAPABILITIES và được giữ qua các lần chạy, nên mỗi
+    model chỉ phải thử một lần.
+    """
+
+    def __init__(self, path=MODEL_CAPABILITIES_FILE):
+        """
+        Khởi tạo và đọc file đã lưu
+
+        Args:
+            path (str): Đường dẫn file JSON
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._learned = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._learned = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Không đọc được file tính năng model {path}, bỏ qua: {e}")
+
+    @staticmethod
+    def _known(model):
+        """
+        Tính năng đã biết của model trong KNOWN_MODEL_CAPABILITIES
+        """
+        return KNOWN_MODEL_CAPABILITIES.get(model, {})
+
+    def supports(self, model, capability):
+        """
+        Model có hỗ trợ một tính năng không
+
+        Args:
+            model (str): Tên model
+            capability (str): Tính năng trong CAPABILITIES, ví dụ JSON_MODE
+
+        Returns:
+            bool: True/False, None nếu chưa biết
+        """
+        with self._lock:
+            learned = self._learned.get(model, {})
+            if capability in learned:
+                return learned[capability]
+        return self._known(model).get(capability)
+
+    def unknown(self, model, capabilities=CAPABILITIES):
+        """
+        Các tính năng chưa biết của model
+
+        Args:
+            model (str): Tên model
+            capabilities (tuple): Các tính năng cần xét
+
+        Returns:
+            list: Các tính năng chưa được ghi nhận
+        """
+        return [capability for capability in capabilities if self.supports(model, capability) is None]
+
+    def record(self, model, capability, supported):
+        """
+        Ghi nhận tính năng của model và lưu xuống file nếu có thay đổi
+
+        Args:
+            model (str): Tên model
+            capability (str): Tính năng trong CAPABILITIES, ví dụ JSON_MODE
+            supported (bool): Model có hỗ trợ tính năng không
+        """
+        with self._lock:
+            learned = self._learned.setdefault(model, {})
+            if learned.get(capability) == supported:
+                return
+            learned[capability] = supported
+            learned['updated_at'] = time.time()
+            self._save()
+        logger.info(f"Model {model} {'có' if supported else 'không'} hỗ trợ {capability}")
+
+    def _save(self):
+        """
+        Ghi file JSON (phải được gọi khi đang giữ lock); ghi ra file tạm rồi đổi tên
+        để file không bị hỏng khi tiến trình dừng giữa chừng
+        """
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._learned, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Lỗi khi lưu file tính năng model {self.path}: {e}")
+
+    def snapshot(self):
+        """
+        Tính năng của các model đã được ghi nhận
+
+        Returns:
+            dict: Tên model -> {tính năng: True/False}
+        """
+        with self._lock:
+            return {
+                model: {key: value for key, value in learned.items() if key in CAPABILITIES}
+                for model, learned in self._learned.items()
+            }
+
+_model_capabilities = None
+_model_capabilities_lock = threading.Lock()
+
+def get_model_capabilities():
+    """
+    Lấy sổ tính năng model dùng chung cho toàn bộ ứng dụng
+
+    Returns:
+        ModelCapabilities: Sổ tính năng dùng chung
+    """
+    global _model_capabilities
+    with _model_capabilities_lock:
+        if _model_capabilities is None:
+            _model_capabilities = ModelCapabilities()
+        return _model_capabilities
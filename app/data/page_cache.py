@@ -0,0 +1,301 @@
+"""
+Page cache - Bộ nhớ đệm trang web trên đĩa với TTL và loại bỏ LRU
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from app.utils.config import (
+    PAGE_CACHE_ENABLED, PAGE_CACHE_FILE, PAGE_CACHE_TTL, PAGE_CACHE_SITE_TTLS, PAGE_CACHE_MAX_MB
+)
+from app.utils.url_utils import canonicalize_url
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+class PageCache:
+    """
+    Bộ nhớ đệm HTML lưu trong SQLite
+
+    Mỗi trang được lưu dưới dạng nén zlib, khóa là SHA-256 của URL đã chuẩn hóa.
+    Trang hết hạn theo TTL của từng site, và khi tổng dung lượng vượt giới hạn
+    thì các trang ít được truy cập gần đây nhất bị xóa trước. Cùng với nội dung,
+    cache giữ ETag/Last-Modified để gửi conditional GET và kết quả trích xuất
+    của trang để dùng lại khi trang không thay đổi.
+    """
+
+    def __init__(self, path=PAGE_CACHE_FILE, default_ttl=PAGE_CACHE_TTL,
+                 site_ttls=None, max_bytes=PAGE_CACHE_MAX_MB * 1024 * 1024):
+        """
+        Khởi tạo và mở file cache
+
+        Args:
+            path (str): Đường dẫn file SQLite
+            default_ttl (int): Thời gian sống mặc định của một trang (giây)
+            site_ttls (dict, optional): TTL riêng theo tên site, ví dụ {'VietnamWorks': 3600}
+            max_bytes (int): Dung lượng nén tối đa của cache
+        """
+        self.path = path
+        self.default_ttl = default_ttl
+        self.site_ttls = site_ttls if site_ttls is not None else PAGE_CACHE_SITE_TTLS
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                site TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                record TEXT
+            )
+        """)
+        # Nâng cấp file cache được tạo bởi phiên bản cũ
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(pages)')}
+        for column in ('etag', 'last_modified', 'record'):
+            if column not in columns:
+                self._conn.execute(f'ALTER TABLE pages ADD COLUMN {column} TEXT')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages(accessed_at)')
+        self._conn.commit()
+
+        row = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()
+        self._total_bytes = row[0]
+
+    @staticmethod
+    def make_key(url):
+        """
+        Tạo khóa cache từ URL
+
+        Args:
+            url (str): URL của trang
+
+        Returns:
+            str: SHA-256 (hex) của URL đã chuẩn hóa
+        """
+        return hashlib.sha256(canonicalize_url(url).encode('utf-8')).hexdigest()
+
+    def ttl_for(self, site):
+        """
+        Lấy TTL áp dụng cho một site
+
+        Args:
+            site (str): Tên site (tên crawler)
+
+        Returns:
+            int: TTL (giây)
+        """
+        return self.site_ttls.get(site, self.default_ttl)
+
+    def lookup(self, url, site=None):
+        """
+        Tra cứu trang trong cache, kể cả khi đã hết hạn
+
+        Trang hết hạn vẫn được trả về cùng ETag/Last-Modified để crawler có thể
+        gửi conditional GET thay vì tải lại toàn bộ.
+
+        Args:
+            url (str): URL của trang
+            site (str, optional): Tên site để xác định TTL
+
+        Returns:
+            dict: {'html', 'fresh', 'etag', 'last_modified'}, None nếu không có trong cache
+        """
+        key = self.make_key(url)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, fetched_at, etag, last_modified FROM pages WHERE key = ?', (key,)
+            ).fetchone()
+
+            fresh = row is not None and now - row[1] <= self.ttl_for(site)
+            if not fresh:
+                self.misses += 1
+                if row is None:
+                    return None
+            else:
+                self._conn.execute('UPDATE pages SET accessed_at = ? WHERE key = ?', (now, key))
+                self._conn.commit()
+                self.hits += 1
+
+        return {
+            'html': zlib.decompress(row[0]).decode('utf-8'),
+            'fresh': fresh,
+            'etag': row[2],
+            'last_modified': row[3]
+        }
+
+    def get(self, url, site=None):
+        """
+        Lấy nội dung trang từ cache nếu còn hạn
+
+        Args:
+            url (str): URL của trang
+            site (str, optional): Tên site để xác định TTL
+
+        Returns:
+            str: Nội dung HTML, None nếu không có hoặc đã hết hạn
+        """
+        entry = self.lookup(url, site)
+        if entry is None or not entry['fresh']:
+            return None
+        return entry['html']
+
+    def revalidate(self, url):
+        """
+        Đánh dấu trang vẫn còn mới sau khi server trả về 304 Not Modified
+
+        Args:
+            url (str): URL của trang
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE key = ?',
+                (now, now, self.make_key(url))
+            )
+            self._conn.commit()
+            self.revalidations += 1
+
+    def put(self, url, html, site=None, etag=None, last_modified=None):
+        """
+        Lưu nội dung trang vào cache
+
+        Kết quả trích xuất đã lưu của URL bị xóa vì nội dung trang đã thay đổi.
+
+        Args:
+            url (str): URL của trang
+            html (str): Nội dung HTML
+            site (str, optional): Tên site
+            etag (str, optional): Header ETag của response
+            last_modified (str, optional): Header Last-Modified của response
+        """
+        key = self.make_key(url)
+        body = zlib.compress(html.encode('utf-8'), 6)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute('SELECT size FROM pages WHERE key = ?', (key,)).fetchone()
+            if row:
+                self._total_bytes -= row[0]
+
+            self._conn.execute(
+                'INSERT OR REPLACE INTO pages '
+                '(key, url, site, body, size, fetched_at, accessed_at, etag, last_modified) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, canonicalize_url(url), site, body, len(body), now, now, etag, last_modified)
+            )
+            self._total_bytes += len(body)
+            self._evict()
+            self._conn.commit()
+
+    def get_record(self, url):
+        """
+        Lấy kết quả trích xuất đã lưu cho trang
+
+        Args:
+            url (str): URL của trang
+
+        Returns:
+            dict: Thông tin chi tiết việc làm, None nếu chưa có
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT record FROM pages WHERE key = ?', (self.make_key(url),)
+            ).fetchone()
+
+        if row is None or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    def put_record(self, url, record):
+        """
+        Lưu kết quả trích xuất cho trang đang có trong cache
+
+        Args:
+            url (str): URL của trang
+            record (dict): Thông tin chi tiết việc làm
+        """
+        with self._lock:
+            self._conn.execute(
+                'UPDATE pages SET record = ? WHERE key = ?',
+                (json.dumps(record, ensure_ascii=False), self.make_key(url))
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """
+        Xóa các trang ít được truy cập gần đây nhất cho tới khi dưới giới hạn dung lượng
+        (phải được gọi khi đang giữ lock)
+        """
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                'SELECT key, size FROM pages ORDER BY accessed_at ASC LIMIT 100'
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+
+            for key, size in rows:
+                self._conn.execute('DELETE FROM pages WHERE key = ?', (key,))
+                self._total_bytes -= size
+                self.evictions += 1
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def stats(self):
+        """
+        Lấy thống kê sử dụng cache
+
+        Returns:
+            dict: Số lần hit/miss, tỷ lệ hit, số trang bị loại bỏ và dung lượng hiện tại
+        """
+        with self._lock:
+            count = self._conn.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total > 0 else 0,
+                'revalidations': self.revalidations,
+                'evictions': self.evictions,
+                'entries': count,
+                'size_bytes': self._total_bytes
+            }
+
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+def get_page_cache():
+    """
+    Lấy page cache dùng chung cho toàn bộ ứng dụng
+
+    Returns:
+        PageCache: Cache dùng chung, None nếu cache bị tắt
+    """
+    global _page_cache
+    if not PAGE_CACHE_ENABLED:
+        return None
+
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = PageCache()
+            logger.info(f"Đã mở page cache tại {PAGE_CACHE_FILE}")
+        return _page_cache
@@ -77,10 +77,11 @@ class JobDetailCrawlerThread(QThread):
     finished_signal = pyqtSignal()
     error_signal = pyqtSignal(str)
     
-    def __init__(self, crawler_manager, links=None):
+    def __init__(self, crawler_manager, links=None, resume=False):
         super().__init__()
         self.crawler_manager = crawler_manager
         self.links = links
+        self.resume = resume
     
     def run(self):
         try:
@@ -99,7 +100,7 @@ class JobDetailCrawlerThread(QThread):
             )
             
             # Crawl chi tiết
-            self.crawler_manager.crawl_job_details(self.links)
+            self.crawler_manager.crawl_job_details(self.links, resume=self.resume)
             
             # Phát tín hiệu khi hoàn thành
             self.finished_signal.emit()
@@ -307,6 +308,10 @@ class JobSearchTab(QWidget):
         self.pause_links_button.setEnabled(False)
         button_layout.addWidget(self.pause_links_button)
         
+        self.cancel_links_button = QPushButton("Hủy Crawl Link")
+        self.cancel_links_button.setEnabled(False)
+        button_layout.addWidget(self.cancel_links_button)
+        
         # Thanh tiến trình
         step1_layout.addWidget(QLabel("Tiến trình crawl link:"))
         self.links_progress_bar = QProgressBar()
@@ -331,6 +336,13 @@ class JobSearchTab(QWidget):
         self.pause_details_button.setEnabled(False)
         button_layout2.addWidget(self.pause_details_button)
         
+        self.cancel_details_button = QPushButton("Hủy Crawl Chi Tiết")
+        self.cancel_details_button.setEnabled(False)
+        button_layout2.addWidget(self.cancel_details_button)
+        
+        self.resume_details_checkbox = QCheckBox("Tiếp tục từ lần crawl trước")
+        button_layout2.addWidget(self.resume_details_checkbox)
+        
         # Thanh tiến trình
         step2_layout.addWidget(QLabel("Tiến trình crawl chi tiết:"))
         self.details_progress_bar = QProgressBar()
@@ -445,8 +457,10 @@ class JobSearchTab(QWidget):
         # Kết nối tín hiệu cho nút
         self.crawl_links_button.clicked.connect(self.start_crawl_links)
         self.pause_links_button.clicked.connect(self.toggle_pause_links)
+        self.cancel_links_button.clicked.connect(self.cancel_crawl_links)
         self.crawl_details_button.clicked.connect(self.start_crawl_details)
         self.pause_details_button.clicked.connect(self.toggle_pause_details)
+        self.cancel_details_button.clicked.connect(self.cancel_crawl_details)
         self.export_csv_button.clicked.connect(self.export_csv)
         
         # Kết nối tín hiệu cho bảng
@@ -545,6 +559,7 @@ class JobSearchTab(QWidget):
         self.crawl_links_button.setEnabled(False)
         self.pause_links_button.setEnabled(True)
         self.pause_links_button.setText("Tạm Dừng Crawl Link")
+        self.cancel_links_button.setEnabled(True)
         
         # Phát tín hiệu trạng thái
         mode_text = "thông minh (OpenAI Deep Search)" if self.deep_search_radio.isChecked() else "truyền thống"
@@ -582,6 +597,18 @@ class JobSearchTab(QWidget):
             self.pause_links_button.setText("Tạm Dừng Crawl Link")
             self.status_message.emit("Đang crawl link tuyển dụng...")
     
+    def cancel_crawl_links(self):
+        """
+        Hủy crawl link, giữ lại các link đã tìm được
+        """
+        if not self.link_crawling:
+            return
+        
+        self.crawler_manager.cancel_crawling()
+        self.pause_links_button.setEnabled(False)
+        self.cancel_links_button.setEnabled(False)
+        self.status_message.emit("Đang hủy crawl link tuyển dụng...")
+    
     def update_links_progress(self, value):
         """
         Cập nhật thanh tiến trình crawl link
@@ -622,6 +649,7 @@ class JobSearchTab(QWidget):
         self.link_crawling = False
         self.crawl_links_button.setEnabled(True)
         self.pause_links_button.setEnabled(False)
+        self.cancel_links_button.setEnabled(False)
         self.crawl_details_button.setEnabled(True)
         
         # Cập nhật thanh tiến trình
@@ -655,13 +683,14 @@ class JobSearchTab(QWidget):
         self.crawl_details_button.setEnabled(False)
         self.pause_details_button.setEnabled(True)
         self.pause_details_button.setText("Tạm Dừng Crawl Chi Tiết")
+        self.cancel_details_button.setEnabled(True)
         
         # Phát tín hiệu trạng thái
         self.status_message.emit("Đang crawl dữ liệu chi tiết...")
         
         # Tạo thread để crawl
         self.detail_crawler_thread = JobDetailCrawlerThread(
-            self.crawler_manager, self.job_links
+            self.crawler_manager, self.job_links, self.resume_details_checkbox.isChecked()
         )
         
         # Kết nối tín hiệu
@@ -691,6 +720,18 @@ class JobSearchTab(QWidget):
             self.pause_details_button.setText("Tạm Dừng Crawl Chi Tiết")
             self.status_message.emit("Đang crawl dữ liệu chi tiết...")
     
+    def cancel_crawl_details(self):
+        """
+        Hủy crawl chi tiết, lưu lại các kết quả đã crawl được
+        """
+        if not self.detail_crawling:
+            return
+        
+        self.crawler_manager.cancel_crawling()
+        self.pause_details_button.setEnabled(False)
+        self.cancel_details_button.setEnabled(False)
+        self.status_message.emit("Đang hủy crawl dữ liệu chi tiết, lưu kết quả đã có...")
+    
     def update_details_progress(self, value):
         """
         Cập nhật thanh tiến trình crawl chi tiết
@@ -740,6 +781,7 @@ class JobSearchTab(QWidget):
         self.detail_crawling = False
         self.crawl_details_button.setEnabled(True)
         self.pause_details_button.setEnabled(False)
+        self.cancel_details_button.setEnabled(False)
         self.export_csv_button.setEnabled(True)
         
         # Cập nhật thanh tiến trình
@@ -821,11 +863,13 @@ class JobSearchTab(QWidget):
             self.link_crawling = False
             self.crawl_links_button.setEnabled(True)
             self.pause_links_button.setEnabled(False)
+            self.cancel_links_button.setEnabled(False)
         
         if self.detail_crawling:
             self.detail_crawling = False
             self.crawl_details_button.setEnabled(True)
             self.pause_details_button.setEnabled(False)
+            self.cancel_details_button.setEnabled(False)
         
         # Phát tín hiệu trạng thái
         self.status_message.emit(f"Lỗi: {error_message}")
@@ -0,0 +1,428 @@
+"""
+Bulk extraction - Trích xuất hàng loạt qua OpenAI Batch API (hoặc bản giả lập bằng file)
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+import openai
+from app.utils.config import (
+    OPENAI_API_KEY, OPENAI_EXTRACT_MODEL, OPENAI_EXTRACT_MAX_CHARS, JOB_DETAIL_FIELDS,
+    BULK_EXTRACT_BACKEND, BULK_EXTRACT_DIR, BULK_POLL_INTERVAL, BULK_MAX_REQUESTS
+)
+from app.utils.openai_helper import (
+    EXTRACT_PROMPT_VERSION, build_extraction_request, parse_job_info, get_extract_cache
+)
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+# Endpoint của mỗi dòng request và thời hạn xử lý của batch
+BATCH_ENDPOINT = '/v1/chat/completions'
+BATCH_COMPLETION_WINDOW = '24h'
+# Trạng thái kết thúc của một batch
+BATCH_FINAL_STATES = ('completed', 'failed', 'expired', 'cancelled')
+
+class OpenAIBatchBackend:
+    """
+    Gửi file request lên OpenAI Batch API
+
+    Thư viện openai đang dùng (1.3.0) chưa có `client.batches`, nên các endpoint
+    /batches được gọi qua client.post/get chung của thư viện.
+    """
+
+    def __init__(self):
+        """
+        Khởi tạo client OpenAI
+        """
+        self.client = openai.OpenAI(api_key=OPENAI_API_KEY)
+
+    def submit(self, input_path):
+        """
+        Tải file request lên và tạo batch
+
+        Args:
+            input_path (str): File JSONL, mỗi dòng một request
+
+        Returns:
+            str: ID của batch
+        """
+        with open(input_path, 'rb') as input_file:
+            uploaded = self.client.files.create(file=input_file, purpose='batch')
+        batch = self.client.post('/batches', cast_to=dict, body={
+            'input_file_id': uploaded.id,
+            'endpoint': BATCH_ENDPOINT,
+            'completion_window': BATCH_COMPLETION_WINDOW
+        })
+        return batch['id']
+
+    def retrieve(self, batch_id):
+        """
+        Lấy trạng thái batch
+
+        Args:
+            batch_id (str): ID của batch
+
+        Returns:
+            dict: Đối tượng batch ('status', 'output_file_id', 'error_file_id', 'request_counts'...)
+        """
+        return self.client.get(f'/batches/{batch_id}', cast_to=dict)
+
+    def download(self, file_id):
+        """
+        Tải nội dung file kết quả
+
+        Args:
+            file_id (str): ID của file
+
+        Returns:
+            str: Nội dung JSONL
+        """
+        return self.client.files.content(file_id).text
+
+    def cancel(self, batch_id):
+        """
+        Hủy batch đang chạy
+
+        Args:
+            batch_id (str): ID của batch
+        """
+        self.client.post(f'/batches/{batch_id}/cancel', cast_to=dict)
+
+class LocalBatchBackend:
+    """
+    Bản giả lập Batch API bằng file để chạy thử chế độ bulk mà không cần mạng
+
+    Mỗi batch là một thư mục con của `root` chứa file request, trạng thái và
+    file kết quả cùng định dạng với OpenAI. Batch được "xử lý" ở lần kiểm tra
+    trạng thái đầu tiên: mỗi request được trả lời bằng `responder`.
+    """
+
+    def __init__(self, root=None, responder=None):
+        """
+        Khởi tạo backend
+
+        Args:
+            root (str, optional): Thư mục chứa các batch, mặc định BULK_EXTRACT_DIR/local
+            responder (function, optional): Nhận body của request (dict), trả về nội dung
+                                            trả lời (str). Mặc định trả về JSON có các
+                                            trường rỗng
+        """
+        self.root = root or os.path.join(BULK_EXTRACT_DIR, 'local')
+        self.responder = responder or self._empty_response
+
+    @staticmethod
+    def _empty_response(body):
+        """
+        Trả lời mặc định: mọi trường việc làm đều để trống
+        """
+        return json.dumps({field: "" for field in JOB_DETAIL_FIELDS}, ensure_ascii=False)
+
+    def _path(self, batch_id, name):
+        """
+        Đường dẫn một file của batch
+        """
+        return os.path.join(self.root, batch_id, name)
+
+    def _write_state(self, batch_id, state):
+        """
+        Ghi trạng thái batch
+        """
+        with open(self._path(batch_id, 'batch.json'), 'w', encoding='utf-8') as state_file:
+            json.dump(state, state_file)
+
+    def submit(self, input_path):
+        """
+        Sao chép file request vào thư mục của batch mới (xem OpenAIBatchBackend.submit)
+        """
+        batch_id = f"batch_local_{uuid.uuid4().hex[:12]}"
+        os.makedirs(os.path.join(self.root, batch_id), exist_ok=True)
+        shutil.copyfile(input_path, self._path(batch_id, 'input.jsonl'))
+        self._write_state(batch_id, {
+            'id': batch_id, 'status': 'validating', 'output_file_id': None, 'error_file_id': None,
+            'request_counts': {}
+        })
+        return batch_id
+
+    def retrieve(self, batch_id):
+        """
+        Lấy trạng thái batch, xử lý toàn bộ request ở lần gọi đầu tiên
+        (xem OpenAIBatchBackend.retrieve)
+        """
+        with open(self._path(batch_id, 'batch.json'), encoding='utf-8') as state_file:
+            state = json.load(state_file)
+        if state['status'] in BATCH_FINAL_STATES:
+            return state
+
+        completed = failed = 0
+        output_path = self._path(batch_id, 'output.jsonl')
+        with open(self._path(batch_id, 'input.jsonl'), encoding='utf-8') as input_file, \
+                open(output_path, 'w', encoding='utf-8') as output_file:
+            for line in input_file:
+                request = json.loads(line)
+                try:
+                    content = self.responder(request['body'])
+                    response = {'status_code': 200, 'body': {
+                        'model': request['body'].get('model'),
+                        'choices': [{'index': 0, 'finish_reason': 'stop',
+                                     'message': {'role': 'assistant', 'content': content}}]
+                    }}
+                    error = None
+                    completed += 1
+                except Exception as e:
+                    response = None
+                    error = {'code': 'local_error', 'message': str(e)}
+                    failed += 1
+                output_file.write(json.dumps({
+                    'id': f"batch_req_{uuid.uuid4().hex[:12]}",
+                    'custom_id': request['custom_id'],
+                    'response': response,
+                    'error': error
+                }, ensure_ascii=False) + '\n')
+
+        state.update({
+            'status': 'completed',
+            'output_file_id': output_path,
+            'request_counts': {'total': completed + failed, 'completed': completed, 'failed': failed}
+        })
+        self._write_state(batch_id, state)
+        return state
+
+    def download(self, file_id):
+        """
+        Đọc file kết quả, file_id là đường dẫn file (xem OpenAIBatchBackend.download)
+        """
+        with open(file_id, encoding='utf-8') as output_file:
+            return output_file.read()
+
+    def cancel(self, batch_id):
+        """
+        Đánh dấu batch chưa xử lý là đã hủy (xem OpenAIBatchBackend.cancel)
+        """
+        state = self.retrieve(batch_id)
+        if state['status'] not in BATCH_FINAL_STATES:
+            state['status'] = 'cancelled'
+            self._write_state(batch_id, state)
+
+def get_batch_backend(name=BULK_EXTRACT_BACKEND):
+    """
+    Tạo backend Batch API theo cấu hình
+
+    Args:
+        name (str): 'openai' hoặc 'local'
+
+    Returns:
+        OpenAIBatchBackend | LocalBatchBackend: Backend tương ứng
+    """
+    if name == 'local':
+        return LocalBatchBackend()
+    return OpenAIBatchBackend()
+
+class BulkExtraction:
+    """
+    Một lượt trích xuất hàng loạt
+
+    Trong lúc crawl, mỗi trang cần OpenAI được ghi thành một dòng request JSONL
+    (mỗi file tối đa BULK_MAX_REQUESTS dòng) thay vì gọi API ngay. Sau khi crawl
+    xong, các file được gửi thành batch, chờ hoàn thành rồi kết quả được đọc ra
+    theo URL. Kết quả đã có trong LLM cache được trả về ngay, không tạo request.
+    """
+
+    def __init__(self, backend=None, work_dir=BULK_EXTRACT_DIR, max_requests=BULK_MAX_REQUESTS):
+        """
+        Khởi tạo lượt trích xuất và thư mục làm việc
+
+        Args:
+            backend (optional): Backend Batch API, mặc định theo BULK_EXTRACT_BACKEND
+            work_dir (str): Thư mục chứa file request và kết quả
+            max_requests (int): Số request tối đa trong một file
+        """
+        self.backend = backend or get_batch_backend()
+        self.max_requests = max_requests
+        self.job_dir = os.path.join(work_dir, time.strftime('%Y%m%d-%H%M%S') + f"-{uuid.uuid4().hex[:6]}")
+        os.makedirs(self.job_dir, exist_ok=True)
+
+        # custom_id -> {'url', 'fields', 'key'}
+        self.requests = {}
+        self.batch_ids = []
+        self._files = []
+        self._file = None
+        self._file_count = 0
+        self._pending_urls = set()
+        self._lock = threading.Lock()
+        self._cache = get_extract_cache()
+
+    def add(self, content, url, fields=None):
+        """
+        Ghi request trích xuất của một trang
+
+        Args:
+            content (str): Nội dung trang đã rút gọn
+            url (str): URL của trang việc làm
+            fields (list, optional): Chỉ trích xuất các trường này
+
+        Returns:
+            dict: Kết quả đã có trong LLM cache, None nếu trang được đưa vào batch
+        """
+        content = content[:OPENAI_EXTRACT_MAX_CHARS]
+        fields = fields or list(JOB_DETAIL_FIELDS)
+        variant = ','.join(fields)
+
+        key = None
+        if self._cache:
+            job_info = self._cache.get(content, EXTRACT_PROMPT_VERSION, OPENAI_EXTRACT_MODEL, variant)
+            if job_info is not None:
+                return job_info
+            key = self._cache.make_key(content, EXTRACT_PROMPT_VERSION, OPENAI_EXTRACT_MODEL, variant)
+
+        line = {
+            'method': 'POST',
+            'url': BATCH_ENDPOINT,
+            'body': build_extraction_request(content, url, fields)
+        }
+        with self._lock:
+            if self._file is None or self._file_count >= self.max_requests:
+                self._open_next_file()
+            custom_id = f"req-{len(self.requests)}"
+            self.requests[custom_id] = {'url': url, 'fields': fields, 'key': key}
+            self._pending_urls.add(url)
+            self._file.write(json.dumps({'custom_id': custom_id, **line}, ensure_ascii=False) + '\n')
+            self._file_count += 1
+        return None
+
+    def _open_next_file(self):
+        """
+        Đóng file request hiện tại và mở file mới (phải được gọi khi đang giữ lock)
+        """
+        if self._file:
+            self._file.close()
+        path = os.path.join(self.job_dir, f"requests-{len(self._files):03d}.jsonl")
+        self._files.append(path)
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file_count = 0
+
+    def is_pending(self, url):
+        """
+        Kiểm tra trang có đang chờ kết quả batch không
+
+        Args:
+            url (str): URL của trang việc làm
+
+        Returns:
+            bool: True nếu trang đã được đưa vào batch
+        """
+        return url in self._pending_urls
+
+    def submit(self):
+        """
+        Gửi tất cả file request thành batch
+
+        Returns:
+            list: ID của các batch
+        """
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+        for path in self._files:
+            batch_id = self.backend.submit(path)
+            self.batch_ids.append(batch_id)
+            logger.info(f"Đã gửi batch {batch_id} từ {path}")
+        return self.batch_ids
+
+    def wait(self, poll_interval=BULK_POLL_INTERVAL, cancel_event=None):
+        """
+        Chờ các batch kết thúc
+
+        Args:
+            poll_interval (float): Thời gian giữa hai lần kiểm tra trạng thái (giây)
+            cancel_event (threading.Event, optional): Khi được set, các batch còn
+                                                      chạy bị hủy và ngừng chờ
+
+        Returns:
+            dict: ID batch -> đối tượng batch ở lần kiểm tra cuối
+        """
+        states = {}
+        remaining = list(self.batch_ids)
+        while True:
+            for batch_id in list(remaining):
+                try:
+                    states[batch_id] = self.backend.retrieve(batch_id)
+                except Exception as e:
+                    # Lỗi tạm thời (mạng, 5xx) không được bỏ rơi batch đã gửi: thử lại ở lần kiểm tra sau
+                    logger.warning(f"Lỗi khi kiểm tra batch {batch_id}, thử lại sau {poll_interval}s: {e}")
+                    continue
+                if states[batch_id]['status'] in BATCH_FINAL_STATES:
+                    remaining.remove(batch_id)
+                    logger.info(
+                        f"Batch {batch_id} kết thúc với trạng thái {states[batch_id]['status']}, "
+                        f"{states[batch_id].get('request_counts')}"
+                    )
+            if not remaining:
+                return states
+
+            if cancel_event is not None and cancel_event.wait(poll_interval):
+                for batch_id in remaining:
+                    try:
+                        self.backend.cancel(batch_id)
+                    except Exception as e:
+                        logger.error(f"Lỗi khi hủy batch {batch_id}: {e}")
+                logger.info(f"Đã hủy {len(remaining)} batch đang chạy")
+                return states
+            if cancel_event is None:
+                time.sleep(poll_interval)
+
+    def results(self, states):
+        """
+        Đọc kết quả của các batch đã kết thúc
+
+        Batch hết hạn hoặc bị hủy vẫn có thể có kết quả cho một phần request.
+
+        Args:
+            states (dict): Kết quả của wait()
+
+        Returns:
+            dict: URL -> thông tin chi tiết việc làm (chỉ các request thành công)
+        """
+        results = {}
+        for batch_id, state in states.items():
+            if not state.get('output_file_id'):
+                continue
+            for line in self.backend.download(state['output_file_id']).splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                request = self.requests.get(item.get('custom_id'))
+                response = item.get('response') or {}
+                if request is None or item.get('error') or response.get('status_code') != 200:
+                    continue
+
+                job_info = parse_job_info(response['body']['choices'][0]['message']['content'])
+                if 'error' in job_info:
+                    continue
+                results[request['url']] = job_info
+                if self._cache and request['key']:
+                    self._cache.put_key(request['key'], EXTRACT_PROMPT_VERSION, OPENAI_EXTRACT_MODEL, job_info)
+
+        logger.info(f"Đã nhận kết quả bulk cho {len(results)}/{len(self.requests)} trang")
+        return results
+
+    def run(self, poll_interval=BULK_POLL_INTERVAL, cancel_event=None):
+        """
+        Gửi batch, chờ hoàn thành và đọc kết quả
+
+        Args:
+            poll_interval (float): Thời gian giữa hai lần kiểm tra trạng thái (giây)
+            cancel_event (threading.Event, optional): Sự kiện hủy
+
+        Returns:
+            dict: URL -> thông tin chi tiết việc làm
+        """
+        if not self.requests:
+            return {}
+        self.submit()
+        return self.results(self.wait(poll_interval, cancel_event))
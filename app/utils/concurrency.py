@@ -0,0 +1,301 @@
+"""
+Adaptive concurrency - Tự điều chỉnh số request đồng thời cho từng đích (AIMD)
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from app.utils.config import (
+    ADAPTIVE_CONCURRENCY, MAX_THREADS, CONCURRENCY_MIN, CONCURRENCY_MAX, CONCURRENCY_LATENCY_FACTOR
+)
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+class AdaptiveLimit:
+    """
+    Giới hạn số request đồng thời của một đích (một host hoặc OpenAI)
+
+    Tăng cộng (khoảng +1 sau mỗi `limit` request thành công) khi đích phản hồi
+    tốt, giảm nhân (x0.5) khi gặp 429/5xx/timeout hoặc khi độ trễ vượt quá
+    `latency_factor` lần độ trễ nền. Mỗi chu kỳ độ trễ chỉ giảm một lần để một
+    loạt lỗi của các request đang chạy không kéo giới hạn về tối thiểu ngay.
+    """
+
+    OK = 'ok'
+    OVERLOADED = 'overloaded'
+    ERROR = 'error'
+
+    def __init__(self, name, initial, minimum=CONCURRENCY_MIN, maximum=CONCURRENCY_MAX,
+                 latency_factor=CONCURRENCY_LATENCY_FACTOR, adaptive=True):
+        """
+        Khởi tạo giới hạn
+
+        Args:
+            name (str): Tên đích
+            initial (int): Số request đồng thời ban đầu
+            minimum (int): Giới hạn dưới
+            maximum (int): Giới hạn trên
+            latency_factor (float): Độ trễ vượt quá bao nhiêu lần độ trễ nền thì coi là quá tải
+            adaptive (bool): False để giữ cố định giới hạn ban đầu
+        """
+        self.name = name
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.latency_factor = latency_factor
+        self.adaptive = adaptive
+
+        self.in_flight = 0
+        self.latency = None
+        self.baseline = None
+        self.successes = 0
+        self.overloads = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        # Các coroutine đang chờ chỗ: (event loop, future), được đánh thức từ release
+        self._async_waiters = deque()
+
+    def acquire(self):
+        """
+        Chờ (chặn thread hiện tại) cho tới khi có chỗ
+        """
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    async def acquire_async(self):
+        """
+        Chờ (không chặn event loop) cho tới khi có chỗ
+
+        Coroutine chờ trên một future được release đánh thức ngay khi có chỗ
+        trống hoặc giới hạn thay đổi, kể cả khi release chạy ở thread khác.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                waiter = (loop, loop.create_future())
+                self._async_waiters.append(waiter)
+            try:
+                await waiter[1]
+            finally:
+                with self._cond:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+
+    @staticmethod
+    def _wake(future):
+        """
+        Đánh thức một coroutine đang chờ (chạy trên event loop của nó)
+        """
+        if not future.done():
+            future.set_result(None)
+
+    def _wake_async_waiters(self):
+        """
+        Đánh thức mọi coroutine đang chờ để chúng thử lấy chỗ lại (phải được gọi khi đang giữ lock)
+        """
+        while self._async_waiters:
+            loop, future = self._async_waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(self._wake, future)
+            except RuntimeError:
+                # Event loop của coroutine đã đóng
+                pass
+
+    def release(self, latency, outcome):
+        """
+        Trả chỗ và cập nhật giới hạn theo kết quả request
+
+        Args:
+            latency (float): Thời gian xử lý request (giây)
+            outcome (str): AdaptiveLimit.OK, OVERLOADED hoặc ERROR (lỗi không do quá tải)
+        """
+        with self._cond:
+            self.in_flight -= 1
+            old_limit = int(self.limit)
+
+            if outcome == self.OK:
+                self.successes += 1
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+                # Độ trễ nền: giảm ngay theo giá trị nhỏ nhất, tăng chậm khi đích chậm đi lâu dài
+                if self.baseline is None or latency < self.baseline:
+                    self.baseline = latency
+                else:
+                    self.baseline += 0.01 * (latency - self.baseline)
+
+                if self.adaptive:
+                    if latency > self.latency_factor * self.baseline:
+                        self._decrease()
+                    else:
+                        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            elif outcome == self.OVERLOADED:
+                self.overloads += 1
+                if self.adaptive:
+                    self._decrease()
+
+            if int(self.limit) != old_limit:
+                logger.info(f"Giới hạn đồng thời của {self.name}: {old_limit} -> {int(self.limit)}")
+            self._cond.notify_all()
+            self._wake_async_waiters()
+
+    def _decrease(self):
+        """
+        Giảm nhân giới hạn, tối đa một lần mỗi chu kỳ độ trễ (phải được gọi khi đang giữ lock)
+        """
+        now = time.monotonic()
+        if now - self._last_decrease < max(self.latency or 0.0, 1.0):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.minimum), self.limit * 0.5)
+
+    def snapshot(self):
+        """
+        Trạng thái hiện tại của giới hạn
+
+        Returns:
+            dict: limit, in_flight, latency_ms, baseline_ms, successes, overloads
+        """
+        with self._cond:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'latency_ms': round(self.latency * 1000) if self.latency is not None else None,
+                'baseline_ms': round(self.baseline * 1000) if self.baseline is not None else None,
+                'successes': self.successes,
+                'overloads': self.overloads
+            }
+
+class ConcurrencySlot:
+    """
+    Một chỗ request của AdaptiveLimit, dùng với `with` hoặc `async with`
+
+    Độ trễ được đo từ lúc có chỗ tới lúc thoát khối. Exception thuộc
+    `overload_errors` hoặc mã trạng thái 429/5xx (qua `record_status`) được
+    tính là quá tải; các exception khác không làm thay đổi giới hạn.
+    """
+
+    def __init__(self, limit, overload_errors=()):
+        self.limit = limit
+        self.overload_errors = overload_errors
+        self.overloaded = False
+        self._started = None
+
+    def record_status(self, status_code):
+        """
+        Ghi nhận mã trạng thái HTTP của response
+
+        Args:
+            status_code (int): Mã trạng thái HTTP
+        """
+        if status_code == 429 or status_code >= 500:
+            self.overloaded = True
+
+    def _finish(self, exc_type):
+        latency = time.monotonic() - self._started
+        if self.overloaded or (exc_type and issubclass(exc_type, self.overload_errors)):
+            outcome = AdaptiveLimit.OVERLOADED
+        elif exc_type:
+            outcome = AdaptiveLimit.ERROR
+        else:
+            outcome = AdaptiveLimit.OK
+        self.limit.release(latency, outcome)
+
+    def __enter__(self):
+        self.limit.acquire()
+        self._started = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._finish(exc_type)
+        return False
+
+    async def __aenter__(self):
+        await self.limit.acquire_async()
+        self._started = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._finish(exc_type)
+        return False
+
+class ConcurrencyController:
+    """
+    Tập hợp AdaptiveLimit dùng chung, mỗi đích một giới hạn
+    """
+
+    def __init__(self, initial=MAX_THREADS, adaptive=ADAPTIVE_CONCURRENCY):
+        """
+        Khởi tạo controller
+
+        Args:
+            initial (int): Số request đồng thời ban đầu mặc định cho mỗi đích
+            adaptive (bool): False để dùng giới hạn cố định
+        """
+        self.initial = initial
+        self.adaptive = adaptive
+        self._limits = {}
+        self._overrides = {}
+        self._lock = threading.Lock()
+
+    def configure(self, target, **settings):
+        """
+        Thiết lập riêng cho một đích (initial, minimum, maximum, latency_factor)
+
+        Args:
+            target (str): Tên đích, ví dụ host hoặc 'openai'
+        """
+        with self._lock:
+            self._overrides[target] = settings
+            self._limits.pop(target, None)
+
+    def limit_for(self, target):
+        """
+        Lấy giới hạn của một đích
+
+        Args:
+            target (str): Tên đích
+
+        Returns:
+            AdaptiveLimit: Giới hạn dùng chung của đích
+        """
+        with self._lock:
+            limit = self._limits.get(target)
+            if limit is None:
+                settings = {'initial': self.initial, 'adaptive': self.adaptive}
+                settings.update(self._overrides.get(target, {}))
+                limit = AdaptiveLimit(target, **settings)
+                self._limits[target] = limit
+            return limit
+
+    def slot(self, target, overload_errors=()):
+        """
+        Tạo một chỗ request cho đích
+
+        Args:
+            target (str): Tên đích
+            overload_errors (tuple): Các loại exception được tính là quá tải
+
+        Returns:
+            ConcurrencySlot: Dùng với `with` hoặc `async with`
+        """
+        return ConcurrencySlot(self.limit_for(target), overload_errors)
+
+    def limits(self):
+        """
+        Xuất giới hạn hiện tại của mọi đích
+
+        Returns:
+            dict: Tên đích -> AdaptiveLimit.snapshot()
+        """
+        with self._lock:
+            limits = dict(self._limits)
+        return {target: limit.snapshot() for target, limit in limits.items()}
+
+# Controller dùng chung cho toàn bộ ứng dụng
+concurrency_controller = ConcurrencyController()
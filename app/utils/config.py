@@ -10,6 +10,29 @@ load_dotenv()
 
 # OpenAI API configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+OPENAI_EXTRACT_MODEL = os.getenv('OPENAI_EXTRACT_MODEL', 'gpt-3.5-turbo-16k')
+# Số ký tự nội dung tối đa gửi cho OpenAI khi trích xuất thông tin việc làm
+OPENAI_EXTRACT_MAX_CHARS = int(os.getenv('OPENAI_EXTRACT_MAX_CHARS', 30000))
+# Giới hạn token của model (0 = tự xác định theo tên model)
+OPENAI_CONTEXT_TOKENS = int(os.getenv('OPENAI_CONTEXT_TOKENS', 0))
+OPENAI_OUTPUT_TOKENS = int(os.getenv('OPENAI_OUTPUT_TOKENS', 0))
+# Số ký tự trung bình trên một token, dùng để ước lượng kích thước request
+OPENAI_CHARS_PER_TOKEN = float(os.getenv('OPENAI_CHARS_PER_TOKEN', 3.0))
+
+# Trích xuất nhiều trang việc làm trong một request OpenAI
+OPENAI_BATCH_EXTRACT = os.getenv('OPENAI_BATCH_EXTRACT', 'false').lower() in ('1', 'true', 'yes')
+OPENAI_BATCH_MAX_PAGES = int(os.getenv('OPENAI_BATCH_MAX_PAGES', 8))
+# Thời gian chờ tối đa (giây) để gom thêm trang trước khi gửi một batch chưa đầy
+OPENAI_BATCH_MAX_WAIT = float(os.getenv('OPENAI_BATCH_MAX_WAIT', 0.5))
+# Số token kết quả dự trù cho mỗi trang trong batch
+OPENAI_BATCH_OUTPUT_TOKENS_PER_PAGE = int(os.getenv('OPENAI_BATCH_OUTPUT_TOKENS_PER_PAGE', 700))
+
+# Trích xuất hàng loạt (bulk) qua OpenAI Batch API: 'openai' hoặc 'local' (giả lập bằng file, chạy offline)
+BULK_EXTRACT_BACKEND = os.getenv('BULK_EXTRACT_BACKEND', 'openai')
+# Thời gian (giây) giữa hai lần kiểm tra trạng thái batch
+BULK_POLL_INTERVAL = float(os.getenv('BULK_POLL_INTERVAL', 60.0))
+# Số request tối đa trong một file batch (giới hạn của Batch API là 50000)
+BULK_MAX_REQUESTS = int(os.getenv('BULK_MAX_REQUESTS', 50000))
 
 # Google Maps API configuration
 GOOGLE_MAPS_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY')
@@ -19,6 +42,88 @@ MAX_THREADS = int(os.getenv('MAX_THREADS', 5))
 TIMEOUT = int(os.getenv('TIMEOUT', 30))
 USER_AGENT = os.getenv('USER_AGENT', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
 
+# Số trang kết quả tối đa được tải cho mỗi từ khóa khi tìm kiếm truyền thống
+SEARCH_MAX_PAGES = int(os.getenv('SEARCH_MAX_PAGES', 10))
+
+# Loại bỏ link trùng: 'set' (chính xác) hoặc 'bloom' (bộ nhớ cố định cho crawl rất lớn)
+DEDUP_BACKEND = os.getenv('DEDUP_BACKEND', 'set')
+DEDUP_BLOOM_CAPACITY = int(os.getenv('DEDUP_BLOOM_CAPACITY', 1000000))
+DEDUP_BLOOM_ERROR_RATE = float(os.getenv('DEDUP_BLOOM_ERROR_RATE', 0.001))
+
+# Số link tối đa chờ trong hàng đợi giữa bước tìm link và crawl chi tiết (chế độ pipeline)
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', 100))
+
+# Async fetch engine configuration
+ASYNC_FETCH = os.getenv('ASYNC_FETCH', 'false').lower() in ('1', 'true', 'yes')
+ASYNC_MAX_CONCURRENCY = int(os.getenv('ASYNC_MAX_CONCURRENCY', 200))
+
+# Adaptive concurrency (AIMD) theo từng host và cho OpenAI, MAX_THREADS là giá trị ban đầu
+ADAPTIVE_CONCURRENCY = os.getenv('ADAPTIVE_CONCURRENCY', 'true').lower() in ('1', 'true', 'yes')
+CONCURRENCY_MIN = int(os.getenv('CONCURRENCY_MIN', 1))
+CONCURRENCY_MAX = int(os.getenv('CONCURRENCY_MAX', 32))
+# Độ trễ vượt quá bao nhiêu lần độ trễ nền thì coi là host đang quá tải
+CONCURRENCY_LATENCY_FACTOR = float(os.getenv('CONCURRENCY_LATENCY_FACTOR', 3.0))
+OPENAI_MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', MAX_THREADS))
+# Ngân sách OpenAI mỗi phút theo hạn mức của tài khoản (0 = không giới hạn)
+OPENAI_RPM = int(os.getenv('OPENAI_RPM', 0))
+OPENAI_TPM = int(os.getenv('OPENAI_TPM', 0))
+
+# Connection pool dùng chung của requests: số host giữ pool và số kết nối keep-alive mỗi host
+HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 20))
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', max(MAX_THREADS, CONCURRENCY_MAX)))
+
+# Thử lại request lỗi (kết nối, timeout, 5xx, 429) với exponential backoff
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 3))
+RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', 1.0))
+RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', 30.0))
+# Chờ lâu hơn mức này thì trả link về hàng đợi thay vì giữ worker
+RETRY_INLINE_MAX_DELAY = float(os.getenv('RETRY_INLINE_MAX_DELAY', 5.0))
+# Circuit breaker theo host
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', 60.0))
+
+# Per-host politeness (token bucket) configuration
+# HOST_RATE_LIMIT <= 0 tắt giới hạn tốc độ theo host
+HOST_RATE_LIMIT = float(os.getenv('HOST_RATE_LIMIT', 2.0))
+HOST_BURST = int(os.getenv('HOST_BURST', 5))
+HOST_JITTER = float(os.getenv('HOST_JITTER', 0.5))
+
+# Số process phân tích HTML và trích xuất cục bộ song song (0 = phân tích trong worker thread)
+PARSE_PROCESSES = int(os.getenv('PARSE_PROCESSES', 0))
+
+# HTML parser backend: 'lxml' (nhanh), 'html5lib' hoặc 'html.parser'
+HTML_PARSER = os.getenv('HTML_PARSER', 'lxml')
+
+# Page cache configuration
+PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+PAGE_CACHE_TTL = int(os.getenv('PAGE_CACHE_TTL', 6 * 3600))
+PAGE_CACHE_MAX_MB = int(os.getenv('PAGE_CACHE_MAX_MB', 512))
+# TTL riêng cho từng site, ví dụ: "VietnamWorks=21600,TopCV=3600"
+PAGE_CACHE_SITE_TTLS = {
+    site.strip(): int(ttl)
+    for site, ttl in (
+        item.split('=', 1) for item in os.getenv('PAGE_CACHE_SITE_TTLS', '').split(',') if '=' in item
+    )
+}
+
+# Bộ nhớ đệm kết quả trích xuất của OpenAI theo nội dung trang
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+# Crawl frontier configuration
+# Trọng số ưu tiên theo nguồn, ví dụ: "VietnamWorks=2,TopCV=1" (mặc định 1)
+FRONTIER_SOURCE_WEIGHTS = {
+    source.strip(): float(weight)
+    for source, weight in (
+        item.split('=', 1) for item in os.getenv('FRONTIER_SOURCE_WEIGHTS', '').split(',') if '=' in item
+    )
+}
+# Thời gian chờ tối đa (giây) giữa hai lần kiểm tra link đến hạn thử lại
+FRONTIER_POLL_INTERVAL = float(os.getenv('FRONTIER_POLL_INTERVAL', 1.0))
+# Số lần lấy ra tối đa của một link trước khi bị đánh dấu failed
+FRONTIER_MAX_ATTEMPTS = int(os.getenv('FRONTIER_MAX_ATTEMPTS', 10))
+# Số dòng của file link CSV được đọc và đưa vào frontier mỗi lần
+LINKS_CSV_CHUNK_SIZE = int(os.getenv('LINKS_CSV_CHUNK_SIZE', 1000))
+
 # Job websites to crawl from
 JOB_WEBSITES = [
     'VietnamWorks',
@@ -37,12 +142,48 @@ JOB_WEBSITES = [
 JOB_LINKS_FILE = 'app/data/job_link_list.csv'
 JOB_DETAILS_FILE = 'app/data/job_opportunities.csv'
 CV_OUTPUT_DIR = 'app/data/cv_output'
+PAGE_CACHE_FILE = 'app/data/page_cache.sqlite'
+LLM_CACHE_FILE = 'app/data/llm_cache.sqlite'
+BULK_EXTRACT_DIR = 'app/data/bulk'
+MODEL_CAPABILITIES_FILE = 'app/data/model_capabilities.json'
+JOB_DETAILS_JOURNAL_FILE = 'app/data/job_details_journal.jsonl'
+FRONTIER_FILE = 'app/data/crawl_frontier.sqlite'
 
 # Create necessary directories if they don't exist
 os.makedirs(os.path.dirname(JOB_LINKS_FILE), exist_ok=True)
 os.makedirs(os.path.dirname(JOB_DETAILS_FILE), exist_ok=True)
 os.makedirs(CV_OUTPUT_DIR, exist_ok=True)
 
+# Job detail fields (khóa trong kết quả trích xuất -> mô tả cho OpenAI)
+JOB_DETAIL_FIELDS = {
+    'job_title': 'Tiêu đề công việc',
+    'company_name': 'Tên công ty',
+    'company_address': 'Địa chỉ công ty',
+    'job_location': 'Địa điểm làm việc',
+    'salary_range': 'Mức lương (nếu có)',
+    'job_type': 'Loại công việc (toàn thời gian, bán thời gian, v.v.)',
+    'work_mode': 'Hình thức làm việc (tại văn phòng, từ xa, hybrid)',
+    'required_skills': 'Kỹ năng yêu cầu (liệt kê)',
+    'experience_level': 'Mức kinh nghiệm',
+    'education_requirements': 'Yêu cầu học vấn',
+    'brief_job_description': 'Mô tả công việc ngắn gọn',
+    'job_benefits': 'Lợi ích công việc',
+    'application_deadline': 'Hạn nộp hồ sơ',
+    'language_requirement': 'Yêu cầu ngôn ngữ',
+    'contact_email': 'Email liên hệ (nếu có)',
+    'contact_person': 'Người liên hệ (nếu có)'
+}
+
+# Các trường bắt buộc: chỉ gọi OpenAI khi trích xuất cục bộ thiếu một trong các trường này
+# (khi bỏ qua OpenAI, các trường không bắt buộc mà trang không có được để trống)
+JOB_DETAIL_REQUIRED_FIELDS = [
+    field.strip()
+    for field in os.getenv(
+        'JOB_DETAIL_REQUIRED_FIELDS', 'job_title,company_name,job_location,brief_job_description'
+    ).split(',')
+    if field.strip()
+]
+
 # Experience levels
 EXPERIENCE_LEVELS = [
     'Không yêu cầu kinh nghiệm',
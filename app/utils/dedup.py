@@ -0,0 +1,106 @@
+"""
+URL deduplication - Loại bỏ link việc làm trùng lặp giữa các từ khóa và trang web
+"""
+import hashlib
+import math
+import threading
+from app.utils.config import DEDUP_BACKEND, DEDUP_BLOOM_CAPACITY, DEDUP_BLOOM_ERROR_RATE
+from app.utils.url_utils import dedup_key
+
+class BloomFilter:
+    """
+    Bloom filter dùng bộ nhớ cố định cho các lượt crawl rất lớn
+
+    Có thể báo nhầm một khóa mới là đã thấy với xác suất `error_rate`
+    (khi số khóa không vượt quá `capacity`), nhưng không bao giờ bỏ sót.
+    """
+
+    def __init__(self, capacity, error_rate):
+        """
+        Khởi tạo bloom filter
+
+        Args:
+            capacity (int): Số khóa dự kiến
+            error_rate (float): Tỷ lệ báo nhầm chấp nhận được
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        """
+        Tính các vị trí bit của khóa bằng double hashing
+        """
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def add(self, key):
+        """
+        Thêm khóa vào bloom filter
+
+        Args:
+            key (str): Khóa cần thêm
+
+        Returns:
+            bool: True nếu khóa chưa từng được thêm
+        """
+        is_new = False
+        for pos in self._positions(key):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                is_new = True
+        return is_new
+
+class UrlDeduplicator:
+    """
+    Tập URL việc làm đã thấy, dùng chung giữa các thread crawl
+    """
+
+    def __init__(self, backend=DEDUP_BACKEND, capacity=DEDUP_BLOOM_CAPACITY,
+                 error_rate=DEDUP_BLOOM_ERROR_RATE):
+        """
+        Khởi tạo bộ loại trùng
+
+        Args:
+            backend (str): 'set' (chính xác) hoặc 'bloom' (bộ nhớ cố định)
+            capacity (int): Số URL dự kiến khi dùng bloom filter
+            error_rate (float): Tỷ lệ báo nhầm khi dùng bloom filter
+        """
+        if backend == 'bloom':
+            self._seen = BloomFilter(capacity, error_rate)
+        else:
+            self._seen = set()
+        self.backend = backend
+        self.unique = 0
+        self.duplicates = 0
+        self._lock = threading.Lock()
+
+    def add(self, url):
+        """
+        Ghi nhận một URL
+
+        Args:
+            url (str): URL việc làm
+
+        Returns:
+            bool: True nếu URL chưa từng thấy (cần crawl), False nếu trùng
+        """
+        key = dedup_key(url)
+        with self._lock:
+            if isinstance(self._seen, set):
+                is_new = key not in self._seen
+                self._seen.add(key)
+            else:
+                is_new = self._seen.add(key)
+
+            if is_new:
+                self.unique += 1
+            else:
+                self.duplicates += 1
+            return is_new
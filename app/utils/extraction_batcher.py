@@ -0,0 +1,146 @@
+"""
+Extraction batcher - Gom các trang cần OpenAI trích xuất từ nhiều worker thành batch
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from app.utils.config import (
+    OPENAI_BATCH_EXTRACT, OPENAI_BATCH_MAX_PAGES, OPENAI_BATCH_MAX_WAIT, CONCURRENCY_MAX
+)
+from app.utils.openai_helper import extract_jobs_batch_with_openai, plan_extraction_batches
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+class ExtractionBatcher:
+    """
+    Gom trang từ các worker crawl chi tiết thành batch trích xuất
+
+    Mỗi worker gửi trang của mình rồi chờ kết quả như một lời gọi bình thường.
+    Các trang cần cùng danh sách trường được xếp chung hàng; một batch được gửi
+    ngay khi đã đầy (theo giới hạn token của model hoặc OPENAI_BATCH_MAX_PAGES),
+    hoặc khi trang chờ lâu nhất đã đợi quá `max_wait` giây.
+    """
+
+    def __init__(self, max_wait=OPENAI_BATCH_MAX_WAIT, max_pages=OPENAI_BATCH_MAX_PAGES):
+        """
+        Khởi tạo batcher và thread gửi batch
+
+        Args:
+            max_wait (float): Thời gian chờ tối đa để gom thêm trang (giây)
+            max_pages (int): Số trang tối đa trong một batch
+        """
+        self.max_wait = max_wait
+        self.max_pages = max_pages
+        # Danh sách trường -> [(trang, future, thời điểm gửi)]
+        self._pending = {}
+        self._cond = threading.Condition()
+        # Số batch chạy đồng thời do giới hạn adaptive concurrency của OpenAI quyết định
+        self._executor = ThreadPoolExecutor(max_workers=CONCURRENCY_MAX)
+        self._thread = threading.Thread(target=self._run, name='extraction-batcher', daemon=True)
+        self._thread.start()
+
+    def extract(self, content, url, fields=None):
+        """
+        Trích xuất một trang trong batch (chặn thread gọi tới khi có kết quả)
+
+        Args:
+            content (str): Nội dung trang đã rút gọn
+            url (str): URL của trang việc làm
+            fields (list, optional): Chỉ trích xuất các trường này
+
+        Returns:
+            dict: Thông tin chi tiết về việc làm
+        """
+        future = Future()
+        with self._cond:
+            self._pending.setdefault(tuple(fields or ()), []).append(
+                ({'url': url, 'content': content}, future, time.time())
+            )
+            self._cond.notify()
+        return future.result()
+
+    def _take_ready(self):
+        """
+        Lấy các batch đã sẵn sàng gửi (phải được gọi khi đang giữ lock)
+
+        Returns:
+            tuple: (danh sách (fields, batch), số giây tới lần kiểm tra kế tiếp hoặc None)
+        """
+        now = time.time()
+        ready = []
+        timeout = None
+        for key, items in list(self._pending.items()):
+            by_page = {id(item[0]): item for item in items}
+            batches = [
+                [by_page[id(page)] for page in batch]
+                for batch in plan_extraction_batches([item[0] for item in items], list(key) or None,
+                                                     max_pages=self.max_pages)
+            ]
+
+            # Các batch trước batch cuối đã đầy; batch cuối chờ thêm trang nếu chưa quá hạn
+            expired = now - items[0][2] >= self.max_wait
+            if not expired and len(batches[-1]) < self.max_pages:
+                waiting = batches.pop()
+                wait_for = items[0][2] + self.max_wait - now
+                timeout = wait_for if timeout is None else min(timeout, wait_for)
+            else:
+                waiting = []
+
+            for batch in batches:
+                ready.append((list(key) or None, batch))
+            if waiting:
+                self._pending[key] = waiting
+            else:
+                del self._pending[key]
+        return ready, timeout
+
+    def _run(self):
+        """
+        Vòng lặp gửi batch
+        """
+        while True:
+            with self._cond:
+                ready, timeout = self._take_ready()
+                if not ready:
+                    self._cond.wait(timeout)
+                    continue
+            for fields, batch in ready:
+                self._executor.submit(self._send, fields, batch)
+
+    @staticmethod
+    def _send(fields, batch):
+        """
+        Gửi một batch và trả kết quả cho các worker đang chờ
+        """
+        try:
+            results = extract_jobs_batch_with_openai([page for page, _, _ in batch], fields)
+        except Exception as e:
+            logger.error(f"Lỗi khi trích xuất batch: {e}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        for page, future, _ in batch:
+            future.set_result(results.get(page['url'], {}))
+
+_extraction_batcher = None
+_extraction_batcher_lock = threading.Lock()
+
+def get_extraction_batcher():
+    """
+    Lấy batcher dùng chung cho toàn bộ ứng dụng
+
+    Returns:
+        ExtractionBatcher: Batcher dùng chung, None nếu OPENAI_BATCH_EXTRACT tắt
+    """
+    global _extraction_batcher
+    if not OPENAI_BATCH_EXTRACT:
+        return None
+
+    with _extraction_batcher_lock:
+        if _extraction_batcher is None:
+            _extraction_batcher = ExtractionBatcher()
+            logger.info(f"Bật trích xuất theo batch, tối đa {OPENAI_BATCH_MAX_PAGES} trang mỗi request")
+        return _extraction_batcher
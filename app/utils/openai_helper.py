@@ -1,10 +1,21 @@
 """
 OpenAI API helper functions
 """
+import asyncio
 import openai
 import json
 import logging
-from app.utils.config import OPENAI_API_KEY
+import threading
+import weakref
+from app.utils.config import (
+    OPENAI_API_KEY, OPENAI_EXTRACT_MODEL, OPENAI_EXTRACT_MAX_CHARS, JOB_DETAIL_FIELDS,
+    OPENAI_MAX_CONCURRENCY, OPENAI_CONTEXT_TOKENS, OPENAI_OUTPUT_TOKENS, OPENAI_CHARS_PER_TOKEN,
+    OPENAI_BATCH_MAX_PAGES, OPENAI_BATCH_OUTPUT_TOKENS_PER_PAGE
+)
+from app.utils.concurrency import concurrency_controller
+from app.utils.token_budget import openai_budget
+from app.data.llm_cache import LLMCache, get_llm_cache
+from app.data.model_capabilities import CAPABILITIES, JSON_MODE, get_model_capabilities
 
 # Cấu hình OpenAI API
 openai.api_key = OPENAI_API_KEY
@@ -12,121 +23,758 @@ openai.api_key = OPENAI_API_KEY
 # Thiết lập logger
 logger = logging.getLogger(__name__)
 
-def extract_job_info_with_openai(html_content, url):
+# Số lời gọi OpenAI đồng thời được điều chỉnh riêng, giảm khi gặp lỗi rate limit
+OPENAI_CONCURRENCY_TARGET = 'openai'
+OPENAI_OVERLOAD_ERRORS = (
+    openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError
+)
+concurrency_controller.configure(OPENAI_CONCURRENCY_TARGET, initial=OPENAI_MAX_CONCURRENCY)
+
+# Thời gian tạm ngừng mặc định khi OpenAI trả về 429 mà không có header retry-after
+OPENAI_RATE_LIMIT_PAUSE = 2.0
+
+# AsyncOpenAI client theo event loop: connection pool của httpx gắn với loop đã tạo ra
+# nó, mỗi lượt crawl bất đồng bộ (asyncio.run) cần client riêng
+_async_clients = weakref.WeakKeyDictionary()
+_async_client_lock = threading.Lock()
+
+def get_async_client():
     """
-    Sử dụng OpenAI để trích xuất thông tin việc làm từ HTML
+    Lấy AsyncOpenAI client của event loop đang chạy (tạo khi cần)
+    
+    Returns:
+        openai.AsyncOpenAI: Client bất đồng bộ
+    """
+    loop = asyncio.get_running_loop()
+    with _async_client_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
+            _async_clients[loop] = client
+        return client
+
+async def close_async_client():
+    """
+    Đóng AsyncOpenAI client của event loop đang chạy, gọi khi lượt chạy kết thúc
+    """
+    with _async_client_lock:
+        client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+def estimate_request_tokens(kwargs):
+    """
+    Ước lượng số token một lời gọi chat completion tính vào hạn mức TPM
+    
+    OpenAI tính hạn mức theo token của prompt cộng max_tokens của lời gọi.
     
     Args:
-        html_content (str): Nội dung HTML của trang việc làm
-        url (str): URL của trang việc làm
+        kwargs (dict): Tham số của openai.chat.completions.create
         
     Returns:
-        dict: Thông tin chi tiết về việc làm
+        int: Số token ước lượng
+    """
+    # Mỗi message tốn thêm vài token cho role và phân tách
+    prompt_tokens = sum(estimate_tokens(message.get('content') or '') + 4 for message in kwargs.get('messages', []))
+    return prompt_tokens + kwargs.get('max_tokens', DEFAULT_TOKEN_LIMITS[1])
+
+def _rate_limit_pause(error):
+    """
+    Số giây tạm ngừng gửi lời gọi sau lỗi 429, theo header retry-after nếu có
+    
+    Args:
+        error (openai.RateLimitError): Lỗi rate limit
+        
+    Returns:
+        float: Số giây tạm ngừng
+    """
+    response = getattr(error, 'response', None)
+    if response is not None:
+        try:
+            return max(float(response.headers.get('retry-after')), 0.0)
+        except (TypeError, ValueError):
+            pass
+    return OPENAI_RATE_LIMIT_PAUSE
+
+def _used_tokens(response):
+    """
+    Số token thực tế của một response, None nếu OpenAI không báo
+    """
+    usage = getattr(response, 'usage', None)
+    return getattr(usage, 'total_tokens', None)
+
+def _create_chat_completion(**kwargs):
+    """
+    Gọi OpenAI chat completion trong ngân sách RPM/TPM và giới hạn đồng thời của OpenAI
+    
+    Thread gọi bị chặn tới khi ngân sách (openai_budget) cho phép gửi lời gọi.
+    
+    Args:
+        **kwargs: Tham số của openai.chat.completions.create
+        
+    Returns:
+        ChatCompletion: Response của OpenAI
     """
+    reserved = openai_budget.acquire(estimate_request_tokens(kwargs))
     try:
-        # Cắt bớt HTML nếu quá dài để tránh vượt quá giới hạn token
-        if len(html_content) > 100000:
-            html_content = html_content[:100000]
+        with concurrency_controller.slot(OPENAI_CONCURRENCY_TARGET, OPENAI_OVERLOAD_ERRORS):
+            response = openai.chat.completions.create(**kwargs)
+    except openai.RateLimitError as e:
+        openai_budget.pause(_rate_limit_pause(e))
+        raise
+    openai_budget.settle(reserved, _used_tokens(response))
+    return response
+
+async def _create_chat_completion_async(**kwargs):
+    """
+    Gọi OpenAI chat completion bất đồng bộ, dùng chung ngân sách RPM/TPM và
+    giới hạn đồng thời với các lời gọi đồng bộ
+    
+    Args:
+        **kwargs: Tham số của chat.completions.create
         
-        # Tạo prompt cho OpenAI
-        prompt = f"""
-        Phân tích nội dung HTML sau đây từ trang tuyển dụng việc làm và trích xuất các thông tin sau:
-        1. Tiêu đề công việc
-        2. Tên công ty
-        3. Địa chỉ công ty
-        4. Địa điểm làm việc
-        5. Mức lương (nếu có)
-        6. Loại công việc (toàn thời gian, bán thời gian, v.v.)
-        7. Hình thức làm việc (tại văn phòng, từ xa, hybrid)
-        8. Kỹ năng yêu cầu (liệt kê)
-        9. Mức kinh nghiệm
-        10. Yêu cầu học vấn
-        11. Mô tả công việc ngắn gọn
-        12. Lợi ích công việc
-        13. Hạn nộp hồ sơ
-        14. Yêu cầu ngôn ngữ
-        15. Email liên hệ (nếu có)
-        16. Người liên hệ (nếu có)
+    Returns:
+        ChatCompletion: Response của OpenAI
+    """
+    reserved = await openai_budget.acquire_async(estimate_request_tokens(kwargs))
+    try:
+        async with concurrency_controller.slot(OPENAI_CONCURRENCY_TARGET, OPENAI_OVERLOAD_ERRORS):
+            response = await get_async_client().chat.completions.create(**kwargs)
+    except openai.RateLimitError as e:
+        openai_budget.pause(_rate_limit_pause(e))
+        raise
+    openai_budget.settle(reserved, _used_tokens(response))
+    return response
+
+def _json_mode_rejected(error):
+    """
+    Lỗi có phải do model không hỗ trợ response_format (JSON mode) không
+    """
+    return isinstance(error, openai.BadRequestError) and 'response_format' in str(error)
+
+def _plain_request(request, fallback=None):
+    """
+    Request dùng khi model không hỗ trợ JSON mode: `fallback` nếu có, nếu không
+    là chính request bỏ response_format
+    """
+    if fallback is not None:
+        return fallback
+    return {key: value for key, value in request.items() if key != 'response_format'}
+
+def _use_json_mode(request):
+    """
+    Có gửi request ở JSON mode không (model chưa biết được thử JSON mode)
+    """
+    return 'response_format' in request and get_model_capabilities().supports(request['model'], JSON_MODE) is not False
+
+def _create_json_completion(request, fallback=None):
+    """
+    Gọi chat completion ở JSON mode nếu model hỗ trợ
+    
+    Tính năng của model được tra trong sổ tính năng (app/data/model_capabilities.py):
+    model không hỗ trợ JSON mode được gọi thẳng bằng request thường, nên không
+    tốn một lời gọi bị từ chối (400) cho mỗi trang. Model chưa biết được thăm dò
+    một lần (ensure_model_capabilities) và kết quả được lưu lại cho các lần chạy
+    sau; nếu thăm dò không kết luận được, lời gọi thật bị từ chối cũng được ghi nhận.
+    
+    Args:
+        request (dict): Tham số chat completion có response_format
+        fallback (dict, optional): Tham số dùng khi model không hỗ trợ JSON mode,
+                                   mặc định là request bỏ response_format
+        
+    Returns:
+        tuple: (response, True nếu đã dùng JSON mode)
+    """
+    if 'response_format' in request:
+        ensure_model_capabilities(request['model'])
+    if not _use_json_mode(request):
+        return _create_chat_completion(**_plain_request(request, fallback)), False
+    
+    model = request['model']
+    try:
+        response = _create_chat_completion(**request)
+    except openai.BadRequestError as e:
+        if not _json_mode_rejected(e):
+            raise
+        get_model_capabilities().record(model, JSON_MODE, False)
+        return _create_chat_completion(**_plain_request(request, fallback)), False
+    get_model_capabilities().record(model, JSON_MODE, True)
+    return response, True
+
+async def _create_json_completion_async(request, fallback=None):
+    """
+    Phiên bản bất đồng bộ của _create_json_completion
+    
+    Returns:
+        tuple: (response, True nếu đã dùng JSON mode)
+    """
+    if 'response_format' in request and request['model'] not in _probed_models:
+        # Thăm dò dùng lời gọi đồng bộ nên chạy trong thread riêng
+        await asyncio.to_thread(ensure_model_capabilities, request['model'])
+    if not _use_json_mode(request):
+        return await _create_chat_completion_async(**_plain_request(request, fallback)), False
+    
+    model = request['model']
+    try:
+        response = await _create_chat_completion_async(**request)
+    except openai.BadRequestError as e:
+        if not _json_mode_rejected(e):
+            raise
+        get_model_capabilities().record(model, JSON_MODE, False)
+        return await _create_chat_completion_async(**_plain_request(request, fallback)), False
+    get_model_capabilities().record(model, JSON_MODE, True)
+    return response, True
+
+def probe_model_capabilities(model, features=CAPABILITIES):
+    """
+    Kiểm tra model có hỗ trợ JSON mode không bằng một lời gọi rất nhỏ, rồi lưu
+    kết quả vào sổ tính năng
+    
+    Model chỉ được ghi là không hỗ trợ khi lỗi 400 nhắc tới đúng tham số được
+    thăm dò; lỗi khác (kể cả 400 vì lý do khác) chưa đủ để kết luận nên không
+    được lưu. Lời gọi không đặt max_tokens vì một số model (ví dụ model suy
+    luận) từ chối tham số này, câu trả lời vẫn chỉ vài token.
+    
+    Args:
+        model (str): Tên model
+        features (tuple): Các tính năng cần kiểm tra
+        
+    Returns:
+        dict: Tính năng -> True/False (tính năng chưa kết luận được bị bỏ qua)
+    """
+    # Tính năng -> (tham số thêm vào request, hàm nhận diện lỗi do model không hỗ trợ)
+    probes = {
+        JSON_MODE: ({'response_format': {"type": "json_object"}}, _json_mode_rejected),
+    }
+    capabilities = get_model_capabilities()
+    results = {}
+    for feature in features:
+        params, rejected = probes[feature]
+        try:
+            _create_chat_completion(
+                model=model,
+                messages=[{"role": "user", "content": "Trả về {} dưới dạng JSON."}],
+                **params
+            )
+            results[feature] = True
+        except Exception as e:
+            if not rejected(e):
+                # Lỗi mạng, rate limit, 400 vì tham số khác...: chưa kết luận được,
+                # lời gọi thật sẽ tự học nếu model từ chối tính năng này
+                logger.warning(f"Không thăm dò được {feature} của model {model}: {e}")
+                continue
+            logger.debug(f"Model {model} từ chối {feature}: {e}")
+            results[feature] = False
+        capabilities.record(model, feature, results[feature])
+    return results
+
+# Các model đã được thăm dò trong process này
+_probed_models = set()
+_probe_lock = threading.Lock()
+
+def ensure_model_capabilities(model):
+    """
+    Thăm dò các tính năng chưa biết của model khi model được dùng lần đầu
+    
+    Mỗi model được thăm dò nhiều nhất một lần trong mỗi process; các lời gọi
+    đồng thời chờ lần thăm dò đầu tiên xong để được định tuyến đúng.
+    
+    Args:
+        model (str): Tên model
+    """
+    if model in _probed_models:
+        return
+    with _probe_lock:
+        if model in _probed_models:
+            return
+        features = get_model_capabilities().unknown(model)
+        if features:
+            logger.info(f"Thăm dò tính năng của model {model}: {', '.join(features)}")
+            probe_model_capabilities(model, features)
+        _probed_models.add(model)
+
+# Prompt trích xuất thông tin việc làm
+EXTRACT_SYSTEM_MESSAGE = "Bạn là trợ lý AI chuyên phân tích nội dung trang web tuyển dụng việc làm. Nhiệm vụ của bạn là trích xuất thông tin chi tiết từ nội dung trang tuyển dụng."
+EXTRACT_PROMPT = """
+        Phân tích nội dung sau đây từ trang tuyển dụng việc làm và trích xuất các thông tin sau:
+        {field_list}
         
         URL: {url}
         
-        HTML:
-        {html_content}
+        Nội dung trang:
+        {content}
         
-        Trả về kết quả dưới dạng JSON với các trường tương ứng. Nếu không tìm thấy thông tin, hãy để trống hoặc ghi "Không có thông tin".
+        Trả về kết quả dưới dạng JSON với khóa là tên trường ở trên. Nếu không tìm thấy thông tin, hãy để trống hoặc ghi "Không có thông tin".
         """
+# Prompt trích xuất nhiều trang trong một request
+EXTRACT_BATCH_SYSTEM_MESSAGE = "Bạn là trợ lý AI chuyên phân tích nội dung trang web tuyển dụng việc làm. Nhiệm vụ của bạn là trích xuất thông tin chi tiết từ nhiều trang tuyển dụng cùng lúc."
+EXTRACT_BATCH_PROMPT = """
+        Dưới đây là nội dung của {count} trang tuyển dụng việc làm, mỗi trang bắt đầu bằng dòng "### URL: ...". Với từng trang, trích xuất các thông tin sau:
+        {field_list}
         
-        try:
-            # Thử sử dụng GPT-3.5-turbo với response_format
-            logger.info(f"Gọi OpenAI API để trích xuất thông tin từ {url}")
-            response = openai.chat.completions.create(
-                model="gpt-3.5-turbo-16k",
-                messages=[
-                    {"role": "system", "content": "Bạn là trợ lý AI chuyên phân tích nội dung trang web tuyển dụng việc làm. Nhiệm vụ của bạn là trích xuất thông tin chi tiết từ HTML của trang tuyển dụng."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=1000,
-                response_format={"type": "json_object"}
-            )
-            # Phân tích kết quả JSON
-            result = response.choices[0].message.content
-            job_info = json.loads(result)
-            
-        except Exception as api_error:
-            # Nếu có lỗi với response_format, thử lại không có tham số đó
-            logger.warning(f"Lỗi khi sử dụng response_format, thử lại không có tham số này: {api_error}")
-            response = openai.chat.completions.create(
-                model="gpt-3.5-turbo-16k",
-                messages=[
-                    {"role": "system", "content": "Bạn là trợ lý AI chuyên phân tích nội dung trang web tuyển dụng việc làm. Nhiệm vụ của bạn là trích xuất thông tin chi tiết từ HTML của trang tuyển dụng và trả về kết quả dưới dạng JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=1000
-            )
-            
-            # Phân tích kết quả JSON từ văn bản
-            result = response.choices[0].message.content
-            
-            # Trích xuất phần JSON từ văn bản (có thể có văn bản khác xung quanh)
-            try:
-                # Tìm dấu { đầu tiên và } cuối cùng
-                start_idx = result.find('{')
-                end_idx = result.rfind('}') + 1
-                if start_idx >= 0 and end_idx > start_idx:
-                    json_str = result[start_idx:end_idx]
-                    job_info = json.loads(json_str)
-                else:
-                    # Nếu không tìm thấy định dạng JSON, tạo một cấu trúc mặc định
-                    job_info = {"job_title": "Không thể trích xuất", "error": "Không tìm thấy dữ liệu JSON"}
-            except json.JSONDecodeError:
-                job_info = {"job_title": "Không thể trích xuất", "error": "Không thể phân tích JSON"}
+        {pages}
+        
+        Trả về một đối tượng JSON dạng {{"results": [...]}}, trong đó "results" là mảng gồm đúng một phần tử cho mỗi trang. Mỗi phần tử có khóa "url" (giữ nguyên URL của trang) và các khóa là tên trường ở trên. Nếu không tìm thấy thông tin, hãy để trống hoặc ghi "Không có thông tin".
+        """
+EXTRACT_BATCH_PAGE = "### URL: {url}\n{content}\n"
+# Phiên bản prompt trong khóa của LLM cache, thay đổi khi sửa prompt hoặc mô tả trường
+EXTRACT_PROMPT_VERSION = LLMCache.prompt_version(
+    EXTRACT_SYSTEM_MESSAGE, EXTRACT_PROMPT, EXTRACT_BATCH_SYSTEM_MESSAGE, EXTRACT_BATCH_PROMPT,
+    json.dumps(JOB_DETAIL_FIELDS, ensure_ascii=False, sort_keys=True)
+)
+
+# Giới hạn (context, output) token theo tiền tố tên model, tiền tố dài nhất được dùng
+MODEL_TOKEN_LIMITS = {
+    'gpt-3.5-turbo': (4096, 4096),
+    'gpt-3.5-turbo-16k': (16385, 4096),
+    'gpt-3.5-turbo-1106': (16385, 4096),
+    'gpt-3.5-turbo-0125': (16385, 4096),
+    'gpt-4': (8192, 4096),
+    'gpt-4-32k': (32768, 4096),
+    'gpt-4-turbo': (128000, 4096),
+    'gpt-4-1106': (128000, 4096),
+    'gpt-4-0125': (128000, 4096),
+    'gpt-4o': (128000, 16384),
+}
+DEFAULT_TOKEN_LIMITS = (4096, 4096)
+_extract_cache_checked = False
+
+def get_extract_cache():
+    """
+    Lấy LLM cache cho bước trích xuất, lần đầu sẽ xóa các kết quả của prompt cũ
+    
+    Returns:
+        LLMCache: Cache dùng chung, None nếu cache bị tắt
+    """
+    global _extract_cache_checked
+    cache = get_llm_cache()
+    if cache and not _extract_cache_checked:
+        _extract_cache_checked = True
+        removed = cache.invalidate(keep_versions=[EXTRACT_PROMPT_VERSION])
+        if removed:
+            logger.info(f"Đã xóa {removed} kết quả trong LLM cache do prompt trích xuất thay đổi")
+    return cache
+
+def get_model_token_limits(model=OPENAI_EXTRACT_MODEL):
+    """
+    Lấy giới hạn token của model
+    
+    Args:
+        model (str): Tên model
+        
+    Returns:
+        tuple: (số token context, số token kết quả tối đa), OPENAI_CONTEXT_TOKENS
+               và OPENAI_OUTPUT_TOKENS được ưu tiên nếu khác 0
+    """
+    prefixes = [prefix for prefix in MODEL_TOKEN_LIMITS if model.startswith(prefix)]
+    context, output = MODEL_TOKEN_LIMITS[max(prefixes, key=len)] if prefixes else DEFAULT_TOKEN_LIMITS
+    return OPENAI_CONTEXT_TOKENS or context, OPENAI_OUTPUT_TOKENS or output
+
+def estimate_tokens(text):
+    """
+    Ước lượng số token của một đoạn văn bản
+    
+    Args:
+        text (str): Văn bản
+        
+    Returns:
+        int: Số token ước lượng
+    """
+    return int(len(text) / OPENAI_CHARS_PER_TOKEN) + 1
+
+def _format_field_list(fields):
+    """
+    Tạo danh sách trường cần trích xuất cho prompt, dùng đúng khóa của kết quả
+    """
+    return "\n        ".join(
+        f"{i}. {field}: {JOB_DETAIL_FIELDS.get(field, field)}" for i, field in enumerate(fields, 1)
+    )
+
+def build_extraction_request(html_content, url, fields=None):
+    """
+    Tạo tham số chat completion để trích xuất một trang việc làm
+    
+    Dùng cho lời gọi trực tiếp và cho từng dòng request của Batch API. Request có
+    response_format trừ khi sổ tính năng ghi nhận model không hỗ trợ JSON mode.
+    
+    Args:
+        html_content (str): Nội dung trang việc làm (đã cắt theo OPENAI_EXTRACT_MAX_CHARS)
+        url (str): URL của trang việc làm
+        fields (list, optional): Chỉ trích xuất các trường này, mặc định tất cả JOB_DETAIL_FIELDS
+        
+    Returns:
+        dict: Tham số của openai.chat.completions.create
+    """
+    prompt = EXTRACT_PROMPT.format(
+        field_list=_format_field_list(fields or list(JOB_DETAIL_FIELDS)), url=url, content=html_content
+    )
+    request = {
+        'model': OPENAI_EXTRACT_MODEL,
+        'messages': [
+            {"role": "system", "content": EXTRACT_SYSTEM_MESSAGE},
+            {"role": "user", "content": prompt}
+        ],
+        'temperature': 0.3,
+        'max_tokens': 1000
+    }
+    # Chỉ dùng JSON mode khi model không được biết là từ chối (prompt đã yêu cầu trả về JSON)
+    if get_model_capabilities().supports(OPENAI_EXTRACT_MODEL, JSON_MODE) is not False:
+        request['response_format'] = {"type": "json_object"}
+    return request
+
+def parse_job_info(result):
+    """
+    Đọc đối tượng JSON trong nội dung trả về của OpenAI
+    
+    Args:
+        result (str): Nội dung trả về, có thể có văn bản khác xung quanh JSON
+        
+    Returns:
+        dict: Thông tin việc làm, hoặc cấu trúc mặc định có khóa 'error' nếu không đọc được
+    """
+    try:
+        # Tìm dấu { đầu tiên và } cuối cùng
+        start_idx = result.find('{')
+        end_idx = result.rfind('}') + 1
+        if start_idx >= 0 and end_idx > start_idx:
+            return json.loads(result[start_idx:end_idx])
+        # Nếu không tìm thấy định dạng JSON, tạo một cấu trúc mặc định
+        return {"job_title": "Không thể trích xuất", "error": "Không tìm thấy dữ liệu JSON"}
+    except json.JSONDecodeError:
+        return {"job_title": "Không thể trích xuất", "error": "Không thể phân tích JSON"}
+
+def _lookup_extraction(html_content, fields=None):
+    """
+    Chuẩn bị một lần trích xuất: cắt nội dung, chọn trường và tra LLM cache
+    
+    Args:
+        html_content (str): Nội dung trang việc làm
+        fields (list, optional): Chỉ trích xuất các trường này
+        
+    Returns:
+        tuple: (nội dung đã cắt, danh sách trường, variant của khóa cache, kết quả đã lưu hoặc None)
+    """
+    # Cắt bớt nội dung nếu quá dài để tránh vượt quá giới hạn token
+    if len(html_content) > OPENAI_EXTRACT_MAX_CHARS:
+        html_content = html_content[:OPENAI_EXTRACT_MAX_CHARS]
+    
+    # Danh sách trường cần trích xuất, dùng đúng khóa của kết quả
+    fields = fields or list(JOB_DETAIL_FIELDS)
+    
+    # Dùng lại kết quả của trang có cùng nội dung (URL không nằm trong khóa)
+    cache = get_extract_cache()
+    variant = ','.join(fields)
+    job_info = None
+    if cache:
+        job_info = cache.get(html_content, EXTRACT_PROMPT_VERSION, OPENAI_EXTRACT_MODEL, variant)
+    return html_content, fields, variant, job_info
+
+def _store_extraction(html_content, variant, job_info):
+    """
+    Lưu kết quả trích xuất vào LLM cache (bỏ qua kết quả lỗi để lần sau được trích xuất lại)
+    """
+    cache = get_extract_cache()
+    if cache and 'error' not in job_info:
+        cache.put(html_content, EXTRACT_PROMPT_VERSION, OPENAI_EXTRACT_MODEL, job_info, variant)
+
+def _extraction_error(error):
+    """
+    Kết quả mặc định khi không trích xuất được
+    """
+    job_info = {field: "" for field in JOB_DETAIL_FIELDS}
+    job_info.update({
+        "job_title": "Không thể trích xuất",
+        "company_name": "Không thể trích xuất",
+        "error": str(error)
+    })
+    return job_info
+
+def extract_job_info_with_openai(html_content, url, fields=None):
+    """
+    Sử dụng OpenAI để trích xuất thông tin việc làm từ nội dung trang
+    
+    Kết quả được lưu trong LLM cache theo nội dung trang, prompt và model, nên
+    trang có nội dung giống hệt trang đã trích xuất không cần gọi lại OpenAI.
+    
+    Args:
+        html_content (str): Nội dung trang việc làm (văn bản đã rút gọn hoặc HTML)
+        url (str): URL của trang việc làm
+        fields (list, optional): Chỉ trích xuất các trường này, mặc định tất cả JOB_DETAIL_FIELDS
+        
+    Returns:
+        dict: Thông tin chi tiết về việc làm
+    """
+    try:
+        html_content, fields, variant, job_info = _lookup_extraction(html_content, fields)
+        if job_info is not None:
+            logger.info(f"Dùng kết quả trích xuất đã lưu cho {url}")
+            return job_info
+        
+        # Tạo prompt cho OpenAI
+        request = build_extraction_request(html_content, url, fields)
+        
+        # Dùng JSON mode nếu model hỗ trợ, nếu không thì đọc JSON từ văn bản trả về
+        logger.info(f"Gọi OpenAI API để trích xuất thông tin từ {url}")
+        response, _ = _create_json_completion(request)
+        job_info = parse_job_info(response.choices[0].message.content)
+        
+        _store_extraction(html_content, variant, job_info)
         
         logger.info(f"Đã trích xuất thông tin từ {url} thành công")
         return job_info
     except Exception as e:
         logger.error(f"Lỗi khi sử dụng OpenAI API: {e}")
         # Trả về thông tin mặc định nếu có lỗi
-        return {
-            "job_title": "Không thể trích xuất",
-            "company_name": "Không thể trích xuất",
-            "company_address": "",
-            "job_location": "",
-            "salary_range": "",
-            "job_type": "",
-            "work_mode": "",
-            "required_skills": "",
-            "experience_level": "",
-            "education_requirements": "",
-            "brief_job_description": "",
-            "job_benefits": "",
-            "application_deadline": "",
-            "language_requirement": "",
-            "contact_email": "",
-            "contact_person": "",
-            "error": str(e)
-        }
+        return _extraction_error(e)
+
+async def extract_job_info_with_openai_async(html_content, url, fields=None):
+    """
+    Phiên bản bất đồng bộ của extract_job_info_with_openai, dùng AsyncOpenAI client
+    
+    Lời gọi chờ ngân sách RPM/TPM trên event loop thay vì giữ một thread.
+    
+    Args:
+        html_content (str): Nội dung trang việc làm (văn bản đã rút gọn hoặc HTML)
+        url (str): URL của trang việc làm
+        fields (list, optional): Chỉ trích xuất các trường này, mặc định tất cả JOB_DETAIL_FIELDS
+        
+    Returns:
+        dict: Thông tin chi tiết về việc làm
+    """
+    try:
+        html_content, fields, variant, job_info = _lookup_extraction(html_content, fields)
+        if job_info is not None:
+            logger.info(f"Dùng kết quả trích xuất đã lưu cho {url}")
+            return job_info
+        
+        request = build_extraction_request(html_content, url, fields)
+        
+        logger.info(f"Gọi OpenAI API để trích xuất thông tin từ {url}")
+        response, _ = await _create_json_completion_async(request)
+        job_info = parse_job_info(response.choices[0].message.content)
+        
+        _store_extraction(html_content, variant, job_info)
+        
+        logger.info(f"Đã trích xuất thông tin từ {url} thành công")
+        return job_info
+    except Exception as e:
+        logger.error(f"Lỗi khi sử dụng OpenAI API: {e}")
+        return _extraction_error(e)
+
+def plan_extraction_batches(pages, fields=None, model=OPENAI_EXTRACT_MODEL, max_pages=OPENAI_BATCH_MAX_PAGES):
+    """
+    Chia các trang cần trích xuất thành batch vừa giới hạn token của model
+    
+    Mỗi batch phải chứa được prompt, nội dung các trang và phần kết quả dự trù
+    (OPENAI_BATCH_OUTPUT_TOKENS_PER_PAGE mỗi trang) trong context, và phần kết
+    quả không được vượt giới hạn output của model.
+    
+    Args:
+        pages (list): Danh sách dict {'url', 'content'}
+        fields (list, optional): Các trường cần trích xuất
+        model (str): Tên model
+        max_pages (int): Số trang tối đa trong một batch
+        
+    Returns:
+        list: Danh sách batch, mỗi batch là danh sách trang theo thứ tự ban đầu
+    """
+    context_limit, output_limit = get_model_token_limits(model)
+    overhead = estimate_tokens(
+        EXTRACT_BATCH_SYSTEM_MESSAGE + EXTRACT_BATCH_PROMPT + _format_field_list(fields or list(JOB_DETAIL_FIELDS))
+    )
+    
+    batches = []
+    batch = []
+    batch_tokens = overhead
+    for page in pages:
+        page_tokens = estimate_tokens(EXTRACT_BATCH_PAGE.format(url=page['url'], content=page['content']))
+        output_tokens = (len(batch) + 1) * OPENAI_BATCH_OUTPUT_TOKENS_PER_PAGE
+        if batch and (
+            len(batch) >= max_pages
+            or output_tokens > output_limit
+            or batch_tokens + page_tokens + output_tokens > context_limit
+        ):
+            batches.append(batch)
+            batch = []
+            batch_tokens = overhead
+        batch.append(page)
+        batch_tokens += page_tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+def _parse_batch_results(result):
+    """
+    Đọc mảng kết quả của một batch, chấp nhận cả mảng trần lẫn {"results": [...]}
+    """
+    start_idx = min((i for i in (result.find('{'), result.find('[')) if i >= 0), default=-1)
+    if start_idx < 0:
+        raise ValueError("Không tìm thấy dữ liệu JSON")
+    data = json.loads(result[start_idx:max(result.rfind('}'), result.rfind(']')) + 1])
+    if isinstance(data, dict):
+        data = data.get('results', [])
+    if not isinstance(data, list):
+        raise ValueError("Kết quả không phải mảng JSON")
+    return [item for item in data if isinstance(item, dict)]
+
+def _batch_item_info(item, fields):
+    """
+    Lấy thông tin việc làm từ một phần tử kết quả batch, chỉ giữ các trường được yêu cầu
+    
+    Returns:
+        dict: Thông tin việc làm, None nếu phần tử báo lỗi hoặc không có trường nào được yêu cầu
+    """
+    if 'error' in item or not any(field in item for field in fields):
+        return None
+    return {field: item.get(field) or "" for field in fields}
+
+def _is_content_error(error):
+    """
+    Lỗi do nội dung batch (kết quả bị cắt, JSON hỏng, không khớp URL, vượt context),
+    chia nhỏ batch có thể khắc phục được
+    """
+    if isinstance(error, ValueError):
+        return True
+    return isinstance(error, openai.BadRequestError) and getattr(error, 'code', None) == 'context_length_exceeded'
+
+def _extract_batch(pages, fields):
+    """
+    Trích xuất một batch bằng một request; nếu nội dung trả về không dùng được
+    thì chia đôi và thử lại
+    
+    Batch một trang được chuyển cho extract_job_info_with_openai. Lỗi kết nối,
+    rate limit hay xác thực không làm chia nhỏ batch (chỉ thêm request vào chỗ
+    đang quá tải); các trang của batch nhận kết quả lỗi như lời gọi từng trang.
+    
+    Returns:
+        dict: URL -> thông tin chi tiết việc làm
+    """
+    if len(pages) == 1:
+        page = pages[0]
+        return {page['url']: extract_job_info_with_openai(page['content'], page['url'], fields=fields)}
+    
+    _, output_limit = get_model_token_limits(OPENAI_EXTRACT_MODEL)
+    prompt = EXTRACT_BATCH_PROMPT.format(
+        count=len(pages),
+        field_list=_format_field_list(fields),
+        pages="\n".join(EXTRACT_BATCH_PAGE.format(url=page['url'], content=page['content']) for page in pages)
+    )
+    variant = ','.join(fields)
+    
+    results = {}
+    try:
+        logger.info(f"Gọi OpenAI API để trích xuất {len(pages)} trang trong một request")
+        response, _ = _create_json_completion({
+            'model': OPENAI_EXTRACT_MODEL,
+            'messages': [
+                {"role": "system", "content": EXTRACT_BATCH_SYSTEM_MESSAGE},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.3,
+            'max_tokens': min(output_limit, len(pages) * OPENAI_BATCH_OUTPUT_TOKENS_PER_PAGE),
+            'response_format': {"type": "json_object"}
+        })
+        choice = response.choices[0]
+        if choice.finish_reason == 'length':
+            raise ValueError("Kết quả bị cắt do vượt giới hạn token")
+        
+        items = {item.get('url'): item for item in _parse_batch_results(choice.message.content)}
+        for page in pages:
+            item = items.get(page['url'])
+            job_info = _batch_item_info(item, fields) if item is not None else None
+            if job_info is None:
+                continue
+            results[page['url']] = job_info
+            _store_extraction(page['content'], variant, job_info)
+        if not results:
+            raise ValueError("Không có kết quả nào khớp URL của batch")
+    except Exception as e:
+        if not _is_content_error(e):
+            logger.error(f"Lỗi khi trích xuất batch {len(pages)} trang: {e}")
+            return {page['url']: _extraction_error(e) for page in pages}
+        logger.warning(f"Lỗi khi trích xuất batch {len(pages)} trang, chia nhỏ và thử lại: {e}")
+        half = len(pages) // 2
+        results = _extract_batch(pages[:half], fields)
+        results.update(_extract_batch(pages[half:], fields))
+        return results
+    
+    # Các trang không có kết quả hợp lệ được trích xuất lại
+    missing = [page for page in pages if page['url'] not in results]
+    if missing:
+        logger.warning(f"Batch thiếu kết quả của {len(missing)} trang, trích xuất lại")
+        results.update(_extract_batch(missing, fields))
+    return results
+
+def extract_jobs_batch_with_openai(pages, fields=None):
+    """
+    Trích xuất thông tin việc làm của nhiều trang, gom nhiều trang vào một request
+    
+    Prompt và danh sách trường chỉ được gửi một lần cho cả batch, nên số request
+    và số token hướng dẫn giảm đi. Kết quả đã có trong LLM cache được dùng lại.
+    
+    Args:
+        pages (list): Danh sách dict {'url', 'content'} (nội dung đã rút gọn)
+        fields (list, optional): Chỉ trích xuất các trường này, mặc định tất cả JOB_DETAIL_FIELDS
+        
+    Returns:
+        dict: URL -> thông tin chi tiết việc làm
+    """
+    fields = fields or list(JOB_DETAIL_FIELDS)
+    variant = ','.join(fields)
+    cache = get_extract_cache()
+    
+    results = {}
+    remaining = []
+    for page in pages:
+        content = page['content'][:OPENAI_EXTRACT_MAX_CHARS]
+        job_info = cache.get(content, EXTRACT_PROMPT_VERSION, OPENAI_EXTRACT_MODEL, variant) if cache else None
+        if job_info is not None:
+            results[page['url']] = job_info
+        else:
+            remaining.append({'url': page['url'], 'content': content})
+    
+    for batch in plan_extraction_batches(remaining, fields):
+        results.update(_extract_batch(batch, fields))
+    return results
+
+def _parse_search_urls(result, base_url, keywords):
+    """
+    Lấy danh sách URL việc làm từ văn bản trả về của lời gọi không có JSON mode
+    
+    Args:
+        result (str): Nội dung trả về của OpenAI
+        base_url (str): URL cơ sở của trang web việc làm
+        keywords (list): Danh sách từ khóa (dùng tạo danh sách giả lập khi không đọc được)
+        
+    Returns:
+        list: Danh sách URL
+    """
+    # Trích xuất phần JSON từ văn bản
+    try:
+        # Tìm định dạng JSON trong văn bản kết quả
+        import re
+        json_match = re.search(r'```json\s*(.*?)\s*```', result, re.DOTALL)
+        
+        if json_match:
+            json_str = json_match.group(1)
+            data = json.loads(json_str)
+            return data.get("urls", [])
+        
+        # Cố gắng tìm danh sách URLs trong văn bản
+        urls = re.findall(rf'{base_url}/[\w-]+/[\w-]+', result)
+        if urls:
+            return urls
+        
+        # Nếu không tìm thấy, tạo danh sách giả lập
+        logger.warning("Không thể trích xuất URLs từ kết quả, tạo danh sách giả lập")
+    except Exception as json_error:
+        logger.error(f"Lỗi khi phân tích JSON từ kết quả: {json_error}")
+    
+    # Tạo danh sách giả lập nếu không thể phân tích JSON
+    return [
+        f"{base_url}/tim-kiem-viec-lam-nhanh?q={keyword.replace(' ', '+')}"
+        for keyword in keywords
+    ]
 
 def search_jobs_with_openai(keywords, base_url, location=None, filters=None):
     """
@@ -176,30 +824,8 @@ def search_jobs_with_openai(keywords, base_url, location=None, filters=None):
         
         logger.info(f"Gọi OpenAI API để tìm kiếm việc làm với từ khóa: {keywords_str}")
         
-        try:
-            # Thử sử dụng GPT-4 với response_format
-            response = openai.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "Bạn là trợ lý AI chuyên tìm kiếm việc làm. Bạn có khả năng thực hiện tìm kiếm thông minh, phân tích ngữ nghĩa, và hiểu nhu cầu người dùng."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=1000,
-                response_format={"type": "json_object"}
-            )
-            
-            # Phân tích kết quả JSON
-            result = response.choices[0].message.content
-            data = json.loads(result)
-            job_urls = data.get("urls", [])
-            
-        except Exception as api_error:
-            # Nếu có lỗi với response_format, thử lại với GPT-3.5 không có tham số đó
-            logger.warning(f"Lỗi khi sử dụng GPT-4 với response_format, thử lại với GPT-3.5: {api_error}")
-            
-            # Điều chỉnh prompt để yêu cầu rõ ràng hơn về định dạng JSON
-            prompt += """
+        # Prompt yêu cầu rõ ràng hơn về định dạng JSON cho lời gọi không có JSON mode
+        fallback_prompt = prompt + """
             Hãy trả về kết quả CHÍNH XÁC theo định dạng sau:
             ```json
             {
@@ -211,49 +837,45 @@ def search_jobs_with_openai(keywords, base_url, location=None, filters=None):
             }
             ```
             """
-            
-            response = openai.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "Bạn là trợ lý AI chuyên tìm kiếm việc làm. Bạn có khả năng thực hiện tìm kiếm thông minh và trả về kết quả dưới dạng JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=1000
+        fallback_request = {
+            'model': "gpt-3.5-turbo",
+            'messages': [
+                {"role": "system", "content": "Bạn là trợ lý AI chuyên tìm kiếm việc làm. Bạn có khả năng thực hiện tìm kiếm thông minh và trả về kết quả dưới dạng JSON."},
+                {"role": "user", "content": fallback_prompt}
+            ],
+            'temperature': 0.5,
+            'max_tokens': 1000
+        }
+        
+        try:
+            # GPT-4 với response_format; model không hỗ trợ JSON mode được chuyển thẳng sang GPT-3.5
+            response, json_mode = _create_json_completion(
+                {
+                    'model': "gpt-4",
+                    'messages': [
+                        {"role": "system", "content": "Bạn là trợ lý AI chuyên tìm kiếm việc làm. Bạn có khả năng thực hiện tìm kiếm thông minh, phân tích ngữ nghĩa, và hiểu nhu cầu người dùng."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    'temperature': 0.5,
+                    'max_tokens': 1000,
+                    'response_format': {"type": "json_object"}
+                },
+                fallback=fallback_request
             )
-            
-            # Phân tích kết quả JSON từ văn bản
             result = response.choices[0].message.content
             
-            # Trích xuất phần JSON từ văn bản
-            try:
-                # Tìm định dạng JSON trong văn bản kết quả
-                import re
-                json_match = re.search(r'```json\s*(.*?)\s*```', result, re.DOTALL)
-                
-                if json_match:
-                    json_str = json_match.group(1)
-                    data = json.loads(json_str)
-                    job_urls = data.get("urls", [])
-                else:
-                    # Cố gắng tìm danh sách URLs trong văn bản
-                    urls = re.findall(rf'{base_url}/[\w-]+/[\w-]+', result)
-                    if urls:
-                        job_urls = urls
-                    else:
-                        # Nếu không tìm thấy, tạo danh sách giả lập
-                        logger.warning("Không thể trích xuất URLs từ kết quả, tạo danh sách giả lập")
-                        job_urls = [
-                            f"{base_url}/tim-kiem-viec-lam-nhanh?q={keyword.replace(' ', '+')}"
-                            for keyword in keywords
-                        ]
-            except Exception as json_error:
-                logger.error(f"Lỗi khi phân tích JSON từ kết quả: {json_error}")
-                # Tạo danh sách giả lập nếu không thể phân tích JSON
-                job_urls = [
-                    f"{base_url}/tim-kiem-viec-lam-nhanh?q={keyword.replace(' ', '+')}"
-                    for keyword in keywords
-                ]
+            if json_mode:
+                # Phân tích kết quả JSON
+                data = json.loads(result)
+                job_urls = data.get("urls", [])
+            else:
+                job_urls = _parse_search_urls(result, base_url, keywords)
+            
+        except Exception as api_error:
+            # Lỗi khác với GPT-4 (model, quyền truy cập, context...): thử lại với GPT-3.5
+            logger.warning(f"Lỗi khi sử dụng GPT-4 với response_format, thử lại với GPT-3.5: {api_error}")
+            response = _create_chat_completion(**fallback_request)
+            job_urls = _parse_search_urls(response.choices[0].message.content, base_url, keywords)
         
         # Kiểm tra và chỉnh sửa URL nếu cần
         validated_urls = []
@@ -308,7 +930,7 @@ def generate_cv_with_openai(user_info, job_info):
         logger.info("Gọi OpenAI API để tạo nội dung CV")
         
         # Gọi OpenAI API
-        response = openai.chat.completions.create(
+        response = _create_chat_completion(
             model="gpt-3.5-turbo",  # Sử dụng GPT-3.5 thay vì GPT-4 để tránh lỗi
             messages=[
                 {"role": "system", "content": "Bạn là chuyên gia tư vấn nghề nghiệp và viết CV. Nhiệm vụ của bạn là tạo CV chuyên nghiệp, hấp dẫn và phù hợp với công việc mà người dùng đang ứng tuyển."},
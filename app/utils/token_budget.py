@@ -0,0 +1,167 @@
+"""
+Token budget - Lên lịch lời gọi OpenAI theo ngân sách request/phút và token/phút
+"""
+import asyncio
+import logging
+import threading
+import time
+from app.utils.config import OPENAI_RPM, OPENAI_TPM
+
+# Thiết lập logger
+logger = logging.getLogger(__name__)
+
+class TokenBudgetScheduler:
+    """
+    Ngân sách RPM/TPM dùng chung cho mọi lời gọi OpenAI (thread lẫn event loop)
+
+    Mỗi ngân sách là một token bucket nạp lại đều trong một phút, dung lượng
+    bằng hạn mức mỗi phút. Lời gọi đặt trước 1 request và số token ước lượng
+    (prompt + max_tokens, cách OpenAI tính vào hạn mức); khi không đủ, số dư
+    được phép âm và lời gọi chờ tới lúc ngân sách hồi lại, nên các lời gọi được
+    gửi đi theo thứ tự đến và ngay khi có ngân sách. Sau khi có kết quả, phần
+    token đặt dư được trả lại theo số token thực tế OpenAI báo về.
+    """
+
+    def __init__(self, rpm=OPENAI_RPM, tpm=OPENAI_TPM):
+        """
+        Khởi tạo scheduler
+
+        Args:
+            rpm (int): Số request mỗi phút được phép (0 = không giới hạn)
+            tpm (int): Số token mỗi phút được phép (0 = không giới hạn)
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self.waits = 0
+        self.wait_time = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """
+        Có giới hạn nào được cấu hình không
+        """
+        return self.rpm > 0 or self.tpm > 0
+
+    def _refill(self, now):
+        """
+        Nạp lại ngân sách theo thời gian đã trôi qua (phải được gọi khi đang giữ lock)
+        """
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm > 0:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60.0)
+        if self.tpm > 0:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60.0)
+
+    def reserve(self, tokens):
+        """
+        Đặt trước ngân sách cho một lời gọi
+
+        Args:
+            tokens (int): Số token ước lượng của lời gọi
+
+        Returns:
+            tuple: (số giây cần chờ trước khi gửi, số token đã đặt trước)
+        """
+        if not self.enabled:
+            return 0.0, 0
+        # Lời gọi lớn hơn cả hạn mức một phút chỉ có thể chờ tới khi đầy ngân sách
+        tokens = min(tokens, self.tpm) if self.tpm > 0 else 0
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, self._blocked_until - now)
+            if self.rpm > 0:
+                self._requests -= 1
+                if self._requests < 0:
+                    wait = max(wait, -self._requests * 60.0 / self.rpm)
+            if self.tpm > 0:
+                self._tokens -= tokens
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens * 60.0 / self.tpm)
+            if wait > 0:
+                self.waits += 1
+                self.wait_time += wait
+        return wait, tokens
+
+    def acquire(self, tokens):
+        """
+        Chờ (chặn thread hiện tại) cho tới khi đủ ngân sách
+
+        Args:
+            tokens (int): Số token ước lượng của lời gọi
+
+        Returns:
+            int: Số token đã đặt trước (truyền lại cho settle)
+        """
+        wait, reserved = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return reserved
+
+    async def acquire_async(self, tokens):
+        """
+        Chờ (không chặn event loop) cho tới khi đủ ngân sách
+
+        Args:
+            tokens (int): Số token ước lượng của lời gọi
+
+        Returns:
+            int: Số token đã đặt trước (truyền lại cho settle)
+        """
+        wait, reserved = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return reserved
+
+    def settle(self, reserved, used):
+        """
+        Trả lại phần token đặt dư (hoặc tính thêm phần thiếu) sau khi có kết quả
+
+        Args:
+            reserved (int): Số token đã đặt trước
+            used (int): Số token thực tế, None nếu không biết
+        """
+        if self.tpm <= 0 or used is None:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.tpm, self._tokens + reserved - used)
+
+    def pause(self, seconds):
+        """
+        Ngừng gửi lời gọi mới trong một khoảng thời gian (khi OpenAI trả về 429)
+
+        Args:
+            seconds (float): Thời gian tạm ngừng (giây)
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        logger.warning(f"OpenAI báo vượt rate limit, tạm ngừng gửi lời gọi mới trong {seconds:.1f}s")
+
+    def snapshot(self):
+        """
+        Trạng thái hiện tại của ngân sách
+
+        Returns:
+            dict: rpm, tpm, số request/token còn lại, số lần phải chờ và tổng thời gian chờ
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rpm': self.rpm,
+                'tpm': self.tpm,
+                'requests_available': int(self._requests),
+                'tokens_available': int(self._tokens),
+                'waits': self.waits,
+                'wait_time': round(self.wait_time, 1)
+            }
+
+# Ngân sách OpenAI dùng chung cho toàn bộ ứng dụng
+openai_budget = TokenBudgetScheduler()
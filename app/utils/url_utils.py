@@ -0,0 +1,115 @@
+"""
+URL helper functions
+"""
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Tham số truy vấn chỉ dùng để theo dõi, không ảnh hưởng nội dung trang.
+# Tham số có thể được trang web dùng (source, ref, sortby...) không nằm ở đây
+TRACKING_PARAMS = {
+    'gclid', 'fbclid', 'msclkid', 'yclid', 'dclid', '_ga', '_gl', 'mc_cid', 'mc_eid', 'trk', 'trackingid'
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'hsa_')
+
+# Mẫu nhận diện mã việc làm trong URL, thử lần lượt
+JOB_ID_PATTERNS = [
+    re.compile(r'-(\d+)-jv(?:[/?#]|$)', re.IGNORECASE),
+    re.compile(r'/(?:job|jobs|viec-lam|tuyen-dung)/(?:[^/?#]*?[-/])?(\d{5,})(?:[/?#.]|$)', re.IGNORECASE),
+    re.compile(r'[-/.](\d{5,})(?:\.html?)?/?(?:[?#]|$)', re.IGNORECASE),
+]
+JOB_ID_QUERY_PARAMS = ('jobid', 'job_id', 'id')
+
+def _is_tracking_param(name):
+    """
+    Kiểm tra tham số truy vấn có phải tham số theo dõi hay không
+    """
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+def canonicalize_url(url):
+    """
+    Chuẩn hóa URL để các cách viết khác nhau của cùng một trang có cùng khóa
+
+    Args:
+        url (str): URL cần chuẩn hóa
+
+    Returns:
+        str: URL đã chuẩn hóa (scheme/host viết thường, bỏ fragment, bỏ cổng mặc định,
+             bỏ tham số theo dõi, bỏ dấu '/' cuối đường dẫn, sắp xếp tham số truy vấn)
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+
+    # Bỏ cổng mặc định
+    if parts.port and not (
+        (scheme == 'http' and parts.port == 80) or (scheme == 'https' and parts.port == 443)
+    ):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r'/{2,}', '/', parts.path or '/')
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = urlencode(sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ))
+
+    return urlunsplit((scheme, host, path, query, ''))
+
+def site_host(url):
+    """
+    Lấy tên host của URL, bỏ tiền tố 'www.'
+
+    Args:
+        url (str): URL bất kỳ
+
+    Returns:
+        str: Tên host viết thường
+    """
+    host = (urlsplit(url.strip()).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+def extract_job_id(url):
+    """
+    Lấy mã việc làm từ URL trang chi tiết
+
+    Args:
+        url (str): URL trang việc làm
+
+    Returns:
+        str: Mã việc làm, None nếu không nhận diện được
+    """
+    parts = urlsplit(url.strip())
+
+    for name, value in parse_qsl(parts.query):
+        if name.lower() in JOB_ID_QUERY_PARAMS and value.isdigit():
+            return value
+
+    path = parts.path
+    for pattern in JOB_ID_PATTERNS:
+        match = pattern.search(path)
+        if match:
+            return match.group(1)
+    return None
+
+def dedup_key(url):
+    """
+    Tạo khóa loại trùng cho URL việc làm
+
+    Hai URL cùng host và cùng mã việc làm được xem là một việc làm, kể cả khi
+    slug hay tham số khác nhau. Nếu không nhận diện được mã việc làm thì dùng
+    URL đã chuẩn hóa.
+
+    Args:
+        url (str): URL trang việc làm
+
+    Returns:
+        str: Khóa loại trùng
+    """
+    job_id = extract_job_id(url)
+    if job_id:
+        return f"{site_host(url)}#{job_id}"
+    return canonicalize_url(url)
@@ -4,24 +4,29 @@
 import sys
 import os
 import logging
-from PyQt5.QtWidgets import QApplication
-from app.gui.main_window import MainWindow
-
-# Thiết lập logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("app.log"),
-        logging.StreamHandler()
-    ]
-)
 
 logger = logging.getLogger(__name__)
 
-if __name__ == "__main__":
-    # Đảm bảo thư mục hiện tại là thư mục gốc của ứng dụng
-    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+def main():
+    """
+    Khởi động giao diện
+    
+    Import PyQt5 và thiết lập logging chỉ chạy ở đây: process con của parse pool
+    (khởi tạo bằng 'spawn') import lại module này nhưng không cần giao diện hay
+    file log riêng.
+    """
+    from PyQt5.QtWidgets import QApplication
+    from app.gui.main_window import MainWindow
+    
+    # Thiết lập logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("app.log"),
+            logging.StreamHandler()
+        ]
+    )
     
     # Log thông tin khởi động
     logger.info("Khởi động ứng dụng Cào Dữ Liệu Tuyển Dụng & Tạo CV Tự Động")
@@ -37,4 +42,9 @@ if __name__ == "__main__":
     window.show()
     
     # Chạy ứng dụng
-    sys.exit(app.exec_()) 
\ No newline at end of file
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    # Đảm bảo thư mục hiện tại là thư mục gốc của ứng dụng
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    main()